@@ -0,0 +1,28 @@
+-- 대화 기록 윈도우/누적 요약 마이그레이션
+-- 작성일: 2025년 7월 16일
+-- 목적: 세션별 최근 N개 메시지 keyset 조회 인덱스와 이전 대화 누적 요약 테이블 추가
+
+BEGIN;
+
+-- 최근 메시지 역순 조회용 복합 인덱스 (session_uuid, created_at DESC, message_id DESC)
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created
+    ON public.chat_messages (session_uuid, created_at DESC, message_id DESC);
+
+-- 세션별 누적 대화 요약 테이블
+CREATE TABLE IF NOT EXISTS public.chat_session_summaries (
+    session_uuid uuid PRIMARY KEY
+        REFERENCES public.chat_sessions (session_uuid) ON DELETE CASCADE,
+    summary text NOT NULL,
+    covered_until_at timestamptz NOT NULL,
+    covered_until_message_id bigint NOT NULL,
+    summarized_messages integer NOT NULL DEFAULT 0,
+    ai_model varchar(100),
+    updated_at timestamptz DEFAULT now()
+);
+
+-- 컬럼 설명 추가
+COMMENT ON TABLE public.chat_session_summaries IS '대화 윈도우 밖으로 밀려난 이전 대화의 누적 요약';
+COMMENT ON COLUMN public.chat_session_summaries.covered_until_at IS '요약에 포함된 마지막 메시지의 created_at';
+COMMENT ON COLUMN public.chat_session_summaries.covered_until_message_id IS '요약에 포함된 마지막 메시지의 message_id';
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- 채팅 메시지 턴 멱등 키 마이그레이션
+-- 작성일: 2026년 10월 17일
+-- 목적: 채팅 지연 저장(write-behind) 큐가 재시도하거나 dead-letter를 재처리해도
+--       같은 턴이 중복 저장되지 않도록 턴 ID와 고유 인덱스를 추가
+--       (CHAT_PERSIST_WRITE_BEHIND_ENABLED를 켜기 전에 적용)
+
+BEGIN;
+
+ALTER TABLE public.chat_messages
+    ADD COLUMN IF NOT EXISTS turn_id varchar(32);
+
+-- turn_id가 NULL인 기존/직접 저장 메시지는 제약 대상이 아님
+-- created_at은 파티션 테이블에서도 고유 인덱스를 만들 수 있도록 포함
+CREATE UNIQUE INDEX IF NOT EXISTS uq_chat_messages_turn
+    ON public.chat_messages (turn_id, message_type, created_at);
+
+-- 컬럼 설명 추가
+COMMENT ON COLUMN public.chat_messages.turn_id IS '지연 저장 턴 멱등 키 (사용자/AI 메시지 한 쌍이 같은 값)';
+
+COMMIT;
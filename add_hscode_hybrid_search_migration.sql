@@ -0,0 +1,31 @@
+-- HSCode 하이브리드(어휘 + 벡터) 검색 마이그레이션
+-- 작성일: 2026년 10월 17일
+-- 목적: 정확한 코드나 드문 품목명이 들어간 질문은 벡터 검색만으로 잘 찾지 못하므로
+--       tsvector/트라이그램/코드 앞자리 검색을 위한 컬럼과 인덱스를 추가
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 품목명 + 설명 전문 검색 컬럼 ('simple' 설정: 한국어 형태소 분석 없이 공백/구두점 단위 토큰)
+ALTER TABLE public.hscode_vectors
+    ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(product_name, '') || ' ' || coalesce(description, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_hscode_vectors_search_tsv
+    ON public.hscode_vectors USING gin (search_tsv);
+
+-- 조사가 붙거나 띄어쓰기가 다른 품목명 검색용 트라이그램 인덱스
+CREATE INDEX IF NOT EXISTS idx_hscode_vectors_product_name_trgm
+    ON public.hscode_vectors USING gin (product_name gin_trgm_ops);
+
+-- 구분자(., -)를 제거한 코드 앞자리 검색용 (예: '8471.30' → '847130%')
+CREATE INDEX IF NOT EXISTS idx_hscode_vectors_hscode_digits
+    ON public.hscode_vectors (regexp_replace(hscode, '[^0-9]', '', 'g') text_pattern_ops);
+
+-- 컬럼 설명 추가
+COMMENT ON COLUMN public.hscode_vectors.search_tsv IS '하이브리드 검색용 품목명/설명 tsvector (simple 설정)';
+
+COMMIT;
@@ -0,0 +1,39 @@
+-- 시맨틱 답변 캐시 테이블 추가 마이그레이션
+-- 작성일: 2026년 10월 17일
+-- 목적: 일반 무역 질문의 답변을 질문 임베딩과 함께 저장하여 유사 질문에 LLM 호출 없이 재사용
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS public.semantic_answer_cache (
+    id bigserial PRIMARY KEY,
+    route varchar(50) NOT NULL,
+    question text NOT NULL,
+    question_hash varchar(64) NOT NULL,
+    answer text NOT NULL,
+    embedding vector(1024) NOT NULL,
+    model varchar(100) NOT NULL,
+    hit_count integer NOT NULL DEFAULT 0,
+    created_at timestamptz DEFAULT now(),
+    expires_at timestamptz NOT NULL,
+    last_hit_at timestamptz,
+    CONSTRAINT uq_semantic_answer_cache_route_hash UNIQUE (route, question_hash)
+);
+
+-- 코사인 유사도 근사 최근접 검색을 위한 HNSW 인덱스
+CREATE INDEX IF NOT EXISTS idx_semantic_answer_cache_embedding
+    ON public.semantic_answer_cache USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- 경로별 유효 항목 필터링용 인덱스
+CREATE INDEX IF NOT EXISTS idx_semantic_answer_cache_route_expires
+    ON public.semantic_answer_cache (route, expires_at);
+
+-- 컬럼 설명 추가
+COMMENT ON TABLE public.semantic_answer_cache IS '일반 무역 질문 시맨틱 답변 캐시';
+COMMENT ON COLUMN public.semantic_answer_cache.question_hash IS '정규화된 질문의 SHA-256 해시 (동일 질문 갱신용)';
+COMMENT ON COLUMN public.semantic_answer_cache.embedding IS '질문 임베딩 (voyage-3-large, 1024차원)';
+COMMENT ON COLUMN public.semantic_answer_cache.expires_at IS '만료 시각 (TTL 경과 또는 관련 뉴스 적재 시 갱신)';
+
+COMMIT;
@@ -11,7 +11,7 @@ from redis.asyncio.client import Redis
 from redis.exceptions import AuthenticationError, RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
+from app.core.redis_client import get_redis_pool
 from app.services.chat_service import ChatService
 from app.services.news_service import NewsService
 from app.services.langchain_service import LLMService
@@ -30,31 +30,6 @@ def get_llm_service() -> LLMService:
     return LLMService()
 
 
-@lru_cache(maxsize=1)
-def get_redis_pool() -> redis.ConnectionPool:
-    """
-    Redis 연결 풀을 생성.
-    실제 연결은 클라이언트가 처음 사용할 때 이루어짐.
-    """
-    try:
-        pool = redis.ConnectionPool.from_url(
-            settings.redis_dsn,
-            encoding="utf-8",
-            decode_responses=True,
-            socket_timeout=5,
-            socket_connect_timeout=5,
-            retry_on_timeout=True,
-            health_check_interval=30,
-        )
-        logger.info(
-            f"Redis 연결 풀 생성 완료: {settings.REDIS_HOST}:{settings.REDIS_PORT}"
-        )
-        return pool
-    except Exception as e:
-        logger.critical(f"치명적 오류: Redis 연결 풀 생성 실패. 에러: {e}")
-        raise
-
-
 async def get_redis_client(
     pool: redis.ConnectionPool = Depends(get_redis_pool),
 ) -> Redis:
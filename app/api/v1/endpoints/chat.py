@@ -2,21 +2,84 @@
 채팅 API 엔드포인트
 """
 
-from fastapi import APIRouter, Depends, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, Query, Request, BackgroundTasks
 from fastapi.responses import StreamingResponse, JSONResponse  # JSONResponse 추가
-from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
 import json
 import logging
-from typing import AsyncGenerator, Union  # Union 추가
+from typing import AsyncGenerator, Optional, Union  # Union 추가
 
-from app.api.v1.dependencies import get_chat_service, get_db
+from app.api.v1.dependencies import get_chat_service
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.chat_models import ChatRequest
 from app.services.chat_service import ChatService
+from app.services.intent_cache import make_cache_key
+from app.services.stream_registry import StreamState, stream_registry
+from app.utils.disconnect_watcher import DisconnectWatcher
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# SSE 스트리밍 응답 공통 헤더
+_SSE_HEADERS = {
+    # SSE 표준 헤더 설정
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Last-Event-ID",
+    "Access-Control-Expose-Headers": "Content-Type, X-Chat-Stream-Id",
+    # 청크 전송 최적화
+    "Transfer-Encoding": "chunked",
+    "X-Accel-Buffering": "no",  # nginx 버퍼링 비활성화
+}
+
+
+def _session_info_event(chat_request: ChatRequest, stream_id: str) -> str:
+    """초기 이벤트: session_uuid와 재연결용 stream_id"""
+    session_info = {
+        "session_uuid": chat_request.session_uuid,
+        "stream_id": stream_id,
+        "timestamp": asyncio.get_event_loop().time(),
+    }
+    session_info_json = json.dumps(session_info, ensure_ascii=False)
+    return f"event: chat_session_info\ndata: {session_info_json}\n\n"
+
+
+def _subscribe_response(
+    request: Request,
+    state: StreamState,
+    after_seq: int = -1,
+    preamble: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    스트림 버퍼를 구독하는 SSE 응답 생성.
+
+    이 클라이언트의 연결이 끊기면 구독만 종료되고, 생성(producer)은
+    재연결 유예 시간 동안 계속 진행됨. preamble은 버퍼 재전송 전에 이 구독자에게만 전송됨.
+    """
+
+    async def subscribe() -> AsyncGenerator[str, None]:
+        # ASGI receive 기반 연결 해제 감시 (구독자당 하나, 폴링 없음)
+        disconnect_watcher = DisconnectWatcher(
+            request.receive, label=f"stream={state.stream_id}"
+        ).start()
+        disconnect_watcher.add_callback(state.wake)
+        try:
+            if preamble is not None:
+                yield preamble
+            async for frame in state.subscribe(after_seq, until=disconnect_watcher):
+                yield frame
+        finally:
+            await disconnect_watcher.stop()
+
+    return StreamingResponse(
+        subscribe(),
+        media_type="text/event-stream",
+        headers={**_SSE_HEADERS, "X-Chat-Stream-Id": state.stream_id},
+    )
+
 
 @router.post(
     "", summary="AI Chat Endpoint with HSCode Search and Streaming", response_model=None
@@ -25,8 +88,8 @@ async def handle_chat(
     request: Request,
     chat_request: ChatRequest,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
     chat_service: ChatService = Depends(get_chat_service),
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
 ) -> Union[StreamingResponse, JSONResponse]:
     """
     사용자의 채팅 메시지를 받아 AI와 대화하고, 응답을 실시간으로 스트리밍함.
@@ -51,8 +114,23 @@ async def handle_chat(
           - `event: chat_message_delta`: 메시지 메타데이터 (stop_reason 등)
           - `event: chat_message_limit`: 메시지 제한 정보
           - `event: chat_message_stop`: 메시지 종료
+        - 모든 SSE 프레임에는 `id: {stream_id}:{seq}`가 붙음
+    - **재연결:** 끊긴 뒤 같은 요청 본문과 `Last-Event-ID` 헤더로 다시 요청하면 새 LLM 호출 없이
+      진행 중인 생성에 다시 연결하거나 완료된 응답을 해당 id 이후부터 재전송함.
+      user_id, session_uuid, message 중 하나라도 원래 요청과 다르면 헤더를 무시하고 새로 처리함
     """
 
+    # === 끊긴 스트림 재개 (Last-Event-ID, 원래 요청과 본문이 같은 경우만) ===
+    resumed = stream_registry.resume(
+        last_event_id,
+        user_id=chat_request.user_id,
+        session_uuid=chat_request.session_uuid,
+        message=chat_request.message,
+    )
+    if resumed:
+        state, after_seq = resumed
+        return _subscribe_response(request, state, after_seq)
+
     # 성공적인 요청 로깅
     logger.info(f"=== 채팅 요청 성공 ===")
     logger.info(f"사용자 ID: {chat_request.user_id}")
@@ -62,8 +140,26 @@ async def handle_chat(
     logger.info(f"====================")
 
     # === 통합 의도 분류 및 특수 처리 ===
-    special_response = await chat_service.check_unified_intent(chat_request)
+    # 의도 분류와 동시에 HSCode 추출, 세션 검증, 대화 기록 조회를 시작하고
+    # 분류 결과는 요청당 한 번만 구해 스트리밍 파이프라인까지 전달.
+    # DB 세션은 응답 생성(producer)이 끝날 때 닫히며, 그 전에 반환하는 경로에서는 여기서 닫음
+    db = SessionLocal()
+    preprocessing = chat_service.start_preprocessing(chat_request, db)
+
+    async def abandon_preprocessing() -> None:
+        preprocessing.cancel_all()
+        await db.close()
+
+    try:
+        intent_result = await preprocessing.get("intent")
+        special_response = await chat_service.check_unified_intent(
+            chat_request, intent_result=intent_result
+        )
+    except BaseException:
+        await abandon_preprocessing()
+        raise
     if special_response:
+        await abandon_preprocessing()
         logger.info(
             f"특수 의도 감지됨: {special_response.get('type', 'unknown')}. JSON 응답을 반환합니다."
         )
@@ -78,49 +174,59 @@ async def handle_chat(
             },
         )
 
+    # === 동일 질문 single-flight (비회원·대화 기록 없는 요청만) ===
+    # 같은 경로로 분류된 같은 질문이 생성 중이면 새 LLM 호출 없이 해당 스트림에 합류
+    flight_key: Optional[str] = None
+    if settings.CHAT_SINGLE_FLIGHT_ENABLED and chat_request.user_id is None:
+        flight_key = (
+            f"{intent_result.intent_type.value}:{make_cache_key(chat_request.message)}"
+        )
+        leader = stream_registry.join(
+            flight_key, chat_request.user_id, chat_request.session_uuid
+        )
+        if leader:
+            await abandon_preprocessing()
+            # 세션 정보는 요청자별로 보내고, 나머지 프레임(seq 1~)은 공유
+            return _subscribe_response(
+                request,
+                leader,
+                after_seq=0,
+                preamble=_session_info_event(chat_request, leader.stream_id),
+            )
+
     # === 일반 채팅 SSE 스트리밍 처리 ===
+    # 응답 생성은 클라이언트 연결과 분리된 producer 작업에서 진행하고,
+    # 생성된 프레임은 스트림 버퍼를 통해 구독자(현재 및 재연결 클라이언트)에게 전달
+    state = stream_registry.create(
+        user_id=chat_request.user_id,
+        session_uuid=chat_request.session_uuid,
+        message=chat_request.message,
+        flight_key=flight_key,
+    )
+
     async def generate_sse_stream() -> AsyncGenerator[str, None]:
         """
-        SSE 형식의 스트림을 생성하는 비동기 제너레이터.
-        클라이언트 연결 해제를 감지하고 적절한 에러 처리를 수행함.
+        SSE 형식의 스트림을 생성하는 비동기 제너레이터 (producer).
+        요청보다 오래 실행될 수 있으므로 전용 DB 세션을 사용하며,
+        클라이언트 연결 해제가 아닌 재연결 유예 시간 만료 시에만 업스트림 작업이 취소됨.
         """
         accumulated_response = ""  # 응답 내용 누적용
         response_started = False
+        chat_stream = chat_service.stream_chat_response(
+            chat_request=chat_request,
+            db=db,
+            background_tasks=background_tasks,
+            intent_result=intent_result,
+            preprocessing=preprocessing,
+            disconnect_watcher=state.scope,
+        )
 
         try:
-            # 클라이언트 연결 상태 확인
-            if await request.is_disconnected():
-                logger.info("클라이언트가 연결을 해제했습니다.")
-                return
-
-            # 초기 이벤트: session_uuid 전송
-            session_info = {
-                "session_uuid": chat_request.session_uuid,
-                "timestamp": asyncio.get_event_loop().time(),
-            }
-            session_info_json = json.dumps(session_info, ensure_ascii=False)
-            yield f"event: chat_session_info\ndata: {session_info_json}\n\n"
-
-            # 백프레셔 방지를 위한 짧은 대기
-            await asyncio.sleep(0.1)
-
-            # 연결 상태 재확인
-            if await request.is_disconnected():
-                logger.info("세션 정보 전송 후 클라이언트가 연결을 해제했습니다.")
-                return
+            # 초기 이벤트: session_uuid와 재연결용 stream_id 전송 (seq 0)
+            yield _session_info_event(chat_request, state.stream_id)
 
             # ChatService의 스트림을 그대로 전달 (HSCode 쿼리도 내부에서 처리)
-            async for chunk in chat_service.stream_chat_response(
-                chat_request=chat_request,
-                db=db,
-                background_tasks=background_tasks,
-                request=request,
-            ):
-                # 연결 상태 재확인
-                if await request.is_disconnected():
-                    logger.info("스트리밍 중 클라이언트가 연결을 해제했습니다.")
-                    break
-
+            async for chunk in chat_stream:
                 # 응답 시작 로깅 (최초 1회만)
                 if not response_started:
                     logger.info(f"=== AI 응답 시작 ===")
@@ -177,9 +283,6 @@ async def handle_chat(
                 # SSE 형식으로 청크 전송
                 yield chunk
 
-                # 백프레셔 방지를 위한 짧은 대기
-                await asyncio.sleep(0.001)
-
             # 응답 완료 로깅
             if response_started:
                 logger.info(f"=== AI 응답 완료 ===")
@@ -206,23 +309,52 @@ async def handle_chat(
                 logger.info(
                     f"예외 발생 전 응답 내용 (일부): {accumulated_response[:200]}..."
                 )
+        finally:
+            await chat_stream.aclose()
+            # 스트림이 시작되기 전에 취소된 경우에도 전처리 작업이 닫힌 세션을 쓰지 않도록 정리
+            preprocessing.cancel_all()
+            await db.close()
+
+    stream_registry.start(state, generate_sse_stream())
+    return _subscribe_response(request, state)
 
-    # SSE 스트리밍 응답 생성
-    response = StreamingResponse(
-        generate_sse_stream(),
-        media_type="text/event-stream",
-        headers={
-            # SSE 표준 헤더 설정
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With",
-            "Access-Control-Expose-Headers": "Content-Type",
-            # 청크 전송 최적화
-            "Transfer-Encoding": "chunked",
-            "X-Accel-Buffering": "no",  # nginx 버퍼링 비활성화
-        },
-    )
 
-    return response
+@router.get(
+    "/streams/{stream_id}",
+    summary="Resume an interrupted chat SSE stream",
+    response_model=None,
+)
+async def resume_chat_stream(
+    stream_id: str,
+    request: Request,
+    session_uuid: str = Query(..., description="스트림을 시작한 요청의 session_uuid"),
+    user_id: Optional[int] = Query(
+        default=None, description="스트림을 시작한 요청의 user_id (비회원은 생략)"
+    ),
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+) -> Union[StreamingResponse, JSONResponse]:
+    """
+    끊긴 채팅 스트림을 재개함 (EventSource 재연결용).
+
+    `Last-Event-ID` 헤더의 seq 이후 프레임부터 재전송하며, 헤더가 없으면 처음부터 전송함.
+    생성이 아직 진행 중이면 이어서 실시간으로 전달함.
+    스트림을 시작한 요청과 user_id, session_uuid가 다르면 스트림이 없는 것과 같이 404를 반환함.
+    """
+    resumed = stream_registry.resume(last_event_id, user_id, session_uuid)
+    if resumed and resumed[0].stream_id == stream_id:
+        state, after_seq = resumed
+        return _subscribe_response(request, state, after_seq)
+
+    state = stream_registry.get(stream_id, user_id, session_uuid)
+    if state is None:
+        return JSONResponse(
+            status_code=404,
+            content={
+                "type": "error",
+                "error": {
+                    "type": "stream_not_found",
+                    "message": "재개할 스트림을 찾을 수 없습니다. 새로 요청해주세요.",
+                },
+            },
+        )
+    return _subscribe_response(request, state)
@@ -5,6 +5,7 @@ import json
 import logging
 import asyncio
 import uuid
+from typing import Any, Dict
 from fastapi import APIRouter, Depends, HTTPException
 from redis.asyncio.client import Redis
 from redis.exceptions import RedisError
@@ -21,9 +22,22 @@ from aiolimiter import AsyncLimiter
 
 from app.api.v1.dependencies import get_redis_client, get_llm_service
 from app.core.config import settings
+from app.core.resources import resources
 from app.db import crud
-from app.db.session import get_db, SessionLocal
+from app.db.session import get_read_db, SessionLocal
+from app.db.telemetry import db_telemetry
 from app.services.langchain_service import LLMService
+from app.services.llm_registry import llm_registry
+from app.services.intent_classification_service import intent_classification_stats
+from app.services.sse_event_generator import sse_coalescing_stats
+from app.services.stream_registry import stream_registry
+from app.services.semantic_answer_cache import semantic_answer_cache
+from app.services.session_metadata_cache import session_metadata_cache
+from app.services.chat_persistence_queue import chat_persistence_queue
+from app.utils.disconnect_watcher import cancellation_savings
+from app.vector_stores.embedding_cache import embedding_cache
+from app.vector_stores.hscode_retriever import hscode_vector_search
+from app.vector_stores.hscode_hybrid_search import hscode_hybrid_search
 from app.models.db_models import Bookmark
 from app.models.monitoring_models import MonitoringUpdate
 
@@ -299,7 +313,7 @@ async def _process_bookmark(
 
 @router.post("/run-monitoring", response_model=MonitoringResponse)
 async def run_monitoring(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     redis_client: Redis = Depends(get_redis_client),
     llm_service: LLMService = Depends(get_llm_service),
 ):
@@ -407,7 +421,10 @@ async def run_monitoring(
     try:
         logger.info("Redis 분산 락 획득 성공")
 
+        # 북마크 스캔은 읽기 전용 세션(복제본 가능)에서 수행하고 바로 연결을 반환함.
+        # 갱신은 북마크별 SessionLocal에서 merge 후 수행됨
         active_bookmarks = await crud.get_active_bookmarks(db)
+        await db.close()
         if not active_bookmarks:
             logger.info("모니터링할 활성 북마크가 없습니다.")
             return MonitoringResponse(
@@ -467,3 +484,43 @@ async def run_monitoring(
                 logger.info("Redis 분산 락 해제 완료")
             except Exception as e:
                 logger.warning(f"Redis 락 해제 중 오류 발생: {e}")
+
+
+@router.get("/stats")
+async def get_runtime_stats() -> Dict[str, Any]:
+    """
+    프로세스 내부 공유 자원의 현재 사용 현황을 조회.
+
+    - llm_pool: LLM 클라이언트 레지스트리 및 HTTP 연결 풀 점유 현황
+    - intent_classification: 의도 분류 single-flight 실행/공유 횟수
+    - sse_coalescing: 텍스트 델타 병합 전후 청크/프레임 수
+    - disconnect_cancellation: 연결 해제로 조기 취소된 스트림과 절약 토큰/비용 추정치
+    - chat_streams: 재개 가능한 SSE 스트림 버퍼 현황 (재연결/유예 만료 횟수)
+    - semantic_answer_cache: 일반 질문 답변 캐시 적중률과 조회 지연 시간
+    - session_metadata_cache: 세션 검증 메타데이터 캐시 적중률
+    - chat_persistence: 채팅 지연 저장 큐 깊이, 배치 크기, 재시도/실패/spill 횟수,
+      Redis dead-letter 리스트에 보관된 턴 수
+    - db: 연결 풀 점유/대기 시간과 CRUD 메서드별 지연 시간 히스토그램
+    - hscode_id_cache: HSCode 코드 → id 캐시 적중률
+    - vector_search: HSCode 벡터 검색 횟수, 타임아웃/오류 횟수, 평균 지연 시간
+    - resources: 앱 import 시간, 워밍업 시간, 지연 초기화 자원별 생성 시간/경로
+    """
+    return {
+        "llm_pool": llm_registry.stats(),
+        "intent_classification": intent_classification_stats(),
+        "sse_coalescing": sse_coalescing_stats(),
+        "disconnect_cancellation": cancellation_savings.stats(),
+        "chat_streams": stream_registry.stats(),
+        "semantic_answer_cache": semantic_answer_cache.stats(),
+        "session_metadata_cache": session_metadata_cache.stats(),
+        "chat_persistence": {
+            **chat_persistence_queue.stats(),
+            "dead_letters": await chat_persistence_queue.dead_letter_depth(),
+        },
+        "db": db_telemetry.stats(),
+        "hscode_id_cache": crud.hscode.id_cache.stats(),
+        "vector_search": hscode_vector_search.stats(),
+        "hybrid_search": hscode_hybrid_search.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "resources": resources.stats(),
+    }
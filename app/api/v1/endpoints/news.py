@@ -1,20 +1,37 @@
 """
-뉴스 생성 API 엔드포인트
+뉴스 생성/조회 API 엔드포인트
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.dependencies import get_news_service
 from app.db import crud
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.models import schemas
 from app.services.news_service import NewsService
+from app.services.semantic_answer_cache import semantic_answer_cache
 
 # from app.services.db_service import DBService # TODO: DB 서비스 구현 후 주석 해제
 
 router = APIRouter()
 
 
+@router.get("", response_model=List[schemas.TradeNews], summary="무역 뉴스 목록 조회")
+async def list_trade_news(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    최신 게시일 순으로 무역 뉴스 목록을 조회합니다.
+    읽기 전용 세션을 사용하므로 복제본이 설정되어 있으면 복제본에서 조회합니다.
+    """
+    return await crud.trade_news.get_latest(db, skip=skip, limit=limit)
+
+
 @router.post("", status_code=201, summary="온디맨드 뉴스 생성")
 async def generate_trade_news(
     db: AsyncSession = Depends(get_db),
@@ -39,6 +56,9 @@ async def generate_trade_news(
         await crud.trade_news.create_multi(db, news_items=generated_news_list)
         await db.commit()  # 변경사항을 데이터베이스에 최종 커밋
 
+        # 새 뉴스와 관련된 일반 질문 캐시 답변은 더 이상 최신이 아니므로 만료 (실패해도 무시)
+        await semantic_answer_cache.invalidate_for_news(generated_news_list)
+
         return {
             "status": "success",
             "message": f"{len(generated_news_list)} news items have been successfully generated and saved.",
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -27,6 +27,31 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://localhost:5432/tradedb"
+    DB_ECHO: bool = False  # SQL 쿼리 로깅 (개발용)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # 연결 획득 대기 제한 시간 (초)
+    DB_POOL_RECYCLE: int = 1800  # 연결 재생성 주기 (초)
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statement 캐시 크기
+    # 읽기 전용 복제본 DSN (미설정 시 읽기 전용 세션도 primary 풀 사용)
+    # 복제 지연이 있으므로 방금 쓴 데이터를 바로 읽어야 하는 경로에는 사용하지 않음
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # HSCode 벡터 검색 전용 asyncpg 연결 풀과 쿼리별 타임아웃 (임베딩 호출 포함)
+    VECTOR_DB_POOL_SIZE: int = 5
+    VECTOR_DB_MAX_OVERFLOW: int = 5
+    VECTOR_SEARCH_TIMEOUT_SECONDS: float = 3.0
+    # HSCode 하이브리드 검색 (어휘 + 벡터, RRF 결합). 끄면 벡터 검색만 사용
+    HSCODE_HYBRID_SEARCH_ENABLED: bool = True
+    HSCODE_HYBRID_CANDIDATES: int = 20  # 결합 전 검색 방식별 후보 수
+    HSCODE_HYBRID_RRF_K: int = 60  # RRF 상수 (클수록 하위 순위 가중치가 커짐)
+    # HSCode 채팅 응답 시 검색한 후보 코드를 전문가 프롬프트에 참고 자료로 포함
+    HSCODE_CHAT_RETRIEVAL_ENABLED: bool = True
+    # 의도 분류와 동시에 HSCode 추출(Haiku)을 미리 시작 (HSCode 경로가 아니면 취소됨)
+    CHAT_SPECULATIVE_HSCODE_EXTRACTION: bool = True
+    # 임베딩 클라이언트/벡터 스토어 등 공유 자원을 시작 시 미리 생성 (끄면 첫 사용 시 생성)
+    RESOURCE_WARMUP_ENABLED: bool = True
+    RESOURCE_WARMUP_TIMEOUT_SECONDS: float = 15.0
 
     # Redis - 환경변수 기반 설정으로 변경
     REDIS_HOST: str = "localhost"
@@ -65,6 +90,97 @@ class Settings(BaseSettings):
     VOYAGE_API_KEY: str = ""
     ANTHROPIC_MODEL: str = "claude-sonnet-4-20250514"
 
+    # LLM HTTP 연결 풀 설정 (모든 ChatAnthropic 인스턴스가 공유)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+
+    # 의도 분류 캐시 설정 (프로세스 내부 LRU + Redis 공유 캐시)
+    INTENT_CACHE_TTL_SECONDS: int = 3600
+    INTENT_CACHE_MAX_ENTRIES: int = 1024
+    INTENT_CACHE_REDIS_ENABLED: bool = True
+    INTENT_CACHE_KEY_PREFIX: str = "intent_cache:v1:"
+
+    # 쿼리 임베딩 캐시 ((모델, 정규화 텍스트 해시) 키, 로컬 LRU + Redis float16 바이트)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 4096  # 로컬 항목당 약 2KB (1024차원 float16)
+    EMBEDDING_CACHE_TTL_SECONDS: int = 2592000  # 30일
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = True
+    EMBEDDING_CACHE_KEY_PREFIX: str = "embedding_cache:v2:"
+    # 로컬 규칙 기반 사전 분류 (임계값 이상이면 LLM 분류 생략)
+    INTENT_LOCAL_CLASSIFIER_ENABLED: bool = True
+    INTENT_LOCAL_CONFIDENCE_THRESHOLD: float = 0.85
+
+    # SSE 텍스트 델타 병합 (첫 토큰은 즉시 전송, 이후 시간/크기 기준으로 묶어서 전송)
+    SSE_COALESCE_INTERVAL_MS: int = 50  # 0 이하이면 병합 비활성화
+    SSE_COALESCE_MAX_BYTES: int = 2048
+
+    # 재개 가능한 SSE 스트림 (Last-Event-ID 재연결 시 버퍼에서 재전송)
+    CHAT_RESUME_ENABLED: bool = True
+    CHAT_RESUME_BUFFER_FRAMES: int = 2048  # 스트림당 보관할 최대 프레임 수
+    # 구독자가 모두 끊긴 뒤 재연결을 기다리며 생성을 유지하는 시간 (초).
+    # 그동안 LLM 토큰은 계속 소비되므로 재연결 지원과 비용 사이의 절충이며, 0이면 즉시 취소
+    CHAT_RESUME_GRACE_SECONDS: float = 30.0
+    CHAT_RESUME_TTL_SECONDS: int = 300  # 완료된 스트림 버퍼 보관 시간
+    CHAT_RESUME_MAX_STREAMS: int = 1000
+    # 동일 질문 동시 요청 single-flight (비회원·대화 기록 없는 요청만, 기본 비활성화)
+    CHAT_SINGLE_FLIGHT_ENABLED: bool = False
+
+    # 일반 무역 질문 시맨틱 답변 캐시 (pgvector)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = 0.95  # 코사인 유사도
+    SEMANTIC_CACHE_TTL_SECONDS: int = 21600  # 6시간
+    # 새 뉴스와 이 유사도 이상인 캐시 항목은 뉴스 적재 시 만료
+    SEMANTIC_CACHE_INVALIDATION_THRESHOLD: float = 0.6
+
+    # 대화 기록 윈도우 (최근 N개 메시지 + 누적 요약, 토큰 예산 내로 제한)
+    CHAT_HISTORY_WINDOW_MESSAGES: int = 20
+    CHAT_HISTORY_TOKEN_BUDGET: int = 6000  # 요약 포함 이전 대화 최대 추정 토큰 수
+    CHAT_HISTORY_SUMMARY_ENABLED: bool = True
+    CHAT_HISTORY_SUMMARY_MIN_MESSAGES: int = 6  # 요약되지 않은 이전 메시지가 이 개수 이상이면 요약
+    CHAT_HISTORY_SUMMARY_BATCH_MESSAGES: int = 40  # 한 번에 요약할 최대 메시지 수
+
+    # 세션 메타데이터 캐시 ((user_id, session_uuid) 키, 세션 존재/소유 확인용)
+    CHAT_SESSION_CACHE_TTL_SECONDS: int = 30
+    CHAT_SESSION_CACHE_MAX_ENTRIES: int = 10000
+
+    # 채팅 대화 지연 저장(write-behind) 큐
+    # 켜기 전에 add_chat_message_turn_id_migration.sql 적용 필요 (turn_id 멱등 저장)
+    CHAT_PERSIST_WRITE_BEHIND_ENABLED: bool = False
+    CHAT_PERSIST_QUEUE_MAX: int = 1000
+    CHAT_PERSIST_BATCH_SIZE: int = 50  # 한 번의 INSERT로 저장할 최대 턴 수
+    CHAT_PERSIST_FLUSH_INTERVAL_MS: int = 100  # 첫 턴 이후 배치를 모으는 최대 시간
+    CHAT_PERSIST_MAX_RETRIES: int = 3
+    CHAT_PERSIST_DRAIN_TIMEOUT_SECONDS: float = 10.0  # 종료 시 남은 턴 저장 제한 시간
+    CHAT_PERSIST_REDIS_SPILL_ENABLED: bool = True
+    CHAT_PERSIST_SPILL_KEY: str = "chat:persist:spill"
+    CHAT_PERSIST_DEAD_LETTER_KEY: str = "chat:persist:dead"
+    CHAT_PERSIST_SPILL_POLL_SECONDS: float = 5.0  # 큐가 비어 있을 때 Redis spill 확인 주기
+
+    # 채팅 테이블 월 단위 파티션 관리 (app.db.partition_manager)
+    CHAT_PARTITION_MONTHS_AHEAD: int = 3  # 현재 월 이후 미리 생성할 파티션 개월 수
+    CHAT_PARTITION_RETENTION_MONTHS: int = 12  # 현재 월 이전 보관 개월 수
+    CHAT_PARTITION_RETIRE_MODE: str = "archive"  # detach | archive | drop
+    CHAT_PARTITION_ARCHIVE_SCHEMA: str = "chat_archive"
+    # PostgreSQL 14+ 에서 DETACH ... CONCURRENTLY 사용 (DEFAULT 파티션이 없을 때만 가능)
+    CHAT_PARTITION_DETACH_CONCURRENTLY: bool = False
+
+    # 오래된 채팅 메시지 콜드 스토리지 아카이브 (app.db.chat_archive, pyarrow 필요)
+    CHAT_ARCHIVE_DIR: str = "archive/chat_messages"
+    CHAT_ARCHIVE_RETENTION_DAYS: int = 180  # 이보다 오래된 메시지를 아카이브
+    CHAT_ARCHIVE_FETCH_ROWS: int = 5000  # 서버 사이드 커서에서 한 번에 가져올 행 수
+    CHAT_ARCHIVE_ROWS_PER_FILE: int = 500_000  # 파일 하나(=삭제 단위)의 최대 행 수
+    CHAT_ARCHIVE_DELETE_BATCH: int = 5000  # 트랜잭션 하나에서 삭제할 행 수
+    CHAT_ARCHIVE_COMPRESSION: str = "zstd"
+
+    # HSCode 코드 → id 프로세스 내 캐시 (문서 적재 시 HSCode 조회 왕복 제거)
+    HSCODE_ID_CACHE_MAX_ENTRIES: int = 50000
+
+    # hscode_vectors 일괄 임베딩 적재 (app.vector_stores.hscode_ingest)
+    HSCODE_INGEST_BATCH_SIZE: int = 128  # 임베딩 호출 + upsert 한 번에 처리할 행 수
+    HSCODE_INGEST_CONCURRENCY: int = 4  # 동시에 처리할 배치 수 (DB 풀 크기 이하로 유지)
+    HSCODE_INGEST_MAX_RETRIES: int = 3  # 배치별 임베딩/저장 재시도 횟수
+
     # Web Search Settings
     WEB_SEARCH_ENABLED: bool = True
 
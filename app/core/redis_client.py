@@ -0,0 +1,66 @@
+"""
+프로세스 공유 Redis 연결 풀
+
+API 의존성 주입과 서비스 계층(캐시 등)이 같은 연결 풀을 사용하도록 함.
+"""
+
+import logging
+from functools import lru_cache
+
+import redis.asyncio as redis
+from redis.asyncio.client import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_redis_pool() -> redis.ConnectionPool:
+    """
+    Redis 연결 풀을 생성.
+    실제 연결은 클라이언트가 처음 사용할 때 이루어짐.
+    """
+    try:
+        pool = redis.ConnectionPool.from_url(
+            settings.redis_dsn,
+            encoding="utf-8",
+            decode_responses=True,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+            retry_on_timeout=True,
+            health_check_interval=30,
+        )
+        logger.info(
+            f"Redis 연결 풀 생성 완료: {settings.REDIS_HOST}:{settings.REDIS_PORT}"
+        )
+        return pool
+    except Exception as e:
+        logger.critical(f"치명적 오류: Redis 연결 풀 생성 실패. 에러: {e}")
+        raise
+
+
+def get_shared_redis() -> Redis:
+    """공유 연결 풀에 바인딩된 Redis 클라이언트 반환 (ping 없이 즉시 반환)"""
+    return redis.Redis(connection_pool=get_redis_pool())
+
+
+@lru_cache(maxsize=1)
+def get_binary_redis_pool() -> redis.ConnectionPool:
+    """
+    응답을 디코딩하지 않는 Redis 연결 풀 (임베딩 벡터 등 바이너리 값 저장용).
+    공유 풀은 decode_responses=True이므로 바이트 값을 다룰 수 없어 별도로 둠.
+    """
+    return redis.ConnectionPool.from_url(
+        settings.redis_dsn,
+        decode_responses=False,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+        retry_on_timeout=True,
+        health_check_interval=30,
+    )
+
+
+def get_binary_redis() -> Redis:
+    """바이너리 연결 풀에 바인딩된 Redis 클라이언트 반환"""
+    return redis.Redis(connection_pool=get_binary_redis_pool())
@@ -0,0 +1,161 @@
+"""
+지연 초기화 공유 자원 컨테이너
+
+임베딩 클라이언트, 벡터 검색 엔진/스토어처럼 생성 비용이 크거나 외부 연결이 필요한 자원을
+모듈 import 시점이 아니라 첫 사용 시점 또는 lifespan 워밍업 단계에서 생성함.
+
+- 자원별 생성은 한 번만 수행 (동시 첫 요청은 같은 생성 작업을 기다림)
+- 생성 실패는 캐시하지 않으므로 다음 사용 시 다시 시도함
+- 앱 import 시간과 자원별 생성 시간/경로(lazy, warmup)를 /monitoring/stats로 보고함
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, TypeVar, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Factory = Callable[[], Union[T, Awaitable[T]]]
+Closer = Callable[[T], Union[None, Awaitable[None]]]
+
+
+class LazyResource(Generic[T]):
+    """첫 사용 시 한 번만 생성되는 자원"""
+
+    def __init__(
+        self, name: str, factory: Factory, closer: Optional[Closer] = None
+    ) -> None:
+        self.name = name
+        self._factory = factory
+        self._closer = closer
+        self._value: Optional[T] = None
+        self._lock = asyncio.Lock()
+        self.build_ms: Optional[float] = None
+        self.built_by: Optional[str] = None
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    async def aget(self, source: str = "lazy") -> T:
+        """자원을 반환하고, 아직 없으면 생성"""
+        if self._value is not None:
+            return self._value
+        async with self._lock:
+            if self._value is None:
+                started = time.perf_counter()
+                try:
+                    value = self._factory()
+                    if inspect.isawaitable(value):
+                        value = await value
+                except Exception as e:
+                    self.failures += 1
+                    self.last_error = str(e)
+                    raise
+                self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+                self.built_by = source
+                self.last_error = None
+                self._value = value
+                logger.info(
+                    f"공유 자원 생성: {self.name} ({source}, {self.build_ms}ms)"
+                )
+        return self._value
+
+    async def aclose(self) -> None:
+        value, self._value = self._value, None
+        if value is None or self._closer is None:
+            return
+        result = self._closer(value)
+        if inspect.isawaitable(result):
+            await result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "build_ms": self.build_ms,
+            "built_by": self.built_by,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class ResourceContainer:
+    """이름으로 등록된 지연 초기화 자원 모음"""
+
+    def __init__(self) -> None:
+        self._resources: Dict[str, LazyResource[Any]] = {}
+        self.import_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+
+    def register(
+        self, name: str, factory: Factory, closer: Optional[Closer] = None
+    ) -> LazyResource[Any]:
+        resource: LazyResource[Any] = LazyResource(name, factory, closer)
+        self._resources[name] = resource
+        return resource
+
+    async def aget(self, name: str) -> Any:
+        return await self._resources[name].aget()
+
+    def record_import(self, started: float) -> None:
+        """앱 모듈 import 소요 시간 기록 (time.perf_counter 기준 시작 시각)"""
+        self.import_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"앱 모듈 import 시간: {self.import_ms}ms")
+
+    async def warm_up(self, timeout: Optional[float] = None) -> None:
+        """
+        등록된 자원을 동시에 미리 생성.
+        실패하거나 제한 시간을 넘긴 자원은 로깅만 하고 첫 사용 시 다시 생성을 시도함.
+        """
+        timeout = (
+            settings.RESOURCE_WARMUP_TIMEOUT_SECONDS if timeout is None else timeout
+        )
+        started = time.perf_counter()
+        tasks = {
+            asyncio.create_task(resource.aget(source="warmup")): name
+            for name, resource in self._resources.items()
+            if not resource.ready
+        }
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+                logger.warning(f"공유 자원 워밍업 시간 초과: {tasks[task]}")
+            if pending:
+                await asyncio.wait(pending)
+            for task in done:
+                if task.exception() is not None:
+                    logger.warning(
+                        f"공유 자원 워밍업 실패 (첫 사용 시 재시도): "
+                        f"{tasks[task]}: {task.exception()}"
+                    )
+        self.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"공유 자원 워밍업 완료: {self.warmup_ms}ms")
+
+    async def aclose(self) -> None:
+        for name, resource in reversed(list(self._resources.items())):
+            try:
+                await resource.aclose()
+            except Exception as e:
+                logger.warning(f"공유 자원 정리 실패: {name}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "import_ms": self.import_ms,
+            "warmup_ms": self.warmup_ms,
+            "resources": {
+                name: resource.stats() for name, resource in self._resources.items()
+            },
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+resources = ResourceContainer()
@@ -0,0 +1,398 @@
+"""
+오래된 채팅 메시지 콜드 스토리지 아카이브
+
+보관 기간(CHAT_ARCHIVE_RETENTION_DAYS)이 지난 `chat_messages` 행을 서버 사이드 커서로
+스트리밍하여 월별 디렉터리의 압축 Parquet 파일로 쓰고, 파일이 디스크에 확정된 뒤에만
+해당 행을 배치 단위로 삭제함. 핫 테이블과 인덱스
+(`idx_chat_messages_created_at`, `idx_chat_messages_session_created` 등)를 작게 유지하는 것이 목적임.
+
+- 파일 배치: {CHAT_ARCHIVE_DIR}/{YYYY-MM}/chat_messages_{첫 message_id}_{마지막 message_id}.parquet
+- 파일 하나가 삭제 단위이므로 작업이 중간에 실패해도 아카이브되지 않은 행은 삭제되지 않음
+- 세션(chat_sessions) 행과 message_count는 그대로 두므로 세션 목록에는 영향이 없음
+- `ChatArchiveReader`로 세션의 아카이브 메시지를 조회하거나 테이블에 되살릴 수 있음
+
+pyarrow가 필요함 (`pip install 'trade-python[archive]'`).
+
+사용법:
+    python -m app.db.chat_archive archive --dry-run
+    python -m app.db.chat_archive archive --retention-days 365 --vacuum
+    python -m app.db.chat_archive read <session_uuid>
+    python -m app.db.chat_archive rehydrate <session_uuid>
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db import crud
+from app.models.db_models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+# JSONB 컬럼은 JSON 문자열로 저장
+_JSON_COLUMNS = ("hscode_analysis", "sse_bookmark_data")
+_ARCHIVE_COLUMNS = (
+    "message_id",
+    "session_uuid",
+    "message_type",
+    "content",
+    "ai_model",
+    "thinking_process",
+    "hscode_analysis",
+    "sse_bookmark_data",
+    "created_at",
+)
+
+
+def _require_pyarrow() -> Tuple[Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            "채팅 메시지 아카이브에는 pyarrow가 필요합니다: "
+            "pip install 'trade-python[archive]'"
+        ) from e
+    return pa, pq
+
+
+def _arrow_schema(pa: Any) -> Any:
+    return pa.schema(
+        [
+            ("message_id", pa.int64()),
+            ("session_uuid", pa.string()),
+            ("message_type", pa.string()),
+            ("content", pa.string()),
+            ("ai_model", pa.string()),
+            ("thinking_process", pa.string()),
+            ("hscode_analysis", pa.string()),
+            ("sse_bookmark_data", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+def _month_key(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m")
+
+
+@dataclass
+class ArchiveResult:
+    """아카이브 실행 결과"""
+
+    cutoff: datetime
+    dry_run: bool
+    rows_archived: int = 0
+    rows_deleted: int = 0
+    months: Dict[str, int] = field(default_factory=dict)
+    files: List[str] = field(default_factory=list)
+
+
+class _ArchivePart:
+    """작성 중인 Parquet 파일 하나. 임시 파일에 쓰고 close 시 fsync 후 최종 이름으로 변경"""
+
+    def __init__(self, pa: Any, pq: Any, directory: Path, month: str) -> None:
+        self.pa = pa
+        self.directory = directory / month
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.month = month
+        self.tmp_path = self.directory / f".chat_messages_{os.getpid()}.parquet.tmp"
+        self.schema = _arrow_schema(pa)
+        self.writer = pq.ParquetWriter(
+            str(self.tmp_path),
+            self.schema,
+            compression=settings.CHAT_ARCHIVE_COMPRESSION,
+        )
+        self.message_ids: List[int] = []
+
+    def write(self, rows: Sequence[Any]) -> None:
+        columns: Dict[str, List[Any]] = {name: [] for name in _ARCHIVE_COLUMNS}
+        for row in rows:
+            mapping = row._mapping
+            for name in _ARCHIVE_COLUMNS:
+                value = mapping[name]
+                if name == "session_uuid":
+                    value = str(value)
+                elif name in _JSON_COLUMNS and value is not None:
+                    value = json.dumps(value, ensure_ascii=False)
+                columns[name].append(value)
+        self.writer.write_table(
+            self.pa.Table.from_pydict(columns, schema=self.schema)
+        )
+        self.message_ids.extend(columns["message_id"])
+
+    def close(self) -> Path:
+        self.writer.close()
+        final_path = self.directory / (
+            f"chat_messages_{self.message_ids[0]}_{self.message_ids[-1]}.parquet"
+        )
+        with open(self.tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(self.tmp_path, final_path)
+        return final_path
+
+    def abort(self) -> None:
+        try:
+            self.writer.close()
+        finally:
+            self.tmp_path.unlink(missing_ok=True)
+
+
+class ChatArchiver:
+    """보관 기간이 지난 채팅 메시지를 Parquet으로 옮기고 테이블에서 삭제"""
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        archive_dir: Optional[str] = None,
+        retention_days: Optional[int] = None,
+    ) -> None:
+        if engine is None:
+            from app.db.session import engine as default_engine
+
+            engine = default_engine
+        self.engine = engine
+        self.archive_dir = Path(archive_dir or settings.CHAT_ARCHIVE_DIR)
+        self.retention_days = (
+            settings.CHAT_ARCHIVE_RETENTION_DAYS
+            if retention_days is None
+            else retention_days
+        )
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        now = now or datetime.now(timezone.utc)
+        return now - timedelta(days=self.retention_days)
+
+    async def plan(self, cutoff: datetime) -> Dict[str, int]:
+        """아카이브 대상 행 수를 월별로 집계 (DB 변경 없음)"""
+        month = func.date_trunc("month", func.timezone("UTC", ChatMessage.created_at))
+        stmt = (
+            select(month, func.count())
+            .where(ChatMessage.created_at < cutoff)
+            .group_by(month)
+            .order_by(month)
+        )
+        async with self.engine.connect() as conn:
+            result = await conn.execute(stmt)
+            return {f"{m:%Y-%m}": count for m, count in result.all()}
+
+    async def _delete(self, message_ids: List[int]) -> int:
+        """아카이브 파일이 확정된 행을 배치 단위 트랜잭션으로 삭제"""
+        from app.db.session import SessionLocal
+
+        deleted = 0
+        batch = settings.CHAT_ARCHIVE_DELETE_BATCH
+        for i in range(0, len(message_ids), batch):
+            async with SessionLocal() as db:
+                deleted += await crud.chat.delete_messages_by_ids(
+                    db, message_ids[i : i + batch]
+                )
+                await db.commit()
+        return deleted
+
+    async def _finish(self, part: _ArchivePart, result: ArchiveResult) -> None:
+        path = await asyncio.to_thread(part.close)
+        result.files.append(str(path))
+        result.rows_archived += len(part.message_ids)
+        result.months[part.month] = (
+            result.months.get(part.month, 0) + len(part.message_ids)
+        )
+        result.rows_deleted += await self._delete(part.message_ids)
+        logger.info(
+            f"채팅 메시지 {len(part.message_ids)}건 아카이브 및 삭제: {path}"
+        )
+
+    async def run(
+        self,
+        now: Optional[datetime] = None,
+        dry_run: bool = False,
+        vacuum: bool = False,
+    ) -> ArchiveResult:
+        cutoff = self.cutoff(now)
+        result = ArchiveResult(cutoff=cutoff, dry_run=dry_run)
+        if dry_run:
+            result.months = await self.plan(cutoff)
+            result.rows_archived = sum(result.months.values())
+            return result
+
+        pa, pq = _require_pyarrow()
+        columns = [ChatMessage.__table__.c[name] for name in _ARCHIVE_COLUMNS]
+        stmt = (
+            select(*columns)
+            .where(ChatMessage.created_at < cutoff)
+            .order_by(ChatMessage.created_at, ChatMessage.message_id)
+            .execution_options(yield_per=settings.CHAT_ARCHIVE_FETCH_ROWS)
+        )
+        part: Optional[_ArchivePart] = None
+        try:
+            # 서버 사이드 커서는 스냅샷을 읽으므로 다른 연결의 배치 삭제와 충돌하지 않음
+            async with self.engine.connect() as conn:
+                stream = await conn.stream(stmt)
+                async for rows in stream.partitions():
+                    for month, bucket in _group_by_month(rows):
+                        if part is not None and (
+                            part.month != month
+                            or len(part.message_ids)
+                            >= settings.CHAT_ARCHIVE_ROWS_PER_FILE
+                        ):
+                            await self._finish(part, result)
+                            part = None
+                        if part is None:
+                            part = _ArchivePart(pa, pq, self.archive_dir, month)
+                        await asyncio.to_thread(part.write, bucket)
+            if part is not None:
+                await self._finish(part, result)
+                part = None
+        finally:
+            if part is not None:
+                # 확정되지 않은 파일은 버리고 해당 행은 삭제하지 않음
+                part.abort()
+
+        if vacuum and result.rows_deleted:
+            async with self.engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("VACUUM (ANALYZE) chat_messages"))
+        return result
+
+
+def _group_by_month(rows: Sequence[Any]) -> List[Tuple[str, List[Any]]]:
+    """created_at 순으로 정렬된 행을 연속한 월 단위 묶음으로 나눔"""
+    groups: List[Tuple[str, List[Any]]] = []
+    for row in rows:
+        month = _month_key(row.created_at)
+        if not groups or groups[-1][0] != month:
+            groups.append((month, []))
+        groups[-1][1].append(row)
+    return groups
+
+
+class ChatArchiveReader:
+    """아카이브된 세션 메시지 조회 및 테이블 복원"""
+
+    def __init__(self, archive_dir: Optional[str] = None) -> None:
+        self.archive_dir = Path(archive_dir or settings.CHAT_ARCHIVE_DIR)
+
+    def _files(self, since: Optional[datetime]) -> List[Path]:
+        if not self.archive_dir.exists():
+            return []
+        since_month = _month_key(since) if since else None
+        return sorted(
+            path
+            for month_dir in self.archive_dir.iterdir()
+            if month_dir.is_dir()
+            and (since_month is None or month_dir.name >= since_month)
+            for path in month_dir.glob("chat_messages_*.parquet")
+        )
+
+    def read_session(
+        self, session_uuid: UUID, since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        세션의 아카이브 메시지를 생성 시간순으로 반환.
+        since(보통 세션 생성 시각)를 주면 그 이전 월 디렉터리는 읽지 않음.
+        """
+        _, pq = _require_pyarrow()
+        messages: Dict[int, Dict[str, Any]] = {}
+        for path in self._files(since):
+            table = pq.read_table(
+                str(path), filters=[("session_uuid", "=", str(session_uuid))]
+            )
+            for row in table.to_pylist():
+                row["session_uuid"] = UUID(row["session_uuid"])
+                for name in _JSON_COLUMNS:
+                    if row[name] is not None:
+                        row[name] = json.loads(row[name])
+                # 복원 후 재아카이브된 경우 같은 message_id가 여러 파일에 있을 수 있음
+                messages[row["message_id"]] = row
+        return sorted(
+            messages.values(), key=lambda m: (m["created_at"], m["message_id"])
+        )
+
+    async def rehydrate_session(
+        self, session_uuid: UUID, since: Optional[datetime] = None
+    ) -> int:
+        """세션의 아카이브 메시지를 chat_messages에 되살리고 복원된 행 수를 반환"""
+        from app.db.session import SessionLocal
+
+        rows = await asyncio.to_thread(self.read_session, session_uuid, since)
+        restored = 0
+        batch = settings.CHAT_ARCHIVE_DELETE_BATCH
+        async with SessionLocal() as db:
+            for i in range(0, len(rows), batch):
+                restored += await crud.chat.restore_messages(db, rows[i : i + batch])
+            await db.commit()
+        logger.info(f"세션 {session_uuid} 아카이브 메시지 {restored}건 복원")
+        return restored
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from app.db.session import engine
+
+    try:
+        if args.command == "archive":
+            archiver = ChatArchiver(
+                archive_dir=args.archive_dir, retention_days=args.retention_days
+            )
+            result = await archiver.run(dry_run=args.dry_run, vacuum=args.vacuum)
+            prefix = "[dry-run] " if result.dry_run else ""
+            print(f"{prefix}기준 시각: {result.cutoff.isoformat()}")
+            for month, count in result.months.items():
+                print(f"{prefix}{month}: {count:,}건")
+            print(
+                f"{prefix}아카이브 {result.rows_archived:,}건, "
+                f"삭제 {result.rows_deleted:,}건, 파일 {len(result.files)}개"
+            )
+        elif args.command == "read":
+            reader = ChatArchiveReader(archive_dir=args.archive_dir)
+            for message in reader.read_session(UUID(args.session_uuid)):
+                print(
+                    f"[{message['created_at'].isoformat()}] "
+                    f"{message['message_type']}: {message['content'][:200]}"
+                )
+        elif args.command == "rehydrate":
+            reader = ChatArchiveReader(archive_dir=args.archive_dir)
+            restored = await reader.rehydrate_session(UUID(args.session_uuid))
+            print(f"{restored:,}건 복원")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="채팅 메시지 콜드 스토리지 아카이브")
+    parser.add_argument("--archive-dir", default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive = subparsers.add_parser("archive", help="오래된 메시지 아카이브 후 삭제")
+    archive.add_argument(
+        "--dry-run", action="store_true", help="월별 대상 행 수만 출력"
+    )
+    archive.add_argument("--retention-days", type=int, default=None)
+    archive.add_argument(
+        "--vacuum", action="store_true", help="삭제 후 VACUUM (ANALYZE) 실행"
+    )
+
+    for name, help_text in (
+        ("read", "세션의 아카이브 메시지 출력"),
+        ("rehydrate", "세션의 아카이브 메시지를 테이블에 복원"),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("session_uuid")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
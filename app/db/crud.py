@@ -2,13 +2,23 @@
 데이터베이스 CRUD(Create, Read, Update, Delete) 함수
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session
 from datetime import datetime
-from sqlalchemy import and_
+from sqlalchemy import (
+    and_,
+    delete,
+    event,
+    func,
+    literal_column,
+    null,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from hashlib import sha256
 
 # SQLAlchemy 모델과 Pydantic 스키마를 임포트합니다.
@@ -16,8 +26,12 @@ from hashlib import sha256
 # 여기서는 해당 모델이 존재한다고 가정합니다.
 from ..models import db_models
 from ..models import schemas
+from ..core.config import settings
+from ..utils.ttl_lru_cache import TTLLRUCache
+from .telemetry import instrument_crud
 
 
+@instrument_crud
 class CRUDTradeNews:
     async def get(self, db: AsyncSession, id: int) -> db_models.TradeNews | None:
         result = await db.execute(
@@ -31,6 +45,20 @@ class CRUDTradeNews:
         result = await db.execute(select(db_models.TradeNews).offset(skip).limit(limit))
         return list(result.scalars().all())
 
+    async def get_latest(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 20
+    ) -> list[db_models.TradeNews]:
+        """게시일 최신순 무역 뉴스 목록 (같은 게시일은 id 역순)"""
+        result = await db.execute(
+            select(db_models.TradeNews)
+            .order_by(
+                db_models.TradeNews.published_at.desc(), db_models.TradeNews.id.desc()
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def get_recent_trade_news(
         self, db: AsyncSession, since: datetime
     ) -> list[db_models.TradeNews]:
@@ -100,6 +128,7 @@ class CRUDTradeNews:
 trade_news = CRUDTradeNews()
 
 
+@instrument_crud
 class CRUDUpdateFeed:
     async def get_by_bookmark_and_content(
         self, db: AsyncSession, *, user_id: int, target_value: str, content: str
@@ -177,12 +206,14 @@ async def create_update_feed(
     return db_feed
 
 
+@instrument_crud
 class CRUDChat:
     async def get_session_by_uuid(
         self, db: AsyncSession, user_id: int, session_uuid_str: str
-    ) -> db_models.ChatSession:
+    ) -> schemas.ChatSessionMetadata:
         """
-        주어진 user_id와 session_uuid로 채팅 세션을 조회합니다.
+        주어진 user_id와 session_uuid로 채팅 세션 메타데이터를 조회합니다.
+        세션 존재/소유 확인용이므로 메시지는 로드하지 않습니다 (대화 기록은 윈도우 조회로 별도 조회).
         세션은 Spring Boot에 의해 생성되므로, 항상 존재한다고 가정합니다.
         세션이 존재하지 않으면 오류를 발생시킵니다.
         """
@@ -194,25 +225,27 @@ class CRUDChat:
         except (ValueError, TypeError):
             raise ValueError(f"유효하지 않은 UUID 형식입니다: {session_uuid_str}")
 
-        # 기존 세션이 있는지 확인
-        query = (
-            select(db_models.ChatSession)
-            .where(
-                db_models.ChatSession.session_uuid == session_uuid,
-                db_models.ChatSession.user_id == user_id,
-            )
-            .options(selectinload(db_models.ChatSession.messages))
+        model = db_models.ChatSession
+        query = select(
+            model.session_uuid,
+            model.user_id,
+            model.session_title,
+            model.message_count,
+            model.created_at,
+        ).where(
+            model.session_uuid == session_uuid,
+            model.user_id == user_id,
         )
         result = await db.execute(query)
-        session = result.scalars().first()
+        row = result.first()
 
-        if not session:
+        if not row:
             # Spring Boot에서 세션을 생성하므로, 존재하지 않는 경우는 예외적인 상황
             raise ValueError(
                 f"세션을 찾을 수 없습니다: user_id={user_id}, session_uuid={session_uuid_str}"
             )
 
-        return session
+        return schemas.ChatSessionMetadata.model_validate(dict(row._mapping))
 
     async def get_messages_by_session(
         self, db: AsyncSession, session_uuid: UUID
@@ -226,91 +259,534 @@ class CRUDChat:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    async def get_recent_messages(
+        self, db: AsyncSession, session_uuid: UUID, limit: int
+    ) -> List[db_models.ChatMessage]:
+        """
+        특정 세션의 최근 메시지 limit개를 생성 시간순으로 조회.
+        (session_uuid, created_at DESC) 인덱스를 역순으로 읽으므로 세션 길이와 무관함.
+        """
+        model = db_models.ChatMessage
+        query = (
+            select(model)
+            .where(model.session_uuid == session_uuid)
+            .order_by(model.created_at.desc(), model.message_id.desc())
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return list(reversed(result.scalars().all()))
+
+    async def get_messages_in_range(
+        self,
+        db: AsyncSession,
+        session_uuid: UUID,
+        after: Optional[Tuple[datetime, int]],
+        before: Tuple[datetime, int],
+        limit: int,
+    ) -> List[db_models.ChatMessage]:
+        """
+        (created_at, message_id) keyset 커서 after 초과, before 미만인 메시지를
+        생성 시간순으로 최대 limit개 조회 (요약 대상 구간 조회용).
+        """
+        model = db_models.ChatMessage
+        cursor = tuple_(model.created_at, model.message_id)
+        conditions = [model.session_uuid == session_uuid, cursor < tuple_(*before)]
+        if after is not None:
+            conditions.append(cursor > tuple_(*after))
+        query = (
+            select(model)
+            .where(*conditions)
+            .order_by(model.created_at, model.message_id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_summary(
+        self, db: AsyncSession, session_uuid: UUID
+    ) -> Optional[db_models.ChatSessionSummary]:
+        """세션의 누적 대화 요약 조회"""
+        return await db.get(db_models.ChatSessionSummary, session_uuid)
+
+    async def upsert_summary(
+        self,
+        db: AsyncSession,
+        *,
+        session_uuid: UUID,
+        summary: str,
+        covered_until: Tuple[datetime, int],
+        summarized_messages: int,
+        ai_model: str,
+    ) -> None:
+        """
+        누적 요약 저장. 이미 더 최신 구간까지 요약되어 있으면 덮어쓰지 않음
+        (동시에 실행된 요약 작업 간 역행 방지).
+        """
+        model = db_models.ChatSessionSummary
+        stmt = pg_insert(model).values(
+            session_uuid=session_uuid,
+            summary=summary,
+            covered_until_at=covered_until[0],
+            covered_until_message_id=covered_until[1],
+            summarized_messages=summarized_messages,
+            ai_model=ai_model,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.session_uuid],
+            set_={
+                "summary": stmt.excluded.summary,
+                "covered_until_at": stmt.excluded.covered_until_at,
+                "covered_until_message_id": stmt.excluded.covered_until_message_id,
+                "summarized_messages": stmt.excluded.summarized_messages,
+                "ai_model": stmt.excluded.ai_model,
+                "updated_at": func.now(),
+            },
+            where=(
+                tuple_(model.covered_until_at, model.covered_until_message_id)
+                < tuple_(
+                    stmt.excluded.covered_until_at,
+                    stmt.excluded.covered_until_message_id,
+                )
+            ),
+        )
+        await db.execute(stmt)
+
     async def create_message(
         self, db: AsyncSession, message_in: schemas.ChatMessageCreate
     ) -> db_models.ChatMessage:
         """새로운 채팅 메시지를 생성"""
-        db_message = db_models.ChatMessage(**message_in.model_dump())
+        db_message = db_models.ChatMessage(**message_in.model_dump(exclude_none=True))
         db.add(db_message)
         await db.flush()
         await db.refresh(db_message)
         return db_message
 
+    async def create_messages(
+        self, db: AsyncSession, messages_in: Sequence[schemas.ChatMessageCreate]
+    ) -> List[Tuple[int, UUID, datetime]]:
+        """
+        여러 채팅 메시지를 한 번의 왕복으로 저장.
+
+        다중 행 INSERT ... RETURNING과 chat_sessions.message_count 증가 UPDATE를
+        하나의 데이터 변경 CTE 문으로 실행하고, 저장된 (message_id, session_uuid,
+        created_at)을 입력 순서대로 반환함.
+        turn_id가 있는 메시지는 같은 턴이 이미 저장되어 있으면 건너뛰며,
+        건너뛴 메시지는 반환 목록과 message_count 증가에서 빠짐.
+        """
+        if not messages_in:
+            return []
+        message_model = db_models.ChatMessage
+        session_model = db_models.ChatSession
+        # turn_id가 있으면 이미 저장된 턴은 건너뜀 (지연 저장 재시도 멱등성)
+        with_turn_id = any(message_in.turn_id for message_in in messages_in)
+        exclude = {"created_at"} if with_turn_id else {"created_at", "turn_id"}
+
+        insert_stmt = pg_insert(message_model).values(
+            [
+                {
+                    # JSONB 컬럼의 None은 JSON 'null'이 아닌 SQL NULL로 저장
+                    **{
+                        key: null() if value is None else value
+                        for key, value in message_in.model_dump(exclude=exclude).items()
+                    },
+                    "created_at": message_in.created_at or func.now(),
+                }
+                for message_in in messages_in
+            ]
+        )
+        if with_turn_id:
+            insert_stmt = insert_stmt.on_conflict_do_nothing(
+                index_elements=["turn_id", "message_type", "created_at"]
+            )
+        inserted = insert_stmt.returning(
+            message_model.message_id,
+            message_model.session_uuid,
+            message_model.created_at,
+        ).cte("inserted")
+        counts = (
+            select(inserted.c.session_uuid, func.count().label("added"))
+            .group_by(inserted.c.session_uuid)
+            .subquery("counts")
+        )
+        counted = (
+            update(session_model)
+            .where(session_model.session_uuid == counts.c.session_uuid)
+            .values(
+                message_count=session_model.message_count + counts.c.added,
+                updated_at=func.now(),
+            )
+            .cte("counted")
+        )
+        stmt = (
+            select(
+                inserted.c.message_id,
+                inserted.c.session_uuid,
+                inserted.c.created_at,
+            )
+            .add_cte(counted)
+            .order_by(inserted.c.message_id)
+        )
+        result = await db.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
     async def delete_messages_by_session_uuid(
         self, db: AsyncSession, session_uuid: UUID
     ) -> None:
         """특정 세션의 모든 메시지를 삭제"""
-        from sqlalchemy import delete
-
         stmt = delete(db_models.ChatMessage).where(
             db_models.ChatMessage.session_uuid == session_uuid
         )
         await db.execute(stmt)
 
+    async def delete_messages_by_ids(
+        self, db: AsyncSession, message_ids: Sequence[int]
+    ) -> int:
+        """message_id 목록에 해당하는 메시지를 삭제하고 삭제된 행 수를 반환 (아카이브 후 정리용)"""
+        if not message_ids:
+            return 0
+        stmt = delete(db_models.ChatMessage).where(
+            db_models.ChatMessage.message_id.in_(list(message_ids))
+        )
+        result = await db.execute(stmt)
+        return result.rowcount or 0
+
+    async def restore_messages(
+        self, db: AsyncSession, rows: Sequence[dict]
+    ) -> int:
+        """
+        아카이브된 메시지를 원래 message_id 그대로 다시 삽입 (이미 있는 행은 건너뜀).
+        세션의 message_count는 아카이브 시 줄이지 않았으므로 변경하지 않음.
+        """
+        if not rows:
+            return 0
+        stmt = (
+            pg_insert(db_models.ChatMessage)
+            .values(list(rows))
+            .on_conflict_do_nothing(index_elements=["message_id"])
+        )
+        result = await db.execute(stmt)
+        return result.rowcount or 0
+
 
 chat = CRUDChat()
 
 
+# 커밋 전에 새로 INSERT된 HSCode id (커밋 후 캐시에 반영, 롤백 시 폐기)
+_PENDING_HSCODE_IDS = "pending_hscode_ids"
+
+
+@instrument_crud
 class CRUDHscode:
+    """
+    HSCode 조회/생성. 코드 → id는 프로세스 내 LRU 캐시(HSCODE_ID_CACHE_MAX_ENTRIES)에 보관함.
+    새로 INSERT된 코드는 트랜잭션이 커밋된 뒤에만 캐시에 올려 롤백된 id가 남지 않게 함.
+    커밋/롤백 훅은 INSERT가 일어난 세션에만 한 번 등록함.
+    hscode 행을 직접 삭제했다면 `id_cache.clear()`로 캐시를 비워야 함.
+    """
+
+    def __init__(self) -> None:
+        self.id_cache: TTLLRUCache[str, int] = TTLLRUCache(
+            max_entries=settings.HSCODE_ID_CACHE_MAX_ENTRIES
+        )
+
+    def _publish_pending(self, session: Session) -> None:
+        for code, id in session.info.pop(_PENDING_HSCODE_IDS, {}).items():
+            self.id_cache.set(code, id)
+
+    def _discard_pending(self, session: Session) -> None:
+        session.info.pop(_PENDING_HSCODE_IDS, None)
+
+    def _watch_session(self, session: Session) -> None:
+        """이 세션의 커밋/롤백 시 대기 중인 id를 반영/폐기하도록 훅 등록 (세션당 한 번)"""
+        if not event.contains(session, "after_commit", self._publish_pending):
+            event.listen(session, "after_commit", self._publish_pending)
+            event.listen(session, "after_rollback", self._discard_pending)
+
+    def _remember(self, db: AsyncSession, code: str, id: int, inserted: bool) -> None:
+        if inserted:
+            session = db.sync_session
+            session.info.setdefault(_PENDING_HSCODE_IDS, {})[code] = id
+            self._watch_session(session)
+        else:
+            self.id_cache.set(code, id)
+
+    def _upsert_stmt(self, values: List[dict]):
+        """
+        code 충돌 시 기존 설명을 유지하고(비어 있을 때만 채움) 행을 반환하는 upsert.
+        DO NOTHING은 충돌한 행을 RETURNING하지 않으므로 DO UPDATE를 사용함.
+        """
+        model = db_models.Hscode
+        stmt = pg_insert(model).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=[model.code],
+            set_={
+                "description": func.coalesce(
+                    func.nullif(model.description, ""), stmt.excluded.description
+                )
+            },
+        )
+
     async def get_or_create(
         self, db: AsyncSession, code: str, description: str = ""
     ) -> db_models.Hscode:
         """
         주어진 코드로 Hscode를 찾거나, 없으면 새로 생성.
+        INSERT ... ON CONFLICT ... RETURNING 한 번으로 처리하므로 동시 요청에도 안전함.
         """
-        # 먼저 코드로 Hscode를 찾아봄
-        result = await db.execute(
-            select(db_models.Hscode).filter(db_models.Hscode.code == code)
+        model = db_models.Hscode
+        stmt = self._upsert_stmt([{"code": code, "description": description}]).returning(
+            model, literal_column("xmax = 0").label("inserted")
         )
-        instance = result.scalars().first()
-
-        if instance:
-            return instance
-
-        # 없으면 새로 생성
-        new_instance = db_models.Hscode(code=code, description=description)
-        db.add(new_instance)
-        await db.flush()
-        await db.refresh(new_instance)
-        return new_instance
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        instance, inserted = result.one()
+        self._remember(db, instance.code, instance.id, inserted)
+        return instance
+
+    async def upsert_many(
+        self, db: AsyncSession, codes: Dict[str, str]
+    ) -> Dict[str, int]:
+        """{코드: 설명}을 한 번의 upsert로 처리하고 {코드: id}를 반환"""
+        if not codes:
+            return {}
+        model = db_models.Hscode
+        # 동시 일괄 적재 간 교착을 피하기 위해 항상 같은 순서로 잠금
+        values = [
+            {"code": code, "description": codes[code]} for code in sorted(codes)
+        ]
+        stmt = self._upsert_stmt(values).returning(
+            model.id, model.code, literal_column("xmax = 0").label("inserted")
+        )
+        result = await db.execute(stmt)
+        ids: Dict[str, int] = {}
+        for id, code, inserted in result.all():
+            self._remember(db, code, id, inserted)
+            ids[code] = id
+        return ids
+
+    async def get_or_create_ids(
+        self, db: AsyncSession, codes: Dict[str, str]
+    ) -> Dict[str, int]:
+        """캐시에 없는 코드만 upsert하여 {코드: id}를 반환 (모두 캐시 적중이면 DB 왕복 없음)"""
+        ids: Dict[str, int] = {}
+        missing: Dict[str, str] = {}
+        for code, description in codes.items():
+            cached = self.id_cache.get(code)
+            if cached is None:
+                missing[code] = description
+            else:
+                ids[code] = cached
+        if missing:
+            ids.update(await self.upsert_many(db, missing))
+        return ids
 
 
 hscode = CRUDHscode()
 
 
+@instrument_crud
 class CRUDDocumentV2:
     async def create_v2(
         self, db: AsyncSession, *, hscode_id: int, content: str, metadata: dict
     ) -> db_models.DocumentV2:
         """
-        새로운 DocumentV2 객체를 생성.
+        새로운 DocumentV2 객체를 생성. 같은 내용(content_hash)의 문서가 이미 있으면 기존 객체를 반환.
         """
+        model = db_models.DocumentV2
         # 내용 기반으로 고유 해시 생성
         content_hash = sha256(content.encode("utf-8")).hexdigest()
-
-        # 동일한 해시를 가진 문서가 이미 있는지 확인
-        result = await db.execute(
-            select(db_models.DocumentV2).filter(
-                db_models.DocumentV2.content_hash == content_hash
+        stmt = (
+            pg_insert(model)
+            .values(
+                hscode_id=hscode_id,
+                content=content,
+                metadata_=metadata,
+                content_hash=content_hash,
             )
+            .on_conflict_do_nothing(index_elements=[model.content_hash])
+            .returning(model)
         )
-        existing_doc = result.scalars().first()
-        if existing_doc:
-            # 이미 존재하면 생성하지 않고 기존 객체 반환 또는 예외 처리
-            # 여기서는 로깅 후 기존 객체 반환을 선택
-            # logger.info(f"Document with hash {content_hash} already exists.")
-            return existing_doc
-
-        db_doc = db_models.DocumentV2(
-            hscode_id=hscode_id,
-            content=content,
-            metadata=metadata,
-            content_hash=content_hash,
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        db_doc = result.scalars().first()
+        if db_doc is not None:
+            return db_doc
+
+        # 충돌한 경우에만 기존 문서 조회
+        result = await db.execute(select(model).where(model.content_hash == content_hash))
+        return result.scalars().one()
+
+    async def create_many_v2(
+        self, db: AsyncSession, documents: Sequence[schemas.DocumentV2Create]
+    ) -> List[Tuple[int, str]]:
+        """
+        문서를 한 번의 INSERT ... ON CONFLICT DO NOTHING으로 일괄 저장.
+        HSCode id는 캐시에서 찾고, 캐시에 없는 코드만 한 번의 upsert로 조회함.
+        새로 저장된 문서의 (id, content_hash) 목록을 반환 (이미 있는 문서는 제외).
+        """
+        if not documents:
+            return []
+        codes: Dict[str, str] = {}
+        for doc in documents:
+            if not codes.get(doc.hscode):
+                codes[doc.hscode] = doc.hscode_description
+        hscode_ids = await hscode.get_or_create_ids(db, codes)
+
+        values: Dict[str, dict] = {}
+        for doc in documents:
+            content_hash = sha256(doc.content.encode("utf-8")).hexdigest()
+            values.setdefault(
+                content_hash,
+                {
+                    "hscode_id": hscode_ids[doc.hscode],
+                    "content": doc.content,
+                    "metadata_": doc.metadata,
+                    "content_hash": content_hash,
+                },
+            )
+        model = db_models.DocumentV2
+        stmt = (
+            pg_insert(model)
+            .values(list(values.values()))
+            .on_conflict_do_nothing(index_elements=[model.content_hash])
+            .returning(model.id, model.content_hash)
         )
-        db.add(db_doc)
-        await db.flush()
-        await db.refresh(db_doc)
-        return db_doc
+        result = await db.execute(stmt)
+        return [tuple(row) for row in result.all()]
 
 
 document = CRUDDocumentV2()
+
+
+@instrument_crud
+class CRUDHscodeVector:
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        entries: Sequence[schemas.HscodeVectorCreate],
+        embeddings: Sequence[Sequence[float]],
+    ) -> int:
+        """
+        HSCode 벡터를 한 번의 INSERT ... ON CONFLICT (hscode) DO UPDATE로 일괄 저장.
+        같은 코드가 여러 번 있으면 마지막 항목을 사용하며, 검증 여부/신뢰도는 기존 값을 유지함.
+        저장(신규 + 갱신)된 행 수를 반환.
+        """
+        values: Dict[str, dict] = {}
+        for entry, embedding in zip(entries, embeddings):
+            values[entry.hscode] = {
+                "hscode": entry.hscode,
+                "product_name": entry.product_name,
+                "description": entry.description,
+                "embedding": list(embedding),
+                "keywords": entry.keywords,
+                "classification_basis": entry.classification_basis,
+                "metadata_": entry.metadata,
+            }
+        if not values:
+            return 0
+        model = db_models.HscodeVector
+        # 동시 일괄 적재 간 교착을 피하기 위해 항상 같은 순서로 잠금
+        stmt = pg_insert(model).values([values[code] for code in sorted(values)])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.hscode],
+            set_={
+                "product_name": stmt.excluded.product_name,
+                "description": stmt.excluded.description,
+                "embedding": stmt.excluded.embedding,
+                "keywords": stmt.excluded.keywords,
+                "classification_basis": func.coalesce(
+                    stmt.excluded.classification_basis, model.classification_basis
+                ),
+                "metadata": stmt.excluded.metadata,
+                "updated_at": func.now(),
+            },
+        )
+        result = await db.execute(stmt)
+        return result.rowcount or 0
+
+
+hscode_vector = CRUDHscodeVector()
+
+
+@instrument_crud
+class CRUDSemanticAnswerCache:
+    async def find_nearest(
+        self, db: AsyncSession, *, route: str, embedding: Sequence[float]
+    ) -> Optional[Tuple[db_models.SemanticAnswerCache, float]]:
+        """
+        만료되지 않은 캐시 항목 중 코사인 거리가 가장 가까운 항목과 그 거리를 조회.
+        """
+        model = db_models.SemanticAnswerCache
+        distance = model.embedding.cosine_distance(embedding).label("distance")
+        result = await db.execute(
+            select(model, distance)
+            .where(model.route == route, model.expires_at > func.now())
+            .order_by(distance)
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return row[0], float(row[1])
+
+    async def record_hit(self, db: AsyncSession, id: int) -> None:
+        """캐시 적중 횟수와 마지막 적중 시각 갱신"""
+        model = db_models.SemanticAnswerCache
+        await db.execute(
+            update(model)
+            .where(model.id == id)
+            .values(hit_count=model.hit_count + 1, last_hit_at=func.now())
+        )
+
+    async def upsert(
+        self,
+        db: AsyncSession,
+        *,
+        route: str,
+        question: str,
+        question_hash: str,
+        answer: str,
+        embedding: Sequence[float],
+        model_name: str,
+        expires_at: datetime,
+    ) -> None:
+        """같은 (route, question_hash) 항목이 있으면 답변과 만료 시각을 갱신"""
+        values = {
+            "route": route,
+            "question": question,
+            "question_hash": question_hash,
+            "answer": answer,
+            "embedding": list(embedding),
+            "model": model_name,
+            "expires_at": expires_at,
+        }
+        stmt = pg_insert(db_models.SemanticAnswerCache).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_semantic_answer_cache_route_hash",
+            set_={
+                "answer": stmt.excluded.answer,
+                "embedding": stmt.excluded.embedding,
+                "model": stmt.excluded.model,
+                "expires_at": stmt.excluded.expires_at,
+                "created_at": func.now(),
+                "hit_count": 0,
+            },
+        )
+        await db.execute(stmt)
+
+    async def expire_similar(
+        self, db: AsyncSession, *, embedding: Sequence[float], max_distance: float
+    ) -> int:
+        """주어진 임베딩과 코사인 거리가 max_distance 이하인 유효 항목을 즉시 만료시킴"""
+        model = db_models.SemanticAnswerCache
+        result = await db.execute(
+            update(model)
+            .where(
+                model.expires_at > func.now(),
+                model.embedding.cosine_distance(embedding) <= max_distance,
+            )
+            .values(expires_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+
+semantic_answer_cache = CRUDSemanticAnswerCache()
@@ -0,0 +1,420 @@
+"""
+채팅 테이블 월 단위 파티션 관리
+
+`app/models/db_models_for_partitioning.py`의 RANGE (created_at) 파티션 테이블
+(`chat_sessions`, `chat_messages`)을 대상으로 함.
+
+- 현재 월부터 CHAT_PARTITION_MONTHS_AHEAD 개월 뒤까지 월 파티션을 미리 생성
+- CHAT_PARTITION_RETENTION_MONTHS 보다 오래된 파티션을 분리(detach)한 뒤
+  모드에 따라 그대로 두거나(detach), 보관 스키마로 옮기거나(archive), 삭제(drop)
+- 기존 파티션은 이름이 아니라 파티션 경계(pg_get_expr)로 판별하므로
+  연 단위 등 다른 규칙으로 만든 파티션과 겹치는 범위는 건너뜀
+- 대상 테이블이 파티션 테이블이 아니면 아무 작업도 하지 않음
+
+사용법:
+    python -m app.db.partition_manager --dry-run
+    python -m app.db.partition_manager --mode drop --retention-months 24
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 세션 테이블을 먼저 생성하고, 분리는 메시지 테이블부터 수행
+CHAT_PARTITIONED_TABLES: Tuple[str, ...] = ("chat_sessions", "chat_messages")
+
+RETIRE_MODES: Tuple[str, ...] = ("detach", "archive", "drop")
+
+_RANGE_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(value: datetime) -> datetime:
+    """해당 시각이 속한 월의 시작 시각 (UTC)"""
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """월 시작 시각에 개월 수를 더함"""
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _parse_bound(raw: str) -> datetime:
+    # '2024-01-01 00:00:00+00' 형식 (세션 TimeZone을 UTC로 고정해서 조회)
+    if re.search(r"[+-]\d{2}$", raw):
+        raw += ":00"
+    return datetime.fromisoformat(raw).astimezone(timezone.utc)
+
+
+@dataclass
+class PartitionInfo:
+    """기존 파티션 하나. DEFAULT 파티션 또는 MINVALUE/MAXVALUE 경계이면 start/end가 None"""
+
+    table: str
+    name: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+    is_default: bool = False
+
+
+@dataclass
+class PartitionAction:
+    """실행할(또는 dry-run으로 출력할) 파티션 작업 하나"""
+
+    kind: str  # create | detach | archive | drop | skip
+    table: str
+    partition: str
+    statements: List[str] = field(default_factory=list)
+    reason: Optional[str] = None
+    executed: bool = False
+    error: Optional[str] = None
+
+
+class PartitionManager:
+    """월 단위 RANGE 파티션 생성/분리/보관 관리자"""
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        schema: str = "public",
+        tables: Sequence[str] = CHAT_PARTITIONED_TABLES,
+        months_ahead: Optional[int] = None,
+        retention_months: Optional[int] = None,
+        mode: Optional[str] = None,
+        archive_schema: Optional[str] = None,
+        detach_concurrently: Optional[bool] = None,
+    ) -> None:
+        if engine is None:
+            from app.db.session import engine as default_engine
+
+            engine = default_engine
+        self.engine = engine
+        self.schema = schema
+        self.tables = tuple(tables)
+        self.months_ahead = (
+            settings.CHAT_PARTITION_MONTHS_AHEAD
+            if months_ahead is None
+            else months_ahead
+        )
+        self.retention_months = (
+            settings.CHAT_PARTITION_RETENTION_MONTHS
+            if retention_months is None
+            else retention_months
+        )
+        self.mode = mode or settings.CHAT_PARTITION_RETIRE_MODE
+        if self.mode not in RETIRE_MODES:
+            raise ValueError(f"지원하지 않는 파티션 분리 모드: {self.mode}")
+        self.archive_schema = archive_schema or settings.CHAT_PARTITION_ARCHIVE_SCHEMA
+        self.detach_concurrently = (
+            settings.CHAT_PARTITION_DETACH_CONCURRENTLY
+            if detach_concurrently is None
+            else detach_concurrently
+        )
+
+    def _qualified(self, table: str, schema: Optional[str] = None) -> str:
+        return f"{_quote(schema or self.schema)}.{_quote(table)}"
+
+    async def is_partitioned(self, conn: AsyncConnection, table: str) -> bool:
+        result = await conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :schema AND c.relname = :table"
+            ),
+            {"schema": self.schema, "table": table},
+        )
+        return result.first() is not None
+
+    async def list_partitions(
+        self, conn: AsyncConnection, table: str
+    ) -> List[PartitionInfo]:
+        """부모 테이블에 붙어 있는 파티션과 경계 조회"""
+        await conn.execute(text("SET TIME ZONE 'UTC'"))
+        result = await conn.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "JOIN pg_namespace n ON n.oid = p.relnamespace "
+                "WHERE n.nspname = :schema AND p.relname = :table "
+                "ORDER BY c.relname"
+            ),
+            {"schema": self.schema, "table": table},
+        )
+        partitions: List[PartitionInfo] = []
+        for name, bound in result.all():
+            if bound == "DEFAULT":
+                partitions.append(
+                    PartitionInfo(table, name, None, None, is_default=True)
+                )
+                continue
+            match = _RANGE_BOUND_RE.search(bound or "")
+            start = end = None
+            if match:
+                start_raw, end_raw = match.groups()
+                start = _parse_bound(start_raw)
+                end = _parse_bound(end_raw)
+            partitions.append(PartitionInfo(table, name, start, end))
+        return partitions
+
+    def plan_creates(
+        self, table: str, existing: List[PartitionInfo], now: datetime
+    ) -> List[PartitionAction]:
+        """현재 월부터 months_ahead 개월 뒤까지 없는 월 파티션 생성 계획"""
+        actions: List[PartitionAction] = []
+        current = month_start(now)
+        for offset in range(self.months_ahead + 1):
+            start = add_months(current, offset)
+            end = add_months(start, 1)
+            name = f"{table}_p{start:%Y%m}"
+            overlapping = [
+                p
+                for p in existing
+                if not p.is_default
+                and (p.start is None or p.start < end)
+                and (p.end is None or p.end > start)
+            ]
+            if any(p.start == start and p.end == end for p in overlapping):
+                continue
+            if overlapping:
+                actions.append(
+                    PartitionAction(
+                        kind="skip",
+                        table=table,
+                        partition=name,
+                        reason=f"기존 파티션과 범위가 겹침: "
+                        f"{', '.join(p.name for p in overlapping)}",
+                    )
+                )
+                continue
+            actions.append(
+                PartitionAction(
+                    kind="create",
+                    table=table,
+                    partition=name,
+                    statements=[
+                        f"CREATE TABLE IF NOT EXISTS {self._qualified(name)} "
+                        f"PARTITION OF {self._qualified(table)} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') "
+                        f"TO ('{end.isoformat()}')"
+                    ],
+                )
+            )
+        return actions
+
+    def plan_retires(
+        self, table: str, existing: List[PartitionInfo], now: datetime
+    ) -> List[PartitionAction]:
+        """보관 기간이 지난 파티션(상한이 cutoff 이하) 분리 계획"""
+        cutoff = add_months(month_start(now), -self.retention_months)
+        actions: List[PartitionAction] = []
+        has_default = any(p.is_default for p in existing)
+        concurrently = self.detach_concurrently and not has_default
+        for partition in existing:
+            if partition.is_default or partition.end is None:
+                continue
+            if partition.end > cutoff:
+                continue
+            detach = (
+                f"ALTER TABLE {self._qualified(table)} DETACH PARTITION "
+                f"{self._qualified(partition.name)}"
+                + (" CONCURRENTLY" if concurrently else "")
+            )
+            statements = [detach]
+            if self.mode == "archive":
+                statements += [
+                    f"CREATE SCHEMA IF NOT EXISTS {_quote(self.archive_schema)}",
+                    f"ALTER TABLE {self._qualified(partition.name)} "
+                    f"SET SCHEMA {_quote(self.archive_schema)}",
+                ]
+            elif self.mode == "drop":
+                statements.append(f"DROP TABLE {self._qualified(partition.name)}")
+            actions.append(
+                PartitionAction(
+                    kind=self.mode,
+                    table=table,
+                    partition=partition.name,
+                    statements=statements,
+                    reason=f"상한 {partition.end:%Y-%m-%d} <= 보관 기준 {cutoff:%Y-%m-%d}",
+                )
+            )
+        return actions
+
+    async def _sessions_still_referenced(
+        self, conn: AsyncConnection, partition: PartitionInfo, cutoff: datetime
+    ) -> bool:
+        """
+        세션 파티션을 분리하기 전에, 그 세션들에 보관 기간 내 메시지가 남아 있는지 확인.
+        오래 이어지는 세션의 최신 메시지가 고아가 되지 않도록 함.
+        """
+        if "chat_messages" not in self.tables:
+            return False
+        lower = "session_created_at >= :start AND " if partition.start else ""
+        result = await conn.execute(
+            text(
+                f"SELECT 1 FROM {self._qualified('chat_messages')} "
+                f"WHERE {lower}session_created_at < :end "
+                "AND created_at >= :cutoff LIMIT 1"
+            ),
+            {"start": partition.start, "end": partition.end, "cutoff": cutoff},
+        )
+        return result.first() is not None
+
+    async def plan(self, now: Optional[datetime] = None) -> List[PartitionAction]:
+        """생성 후 분리 순서로 전체 작업 계획 수립 (DB 변경 없음)"""
+        now = now or datetime.now(timezone.utc)
+        cutoff = add_months(month_start(now), -self.retention_months)
+        creates: List[PartitionAction] = []
+        retires: List[PartitionAction] = []
+        async with self.engine.connect() as conn:
+            for table in self.tables:
+                if not await self.is_partitioned(conn, table):
+                    creates.append(
+                        PartitionAction(
+                            kind="skip",
+                            table=table,
+                            partition="-",
+                            reason="파티션 테이블이 아님",
+                        )
+                    )
+                    continue
+                existing = await self.list_partitions(conn, table)
+                creates += self.plan_creates(table, existing, now)
+                table_retires = self.plan_retires(table, existing, now)
+                if table == "chat_sessions":
+                    by_name = {p.name: p for p in existing}
+                    for action in table_retires:
+                        if await self._sessions_still_referenced(
+                            conn, by_name[action.partition], cutoff
+                        ):
+                            action.kind = "skip"
+                            action.statements = []
+                            action.reason = "보관 기간 내 메시지가 남아 있는 세션 포함"
+                retires = table_retires + retires
+        return creates + retires
+
+    async def _execute(self, action: PartitionAction) -> None:
+        statements = list(action.statements)
+        if statements and statements[0].endswith("CONCURRENTLY"):
+            # DETACH ... CONCURRENTLY는 트랜잭션 블록 밖에서만 실행 가능
+            async with self.engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text(statements.pop(0)))
+        if not statements:
+            return
+        async with self.engine.begin() as conn:
+            # 부모 테이블 잠금 대기로 채팅 트래픽이 막히지 않도록 제한
+            await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            for statement in statements:
+                await conn.execute(text(statement))
+
+    async def run(
+        self, now: Optional[datetime] = None, dry_run: bool = False
+    ) -> List[PartitionAction]:
+        """계획을 세우고 dry_run이 아니면 작업별로 실행. 실패한 작업은 기록 후 계속 진행"""
+        actions = await self.plan(now)
+        for action in actions:
+            if action.kind == "skip" or not action.statements:
+                continue
+            if dry_run:
+                logger.info(f"[dry-run] {action.kind} {action.partition}")
+                continue
+            try:
+                await self._execute(action)
+                action.executed = True
+                logger.info(f"파티션 작업 완료: {action.kind} {action.partition}")
+            except Exception as e:
+                action.error = str(e)
+                logger.error(f"파티션 작업 실패: {action.kind} {action.partition}: {e}")
+        return actions
+
+
+def _print_actions(actions: List[PartitionAction], dry_run: bool) -> None:
+    if not actions:
+        print("수행할 파티션 작업이 없습니다.")
+        return
+    for action in actions:
+        status = (
+            "SKIP"
+            if action.kind == "skip"
+            else "DRY-RUN"
+            if dry_run
+            else "FAILED"
+            if action.error
+            else "OK"
+        )
+        print(f"[{status}] {action.kind:<8} {action.table}.{action.partition}")
+        if action.reason:
+            print(f"    사유: {action.reason}")
+        for statement in action.statements:
+            print(f"    {statement};")
+        if action.error:
+            print(f"    오류: {action.error}")
+
+
+async def _main(args: argparse.Namespace) -> int:
+    now = (
+        datetime.strptime(args.now, "%Y-%m").replace(tzinfo=timezone.utc)
+        if args.now
+        else None
+    )
+    manager = PartitionManager(
+        schema=args.schema,
+        months_ahead=args.months_ahead,
+        retention_months=args.retention_months,
+        mode=args.mode,
+        archive_schema=args.archive_schema,
+        detach_concurrently=args.concurrently or None,
+    )
+    try:
+        actions = await manager.run(now=now, dry_run=args.dry_run)
+    finally:
+        await manager.engine.dispose()
+    _print_actions(actions, args.dry_run)
+    return 1 if any(action.error for action in actions) else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="채팅 테이블 월 단위 파티션 관리")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="실행하지 않고 SQL만 출력"
+    )
+    parser.add_argument("--schema", default="public")
+    parser.add_argument("--months-ahead", type=int, default=None)
+    parser.add_argument("--retention-months", type=int, default=None)
+    parser.add_argument("--mode", choices=RETIRE_MODES, default=None)
+    parser.add_argument("--archive-schema", default=None)
+    parser.add_argument(
+        "--concurrently",
+        action="store_true",
+        help="DETACH PARTITION ... CONCURRENTLY 사용 (PostgreSQL 14+)",
+    )
+    parser.add_argument(
+        "--now", default=None, help="기준 월 (YYYY-MM, 기본값: 현재 월)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from typing import AsyncGenerator
 from app.core.config import settings
+from app.db.telemetry import TimedAsyncAdaptedQueuePool, db_telemetry
 
 # DATABASE_URL을 비동기 드라이버로 변환
 async_database_url = str(settings.DATABASE_URL).replace(
@@ -8,8 +9,49 @@ async_database_url = str(settings.DATABASE_URL).replace(
 )
 
 # 비동기 엔진 생성
-# echo=True는 개발 시 SQL 쿼리를 로깅하기 위함이며, 프로덕션에서는 False로 설정하는 것이 좋음
-engine = create_async_engine(async_database_url, echo=True)
+# 풀 크기/재활용/pre-ping/prepared statement 캐시는 Settings(DB_*)로 조정
+# SQL 로깅(DB_ECHO)은 개발 시에만 켜는 것이 좋음
+engine = create_async_engine(
+    async_database_url,
+    echo=settings.DB_ECHO,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={
+        # SQLAlchemy 어댑터와 asyncpg 양쪽의 prepared statement 캐시
+        # (PgBouncer transaction 모드에서는 0으로 설정)
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
+)
+# 연결 풀 체크아웃/대기 시간 계측 (/monitoring/stats)
+db_telemetry.instrument(engine)
+
+# 읽기 전용 엔진
+# DATABASE_REPLICA_URL이 있으면 복제본 전용 풀을 만들고, 없으면 primary 풀을 공유함.
+# 어느 쪽이든 postgresql_readonly 옵션으로 트랜잭션을 READ ONLY로 시작함
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(
+        settings.DATABASE_REPLICA_URL.replace("postgresql://", "postgresql+asyncpg://"),
+        echo=settings.DB_ECHO,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    db_telemetry.instrument(replica_engine, name="replica")
+    read_engine = replica_engine.execution_options(postgresql_readonly=True)
+else:
+    read_engine = engine.execution_options(postgresql_readonly=True)
 
 # 비동기 세션 팩토리 생성
 # expire_on_commit=False는 세션이 커밋된 후에도 ORM 객체에 접근할 수 있도록 함
@@ -21,6 +63,15 @@ SessionLocal = async_sessionmaker(
     class_=AsyncSession,
 )
 
+# 읽기 전용 세션 팩토리 (커밋하지 않는 조회 경로용)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -39,3 +90,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         raise
     finally:
         await async_session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    조회 전용 엔드포인트를 위한 읽기 전용 데이터베이스 세션 제너레이터.
+
+    READ ONLY 트랜잭션으로 실행되며 커밋하지 않음. 세션을 닫을 때 롤백되므로
+    쓰기를 시도하면 DB 오류가 발생함. DATABASE_REPLICA_URL이 설정되어 있으면
+    복제본으로 라우팅되므로 복제 지연만큼 최신 쓰기가 보이지 않을 수 있음.
+
+    현재 사용처: GET /news 목록, /monitoring/run-monitoring의 활성 북마크 스캔.
+    채팅 세션 검증과 대화 기록 조회는 직전 요청에서 쓴 세션/메시지를 바로 읽어야
+    하므로(read-after-write) primary 세션(SessionLocal)을 사용함.
+    """
+    async with ReadSessionLocal() as async_session:
+        yield async_session
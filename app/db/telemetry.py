@@ -0,0 +1,220 @@
+"""
+DB 연결 풀 및 쿼리 지연 시간 계측
+
+- 연결 풀(primary, replica 엔진별): 체크아웃/체크인/신규 연결/무효화 횟수, 현재 점유 연결 수,
+  연결 획득 대기 시간 히스토그램과 획득 타임아웃 횟수
+- CRUD: `instrument_crud` 클래스 데코레이터로 CRUD 메서드별 지연 시간 히스토그램
+
+실제 동시성에 맞게 DB_POOL_SIZE/DB_MAX_OVERFLOW와 Postgres max_connections를
+조정하는 근거로 사용함.
+"""
+
+import functools
+import inspect
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (ms). 마지막 버킷은 그 이상 전부
+_LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+)
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램 (누적이 아닌 버킷별 개수)"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = _LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self.counts: List[int] = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, upper in enumerate(self.buckets_ms):
+            if ms <= upper:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """버킷 상한 기준 근사 백분위수 (ms)"""
+        if not self.count:
+            return None
+        target = self.count * p
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return (
+                    self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+                )
+        return self.max_ms
+
+    def stats(self) -> Dict[str, Any]:
+        labels = [f"le_{int(upper)}" for upper in self.buckets_ms] + ["inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {
+                label: n for label, n in zip(labels, self.counts) if n
+            },
+        }
+
+
+class PoolTelemetry:
+    """연결 풀 하나의 이벤트 카운터와 연결 획득 대기 시간"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.wait = LatencyHistogram()
+        self.timeouts = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.engine.sync_engine.pool
+        state: Dict[str, Any] = {}
+        for key in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, key, None)
+            if callable(method):
+                state[key] = method()
+        return {
+            **state,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "acquire_timeouts": self.timeouts,
+            "acquire_wait": self.wait.stats(),
+        }
+
+
+class DBTelemetry:
+    """엔진별 연결 풀 이벤트와 CRUD 지연 시간 수집기"""
+
+    def __init__(self) -> None:
+        self.pools: Dict[str, PoolTelemetry] = {}
+        self.crud: Dict[str, LatencyHistogram] = {}
+        self.crud_errors: Dict[str, int] = {}
+
+    def instrument(self, engine: AsyncEngine, name: str = "primary") -> None:
+        """엔진의 연결 풀 이벤트 리스너 등록"""
+        pool = engine.sync_engine.pool
+        telemetry = self.pools[name] = PoolTelemetry(engine)
+        # TimedAsyncAdaptedQueuePool이 대기 시간을 기록할 대상
+        pool._telemetry = telemetry  # type: ignore[attr-defined]
+
+        @event.listens_for(pool, "connect")
+        def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            telemetry.connects += 1
+
+        @event.listens_for(pool, "checkout")
+        def _on_checkout(
+            dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+        ) -> None:
+            telemetry.checkouts += 1
+
+        @event.listens_for(pool, "checkin")
+        def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+            telemetry.checkins += 1
+
+        @event.listens_for(pool, "invalidate")
+        def _on_invalidate(
+            dbapi_connection: Any, connection_record: Any, exception: Any
+        ) -> None:
+            telemetry.invalidations += 1
+
+    def observe_crud(self, name: str, ms: float, failed: bool = False) -> None:
+        histogram = self.crud.get(name)
+        if histogram is None:
+            histogram = self.crud[name] = LatencyHistogram()
+        histogram.observe(ms)
+        if failed:
+            self.crud_errors[name] = self.crud_errors.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pools": {name: pool.stats() for name, pool in self.pools.items()},
+            "crud": {
+                name: {
+                    **histogram.stats(),
+                    "errors": self.crud_errors.get(name, 0),
+                }
+                for name, histogram in sorted(self.crud.items())
+            },
+        }
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """연결 획득 대기 시간을 기록하는 비동기 큐 풀"""
+
+    _telemetry: Optional[PoolTelemetry] = None
+
+    def recreate(self) -> "TimedAsyncAdaptedQueuePool":
+        # dispose()/무효화 시 새로 만들어지는 풀에도 같은 수집기를 연결
+        # (이벤트 리스너는 SQLAlchemy가 dispatch를 복사하므로 그대로 유지됨)
+        pool = super().recreate()
+        pool._telemetry = self._telemetry
+        return pool
+
+    def _do_get(self) -> Any:
+        telemetry = self._telemetry
+        if telemetry is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            telemetry.timeouts += 1
+            raise
+        finally:
+            telemetry.wait.observe((time.perf_counter() - started) * 1000)
+
+
+def instrument_crud(cls: type) -> type:
+    """CRUD 클래스의 비동기 공개 메서드마다 지연 시간을 기록하도록 감싸는 클래스 데코레이터"""
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(member):
+            continue
+        setattr(cls, name, _timed(f"{cls.__name__}.{name}", member))
+    return cls
+
+
+def _timed(label: str, func: Any) -> Any:
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            db_telemetry.observe_crud(
+                label, (time.perf_counter() - started) * 1000, failed
+            )
+
+    return wrapper
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+db_telemetry = DBTelemetry()
@@ -2,6 +2,13 @@
 FastAPI 메인 애플리케이션
 """
 
+import time
+
+# 앱 모듈 import 시간 측정 시작 (/monitoring/stats의 resources.import_ms)
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -13,12 +20,41 @@ import logging
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.logging_config import configure_logging
+from app.core.resources import resources
 from app.core.middleware.logging_middleware import LoggingMiddleware
+from app.services.chat_persistence_queue import chat_persistence_queue
+from app.services.llm_registry import llm_registry
+from app.services.stream_registry import stream_registry
 
 set_debug(True)
 
 logger = logging.getLogger(__name__)
 
+resources.record_import(_import_started)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    애플리케이션 시작/종료 시 공유 자원을 관리.
+
+    - 시작 시 채팅 지연 저장 writer 시작
+    - 시작 시 임베딩 클라이언트/벡터 검색 엔진·스토어 워밍업 (실패해도 첫 사용 시 재시도)
+    - 종료 시 진행 중인 SSE 스트림 producer 취소
+    - 종료 시 대기 중인 채팅 턴 저장 (남으면 Redis로 넘김)
+    - 종료 시 LLM 공유 HTTP 연결 풀 정리
+    - 종료 시 벡터 검색 전용 연결 풀 정리
+    """
+    if settings.CHAT_PERSIST_WRITE_BEHIND_ENABLED:
+        chat_persistence_queue.start()
+    if settings.RESOURCE_WARMUP_ENABLED:
+        await resources.warm_up()
+    yield
+    await stream_registry.aclose()
+    await chat_persistence_queue.aclose()
+    await llm_registry.aclose()
+    await resources.aclose()
+
 
 def create_app() -> FastAPI:
     """
@@ -35,6 +71,7 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
     )
 
     # 전역 RequestValidationError 핸들러 추가
@@ -26,7 +26,7 @@ from sqlalchemy import (
     desc,
     CheckConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB, BIGINT, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, JSONB, BIGINT, ARRAY, TSVECTOR
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import relationship, declarative_base, Mapped, mapped_column
 from sqlalchemy import func
@@ -180,6 +180,7 @@ class ChatMessage(Base):
     thinking_process = Column(Text)
     hscode_analysis = Column(JSONB)
     sse_bookmark_data = Column(JSONB)
+    turn_id = Column(String(32), comment="지연 저장 턴 멱등 키 (중복 저장 방지)")
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -195,6 +196,21 @@ class ChatMessage(Base):
             "message_type IN ('USER', 'AI')", name="chat_messages_message_type_check"
         ),
         Index("idx_chat_messages_session_uuid", "session_uuid"),
+        # 최근 N개 메시지 keyset 조회용 (session_uuid, created_at DESC, message_id DESC)
+        Index(
+            "idx_chat_messages_session_created",
+            "session_uuid",
+            desc("created_at"),
+            desc("message_id"),
+        ),
+        # 지연 저장 재시도 시 같은 턴 중복 저장 방지 (turn_id가 NULL인 행은 제약 없음)
+        Index(
+            "uq_chat_messages_turn",
+            "turn_id",
+            "message_type",
+            "created_at",
+            unique=True,
+        ),
         Index("idx_chat_messages_created_at", desc("created_at")),
         Index("idx_chat_messages_message_type", "message_type"),
         Index(
@@ -212,6 +228,27 @@ class ChatMessage(Base):
     )
 
 
+class ChatSessionSummary(Base):
+    """채팅 세션의 이전 대화 누적 요약 테이블 모델"""
+
+    __tablename__ = "chat_session_summaries"
+
+    session_uuid = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chat_sessions.session_uuid", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    summary = Column(Text, nullable=False)
+    # 요약에 포함된 마지막 메시지의 keyset 커서 (created_at, message_id)
+    covered_until_at = Column(DateTime(timezone=True), nullable=False)
+    covered_until_message_id = Column(BIGINT, nullable=False)
+    summarized_messages = Column(Integer, nullable=False, default=0)
+    ai_model = Column(String(100))
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 class Bookmark(Base):
     """북마크 테이블 모델 - 구현계획.md v6.3 기준"""
 
@@ -319,6 +356,15 @@ class HscodeVector(Base):
     hscode_differences = Column(Text)
     confidence_score = Column(Float, default=0.0)
     verified = Column(Boolean, default=False)
+    # 하이브리드 검색의 어휘 검색용 (형태소 분석 없이 공백/구두점 단위로 토큰화)
+    search_tsv = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(product_name, '') || ' ' || "
+            "coalesce(description, ''))",
+            persisted=True,
+        ),
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -333,6 +379,50 @@ class HscodeVector(Base):
         ),
         Index("idx_hscode_vectors_metadata", "metadata", postgresql_using="gin"),
         Index("idx_hscode_vectors_keywords", "keywords", postgresql_using="gin"),
+        Index("idx_hscode_vectors_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index(
+            "idx_hscode_vectors_product_name_trgm",
+            "product_name",
+            postgresql_using="gin",
+            postgresql_ops={"product_name": "gin_trgm_ops"},
+        ),
+        # 구분자(., -)를 제거한 코드 앞자리 LIKE 검색용
+        Index(
+            "idx_hscode_vectors_hscode_digits",
+            text("regexp_replace(hscode, '[^0-9]', '', 'g') text_pattern_ops"),
+        ),
+    )
+
+
+class SemanticAnswerCache(Base):
+    """일반 무역 질문 답변 시맨틱 캐시 테이블 모델"""
+
+    __tablename__ = "semantic_answer_cache"
+
+    id = Column(BIGINT, primary_key=True, autoincrement=True)
+    route = Column(String(50), nullable=False)
+    question = Column(Text, nullable=False)
+    question_hash = Column(String(64), nullable=False)
+    answer = Column(Text, nullable=False)
+    embedding = Column(Vector(1024), nullable=False)
+    model = Column(String(100), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    last_hit_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint(
+            "route", "question_hash", name="uq_semantic_answer_cache_route_hash"
+        ),
+        Index(
+            "idx_semantic_answer_cache_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        Index("idx_semantic_answer_cache_route_expires", "route", "expires_at"),
     )
 
 
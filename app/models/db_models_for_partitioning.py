@@ -95,6 +95,7 @@ class ChatMessage(Base):
     thinking_process = Column(Text)
     hscode_analysis = Column(JSONB)
     sse_bookmark_data = Column(JSONB)
+    turn_id = Column(String(32), comment="지연 저장 턴 멱등 키 (중복 저장 방지)")
 
     session = relationship("ChatSession", back_populates="messages")
 
@@ -103,6 +104,14 @@ class ChatMessage(Base):
             "message_type IN ('USER', 'AI')", name="chat_messages_message_type_check"
         ),
         Index("idx_chat_messages_session_uuid", "session_uuid"),
+        # 파티션 키(created_at)를 포함해야 파티션 테이블에 고유 인덱스를 만들 수 있음
+        Index(
+            "uq_chat_messages_turn",
+            "turn_id",
+            "message_type",
+            "created_at",
+            unique=True,
+        ),
         {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
@@ -330,6 +330,29 @@ class UpdateFeed(UpdateFeedBase):
         from_attributes = True
 
 
+# --- Document(RAG 문서) 스키마 ---
+
+
+class DocumentV2Create(BaseModel):
+    """RAG 문서 일괄 적재용 스키마 (HSCode는 코드로 지정)"""
+
+    hscode: str = Field(..., max_length=20)
+    hscode_description: str = Field(default="", max_length=500)
+    content: str
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class HscodeVectorCreate(BaseModel):
+    """hscode_vectors 일괄 적재용 스키마 (임베딩은 적재 시 생성)"""
+
+    hscode: str = Field(..., min_length=1, max_length=20)
+    product_name: str = Field(..., max_length=500)
+    description: str = Field(..., min_length=1)
+    keywords: List[str] = Field(default_factory=list)
+    classification_basis: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
 # ==================================
 # 북마크 모니터링 스키마
 # ==================================
@@ -361,6 +384,10 @@ class ChatMessageCreate(ChatMessageBase):
     """채팅 메시지 생성용 스키마"""
 
     session_uuid: UUID
+    # 지정하지 않으면 DB 저장 시각 사용 (지연 저장 시 실제 대화 시각을 보존하기 위함)
+    created_at: Optional[datetime] = None
+    # 지연 저장 턴 멱등 키. 지정하면 같은 턴이 이미 저장된 경우 건너뜀
+    turn_id: Optional[str] = None
 
 
 class ChatMessage(ChatMessageBase):
@@ -400,6 +427,19 @@ class ChatSession(ChatSessionBase):
         from_attributes = True
 
 
+class ChatSessionMetadata(BaseModel):
+    """메시지를 포함하지 않는 채팅 세션 메타데이터 (세션 검증용)"""
+
+    session_uuid: UUID
+    user_id: int
+    session_title: Optional[str] = None
+    message_count: int = 0
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # ==================================
 # 뉴스 기사 스키마
 # ==================================
@@ -1,13 +1,30 @@
-from typing import List
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+from uuid import UUID
 
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    message_to_dict,
+    messages_from_dict,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+from app.core.config import settings
 from app.db.crud import chat as crud_chat
+from app.db.session import SessionLocal
 from app.models import schemas
 from app.models.db_models import ChatMessage
+from app.services.llm_registry import HAIKU_SUMMARY_SPEC, llm_registry
+from app.utils.disconnect_watcher import estimate_tokens
+from app.utils.llm_response_parser import extract_text_from_anthropic_response
+
+logger = logging.getLogger(__name__)
 
 
 def _langchain_type_to_db_type(langchain_type: str) -> str:
@@ -48,13 +65,235 @@ async def _db_messages_to_langchain_messages(
     return messages_from_dict(dict_messages)
 
 
+@dataclass
+class HistoryWindow:
+    """모델에 전달할 이전 대화 윈도우"""
+
+    # 토큰 예산 내의 최근 메시지 (생성 시간순, 사람 메시지로 시작)
+    messages: List[BaseMessage] = field(default_factory=list)
+    # 윈도우 이전 대화의 누적 요약
+    summary: Optional[str] = None
+    # 세션에 저장된 이전 대화가 있는지 여부 (윈도우가 비어도 요약이 있으면 True)
+    has_history: bool = False
+    estimated_tokens: int = 0
+    # 요약 경계 이전에 아직 요약되지 않은 메시지가 있는지 여부
+    needs_summary: bool = False
+    # 요약 경계 keyset 커서 (최근 N개 메시지의 시작). 요약은 이 커서 이전 구간만 대상으로 하며,
+    # 이전 구간 중 요약되지 않은 메시지는 요약될 때까지 messages에 함께 포함됨
+    window_start: Optional[Tuple[datetime, int]] = None
+
+
+def _fit_to_token_budget(
+    db_messages: List[ChatMessage], budget: int
+) -> List[ChatMessage]:
+    """
+    최신 메시지부터 토큰 예산이 허용하는 만큼만 남김.
+
+    마지막 대화 한 턴(사람 메시지 포함)은 예산을 넘더라도 유지하며,
+    Anthropic 메시지는 사람 메시지로 시작해야 하므로 앞쪽의 AI 메시지는 제거함.
+    """
+    kept: List[ChatMessage] = []
+    used = 0
+    has_user = False
+    for msg in reversed(db_messages):
+        tokens = estimate_tokens(str(msg.content))
+        if has_user and used + tokens > budget:
+            break
+        kept.append(msg)
+        used += tokens
+        has_user = has_user or str(msg.message_type).upper() == "USER"
+    kept.reverse()
+    while kept and str(kept[0].message_type).upper() != "USER":
+        kept.pop(0)
+    return kept
+
+
+def _cursor(msg: ChatMessage) -> Tuple[datetime, int]:
+    return (msg.created_at, msg.message_id)
+
+
+async def aload_history_window(session_uuid_str: str) -> HistoryWindow:
+    """
+    세션의 이전 대화를 최근 N개 메시지 + 누적 요약으로 조회.
+
+    요청 DB 세션과 독립적인 별도 DB 세션을 사용하므로 세션 검증 쿼리와 동시에
+    실행할 수 있음 (AsyncSession 하나로는 동시 쿼리를 실행할 수 없음).
+    세션 길이와 무관하게 조회량과 프롬프트 크기가
+    CHAT_HISTORY_WINDOW_MESSAGES + CHAT_HISTORY_SUMMARY_BATCH_MESSAGES,
+    CHAT_HISTORY_TOKEN_BUDGET으로 제한됨.
+
+    최근 N개보다 오래된 메시지라도 아직 요약에 포함되지 않았으면 (요약 대상이
+    CHAT_HISTORY_SUMMARY_MIN_MESSAGES개 미만이거나 요약이 진행 중인 경우)
+    요약이 따라잡을 때까지 윈도우에 남겨 둠.
+    직전 턴의 쓰기 지연(write-behind) 저장 직후에도 최신 메시지를 읽을 수 있도록
+    복제본이 아닌 기본 DB에서 조회함.
+    """
+    session_uuid = UUID(session_uuid_str)
+    limit = settings.CHAT_HISTORY_WINDOW_MESSAGES
+    fetch_limit = limit + settings.CHAT_HISTORY_SUMMARY_BATCH_MESSAGES
+    async with SessionLocal() as db:
+        summary_row = await crud_chat.get_summary(db=db, session_uuid=session_uuid)
+        # 조회 범위 밖 메시지 존재 여부를 알기 위해 하나 더 조회
+        recent = await crud_chat.get_recent_messages(
+            db=db, session_uuid=session_uuid, limit=fetch_limit + 1
+        )
+
+    summary = str(summary_row.summary) if summary_row else None
+    summary_tokens = estimate_tokens(summary) if summary else 0
+    covered = (
+        (summary_row.covered_until_at, summary_row.covered_until_message_id)
+        if summary_row
+        else None
+    )
+    has_older = len(recent) > fetch_limit
+    recent = recent[-fetch_limit:] if has_older else recent
+    # 최근 limit개 + 그 이전이지만 아직 요약되지 않은 메시지
+    overflow = len(recent) - limit
+    candidates = [
+        msg
+        for index, msg in enumerate(recent)
+        if index >= overflow or covered is None or _cursor(msg) > covered
+    ]
+    kept = _fit_to_token_budget(
+        candidates, max(0, settings.CHAT_HISTORY_TOKEN_BUDGET - summary_tokens)
+    )
+
+    # 요약 경계: 최근 limit개의 시작 (토큰 예산으로 잘렸으면 실제 윈도우 시작)
+    window_start: Optional[Tuple[datetime, int]] = None
+    if kept:
+        window_start = _cursor(kept[0])
+        if overflow > 0:
+            window_start = max(window_start, _cursor(recent[overflow]))
+    needs_summary = window_start is not None and (
+        any(
+            _cursor(msg) < window_start and (covered is None or _cursor(msg) > covered)
+            for msg in recent
+        )
+        or (has_older and (covered is None or covered < _cursor(recent[0])))
+    )
+
+    return HistoryWindow(
+        messages=await _db_messages_to_langchain_messages(kept),
+        summary=summary,
+        has_history=bool(recent) or summary is not None,
+        estimated_tokens=summary_tokens
+        + sum(estimate_tokens(str(msg.content)) for msg in kept),
+        needs_summary=needs_summary,
+        window_start=window_start,
+    )
+
+
+# 같은 세션에 대한 요약 작업 중복 실행 방지
+_summarizing_sessions: Set[UUID] = set()
+_summary_tasks: Set[asyncio.Task] = set()
+
+
+async def summarize_session_history(
+    session_uuid_str: str, window_start: Tuple[datetime, int]
+) -> None:
+    """
+    윈도우 밖으로 밀려난 메시지를 기존 요약에 합쳐 누적 요약을 갱신.
+
+    기존 요약 커서 이후 ~ window_start 이전 구간에서 최대
+    CHAT_HISTORY_SUMMARY_BATCH_MESSAGES개를 요약하며, 대상이
+    CHAT_HISTORY_SUMMARY_MIN_MESSAGES개 미만이면 LLM을 호출하지 않음.
+    """
+    session_uuid = UUID(session_uuid_str)
+    if session_uuid in _summarizing_sessions:
+        return
+    _summarizing_sessions.add(session_uuid)
+    try:
+        async with SessionLocal() as db:
+            summary_row = await crud_chat.get_summary(db=db, session_uuid=session_uuid)
+            covered = (
+                (summary_row.covered_until_at, summary_row.covered_until_message_id)
+                if summary_row
+                else None
+            )
+            pending = await crud_chat.get_messages_in_range(
+                db=db,
+                session_uuid=session_uuid,
+                after=covered,
+                before=window_start,
+                limit=settings.CHAT_HISTORY_SUMMARY_BATCH_MESSAGES,
+            )
+            if len(pending) < settings.CHAT_HISTORY_SUMMARY_MIN_MESSAGES:
+                return
+
+            transcript = "\n".join(
+                f"{'사용자' if str(msg.message_type).upper() == 'USER' else 'AI'}: "
+                f"{msg.content}"
+                for msg in pending
+            )
+            previous_summary = str(summary_row.summary) if summary_row else "(없음)"
+            prompt = f"""다음은 무역 상담 대화의 기존 요약과 그 이후 이어진 대화입니다.
+두 내용을 합쳐 이후 상담에 필요한 맥락만 남긴 하나의 요약으로 다시 작성해주세요.
+
+[기존 요약]
+{previous_summary}
+
+[이어진 대화]
+{transcript}
+
+요구사항:
+1. 한국어로 작성
+2. 품목, HSCode, 국가, 관세율, 규제 등 구체적인 사실과 사용자의 상황을 우선 보존
+3. 인사말 등 맥락에 불필요한 내용은 제외
+4. 800자 이내
+
+요약만 응답하세요:"""
+            summary_llm = llm_registry.get_chat_model(HAIKU_SUMMARY_SPEC)
+            response = await summary_llm.ainvoke([HumanMessage(content=prompt)])
+            new_summary = extract_text_from_anthropic_response(response).strip()
+            if not new_summary:
+                return
+
+            last = pending[-1]
+            await crud_chat.upsert_summary(
+                db=db,
+                session_uuid=session_uuid,
+                summary=new_summary,
+                covered_until=(last.created_at, last.message_id),
+                summarized_messages=(
+                    (summary_row.summarized_messages if summary_row else 0)
+                    + len(pending)
+                ),
+                ai_model=HAIKU_SUMMARY_SPEC.model,
+            )
+            await db.commit()
+            logger.info(
+                f"세션(UUID: {session_uuid_str}) 이전 대화 {len(pending)}개 요약 갱신"
+            )
+    except Exception as e:
+        logger.warning(f"세션(UUID: {session_uuid_str}) 대화 요약 실패: {e}")
+    finally:
+        _summarizing_sessions.discard(session_uuid)
+
+
+def schedule_history_summary(window: HistoryWindow, session_uuid_str: str) -> None:
+    """요약이 필요한 경우 응답 스트림과 별개로 요약 작업 실행"""
+    if (
+        not settings.CHAT_HISTORY_SUMMARY_ENABLED
+        or not window.needs_summary
+        or window.window_start is None
+    ):
+        return
+    task = asyncio.create_task(
+        summarize_session_history(session_uuid_str, window.window_start)
+    )
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+
+
 class PostgresChatMessageHistory(BaseChatMessageHistory):
     """
     PostgreSQL 데이터베이스를 백엔드로 사용하는 LangChain의 채팅 기록 클래스.
     SQLAlchemy 비동기 세션을 사용하여 DB와 상호작용하도록 수정됨.
     """
 
-    def __init__(self, db: AsyncSession, user_id: int, session: schemas.ChatSession):
+    def __init__(
+        self, db: AsyncSession, user_id: int, session: schemas.ChatSessionMetadata
+    ):
         """
         초기화 시 DB 세션, 사용자 ID, 그리고 이미 생성/조회된 ChatSession 객체를 받음.
         """
@@ -80,26 +319,33 @@ class PostgresChatMessageHistory(BaseChatMessageHistory):
         )
 
     async def aget_messages(self) -> List[BaseMessage]:
-        """DB에서 비동기적으로 메시지를 조회."""
-        db_messages = await crud_chat.get_messages_by_session(
-            db=self.db, session_uuid=self.session_uuid
+        """DB에서 비동기적으로 최근 메시지를 토큰 예산 내로 조회."""
+        db_messages = await crud_chat.get_recent_messages(
+            db=self.db,
+            session_uuid=self.session_uuid,
+            limit=settings.CHAT_HISTORY_WINDOW_MESSAGES,
+        )
+        return await _db_messages_to_langchain_messages(
+            _fit_to_token_budget(db_messages, settings.CHAT_HISTORY_TOKEN_BUDGET)
         )
-        return await _db_messages_to_langchain_messages(db_messages)
 
     async def aadd_message(self, message: BaseMessage) -> None:
         """메시지 하나를 DB에 비동기적으로 추가"""
-        message_data = message_to_dict(message)
-        message_create = schemas.ChatMessageCreate(
-            session_uuid=self.session_uuid,
-            message_type=_langchain_type_to_db_type(message_data["type"]),
-            content=message_data["data"]["content"],
-        )
-        await crud_chat.create_message(db=self.db, message_in=message_create)
+        await self.aadd_messages([message])
 
     async def aadd_messages(self, messages: List[BaseMessage]) -> None:
-        """여러 메시지를 DB에 비동기적으로 추가"""
+        """여러 메시지를 한 번의 왕복으로 DB에 추가 (세션 message_count도 함께 갱신)"""
+        messages_in = []
         for message in messages:
-            await self.aadd_message(message)
+            message_data = message_to_dict(message)
+            messages_in.append(
+                schemas.ChatMessageCreate(
+                    session_uuid=self.session_uuid,
+                    message_type=_langchain_type_to_db_type(message_data["type"]),
+                    content=message_data["data"]["content"],
+                )
+            )
+        await crud_chat.create_messages(db=self.db, messages_in=messages_in)
 
     async def aclear(self) -> None:
         """DB에서 해당 세션의 메시지를 비동기적으로 삭제."""
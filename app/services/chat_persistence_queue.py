@@ -0,0 +1,443 @@
+"""
+채팅 대화 지연 저장(write-behind) 큐
+
+응답 스트림이 끝나면 사용자/AI 메시지 한 턴을 프로세스 내부 bounded 큐에 넣고 즉시
+반환하며, 별도 writer 작업이 큐의 턴들을 모아 한 번의 다중 행 INSERT로 PostgreSQL에 저장함.
+SSE 요청이 저장을 기다리거나 저장 동안 풀 연결을 점유하지 않음.
+
+- 큐가 가득 차면 Redis 리스트로 넘기고(spill), writer가 매 배치마다 남는 자리만큼
+  (최대 CHAT_PERSIST_BATCH_SIZE개씩) 다시 가져와 함께 저장
+- Redis도 사용할 수 없으면 호출한 쪽에서 직접 저장 (조용히 버리지 않음)
+- 일괄 저장 실패 시 지수 백오프로 재시도하고, 그래도 실패하면 턴 단위로 나누어
+  문제 턴만 격리함 (격리된 턴은 Redis dead-letter 리스트에 보관하며
+  `python -m app.services.chat_persistence_queue requeue`로 다시 저장 대기열에 넣을 수 있음)
+- 턴마다 turn_id를 부여하고 (turn_id, message_type, created_at) 고유 인덱스에
+  ON CONFLICT DO NOTHING으로 저장하므로, 커밋 후 응답 유실로 재시도하거나
+  dead-letter를 재처리해도 같은 턴이 중복 저장되지 않음
+- 메시지 created_at은 실제 대화 시각으로 저장되므로 저장 지연과 무관하게 순서가 유지됨
+- 종료 시 남은 턴을 제한 시간 안에 저장하고, 남으면 Redis로 넘김
+
+저장은 최대 CHAT_PERSIST_FLUSH_INTERVAL_MS 정도 지연되므로, 그 사이 같은 세션의
+다음 요청은 직전 턴을 대화 기록에서 보지 못할 수 있음.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_shared_redis
+from app.db import crud
+from app.db.session import SessionLocal
+from app.models import schemas
+
+logger = logging.getLogger(__name__)
+
+# Redis 장애 시 재시도까지 대기하는 시간 (초)
+_REDIS_RETRY_AFTER_SECONDS = 30.0
+# 첫 재시도 대기 시간 (초), 시도마다 두 배
+_RETRY_BASE_DELAY_SECONDS = 0.5
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class ChatTurn:
+    """저장 대기 중인 사용자/AI 메시지 한 턴 (AI 응답이 없으면 사용자 메시지만 저장)"""
+
+    session_uuid: str
+    user_message: str
+    ai_message: Optional[str]
+    ai_model: Optional[str] = None
+    # 실제 대화 시각 (ISO 8601, UTC)
+    user_at: str = field(default_factory=_utcnow_iso)
+    ai_at: str = field(default_factory=_utcnow_iso)
+    # 재시도/재처리 시 중복 저장 방지용 멱등 키
+    turn_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def to_messages(self) -> List[schemas.ChatMessageCreate]:
+        session_uuid = UUID(self.session_uuid)
+        messages = [
+            schemas.ChatMessageCreate(
+                session_uuid=session_uuid,
+                message_type="USER",
+                content=self.user_message,
+                created_at=datetime.fromisoformat(self.user_at),
+                turn_id=self.turn_id,
+            )
+        ]
+        if self.ai_message:
+            messages.append(
+                schemas.ChatMessageCreate(
+                    session_uuid=session_uuid,
+                    message_type="AI",
+                    content=self.ai_message,
+                    ai_model=self.ai_model,
+                    created_at=datetime.fromisoformat(self.ai_at),
+                    turn_id=self.turn_id,
+                )
+            )
+        return messages
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ChatTurn":
+        return cls(**json.loads(raw))
+
+
+class ChatPersistenceQueue:
+    """채팅 턴 write-behind 큐와 일괄 저장 writer"""
+
+    def __init__(self) -> None:
+        self._queue: "asyncio.Queue[ChatTurn]" = asyncio.Queue(
+            maxsize=settings.CHAT_PERSIST_QUEUE_MAX
+        )
+        self._writer: Optional[asyncio.Task] = None
+        # writer가 모으는 중인 배치와 저장 중인 작업 (종료 시 유실 방지용)
+        self._collecting: List[ChatTurn] = []
+        self._inflight: Optional[asyncio.Task] = None
+        self._closing = False
+        self._redis_disabled_until = 0.0
+        # Redis spill에 남은 턴이 있을 수 있는지 여부와 다음 확인 시각
+        self._spill_pending = False
+        self._next_spill_check = 0.0
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed = 0
+        self.spilled = 0
+        self.unspilled = 0
+        self.requeued = 0
+        self.direct_writes = 0
+        self.redis_errors = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    # --- Redis spill ---
+
+    def _redis_available(self) -> bool:
+        return (
+            settings.CHAT_PERSIST_REDIS_SPILL_ENABLED
+            and time.monotonic() >= self._redis_disabled_until
+        )
+
+    def _mark_redis_failure(self, error: Exception) -> None:
+        self.redis_errors += 1
+        self._redis_disabled_until = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+        logger.warning(
+            f"채팅 저장 Redis spill 사용 불가, {_REDIS_RETRY_AFTER_SECONDS:.0f}초 동안 건너뜀: {error}"
+        )
+
+    async def _spill(self, turns: List[ChatTurn], key: Optional[str] = None) -> bool:
+        """턴들을 Redis 리스트에 보관. 실패하면 False"""
+        if not turns or not self._redis_available():
+            return False
+        try:
+            await get_shared_redis().rpush(
+                key or settings.CHAT_PERSIST_SPILL_KEY,
+                *[turn.to_json() for turn in turns],
+            )
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+            return False
+        if key is None:
+            self.spilled += len(turns)
+            self._spill_pending = True
+        return True
+
+    async def _unspill(self, count: int) -> List[ChatTurn]:
+        """
+        Redis에 보관된 턴을 최대 count개 가져옴.
+        이 프로세스가 넘긴 턴이 남아 있을 수 있거나 확인 주기가 지났을 때만 조회함
+        (다른 워커가 넘긴 턴도 주기적으로 가져옴)
+        """
+        now = time.monotonic()
+        if (
+            count <= 0
+            or not self._redis_available()
+            or (not self._spill_pending and now < self._next_spill_check)
+        ):
+            return []
+        self._next_spill_check = now + settings.CHAT_PERSIST_SPILL_POLL_SECONDS
+        try:
+            raws = await get_shared_redis().lpop(settings.CHAT_PERSIST_SPILL_KEY, count)
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+            return []
+        # 요청한 만큼 가져왔으면 더 남아 있을 수 있으므로 다음 배치에서 계속 가져옴
+        self._spill_pending = len(raws or []) >= count
+        turns: List[ChatTurn] = []
+        for raw in raws or []:
+            try:
+                turns.append(ChatTurn.from_json(raw))
+            except (ValueError, TypeError) as e:
+                logger.error(f"보관된 채팅 턴 역직렬화 실패, 건너뜀: {e}")
+        self.unspilled += len(turns)
+        return turns
+
+    # --- 저장 ---
+
+    async def _write(self, turns: List[ChatTurn]) -> None:
+        """턴들을 한 번의 다중 행 INSERT로 저장"""
+        messages_in = [message for turn in turns for message in turn.to_messages()]
+        async with SessionLocal() as db:
+            await crud.chat.create_messages(db=db, messages_in=messages_in)
+            await db.commit()
+
+    async def _write_with_retry(self, turns: List[ChatTurn]) -> bool:
+        for attempt in range(settings.CHAT_PERSIST_MAX_RETRIES + 1):
+            try:
+                await self._write(turns)
+                return True
+            except Exception as e:
+                if attempt == settings.CHAT_PERSIST_MAX_RETRIES:
+                    logger.error(f"채팅 턴 {len(turns)}개 저장 실패: {e}")
+                    return False
+                self.retries += 1
+                delay = _RETRY_BASE_DELAY_SECONDS * (2**attempt)
+                logger.warning(
+                    f"채팅 턴 저장 실패, {delay:.1f}초 후 재시도 "
+                    f"({attempt + 1}/{settings.CHAT_PERSIST_MAX_RETRIES}): {e}"
+                )
+                await asyncio.sleep(delay)
+        return False
+
+    async def _flush(self, turns: List[ChatTurn]) -> None:
+        """일괄 저장하고, 실패 시 턴 단위로 나누어 문제 턴만 격리"""
+        started = time.perf_counter()
+        if not await self._write_with_retry(turns):
+            if len(turns) == 1:
+                await self._dead_letter(turns)
+            else:
+                for turn in turns:
+                    try:
+                        await self._write([turn])
+                    except Exception as e:
+                        logger.error(
+                            f"채팅 턴 저장 실패 (session={turn.session_uuid}): {e}"
+                        )
+                        await self._dead_letter([turn])
+                        continue
+                    self.written += 1
+        else:
+            self.written += len(turns)
+        self.batches += 1
+        self.last_batch_size = len(turns)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    async def _dead_letter(self, turns: List[ChatTurn]) -> None:
+        self.failed += len(turns)
+        if not await self._spill(turns, key=settings.CHAT_PERSIST_DEAD_LETTER_KEY):
+            logger.error(f"저장하지 못한 채팅 턴 {len(turns)}개를 보관할 수 없어 폐기함")
+
+    async def _next_batch(self) -> List[ChatTurn]:
+        """
+        첫 턴을 기다린 뒤 flush 간격 동안 배치 크기만큼 모으고,
+        남는 자리는 Redis에 넘겼던 턴으로 채움 (큐가 계속 차 있어도 spill이 줄어듦)
+        """
+        batch_size = settings.CHAT_PERSIST_BATCH_SIZE
+        timeout = (
+            0.0
+            if self._spill_pending and self._redis_available()
+            else settings.CHAT_PERSIST_SPILL_POLL_SECONDS
+        )
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return await self._unspill(batch_size)
+        batch = self._collecting = [first]
+        deadline = time.monotonic() + settings.CHAT_PERSIST_FLUSH_INTERVAL_MS / 1000
+        while len(batch) < batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        batch.extend(await self._unspill(batch_size - len(batch)))
+        self._collecting = []
+        return batch
+
+    async def _run(self) -> None:
+        while not self._closing:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            # 종료 시 writer가 취소되어도 진행 중인 저장은 끝까지 수행
+            self._inflight = asyncio.create_task(self._flush(batch))
+            try:
+                await asyncio.shield(self._inflight)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"채팅 지연 저장 writer 오류: {e}", exc_info=True)
+
+    # --- 공개 API ---
+
+    def start(self) -> None:
+        """writer 작업 시작 (애플리케이션 시작 시 호출)"""
+        if not self.running:
+            self._closing = False
+            self._writer = asyncio.create_task(self._run())
+            logger.info("채팅 지연 저장 writer 시작")
+
+    async def enqueue(self, turn: ChatTurn) -> None:
+        """
+        턴을 저장 대기열에 추가.
+
+        writer가 없거나 종료 중이면 직접 저장하고, 큐가 가득 차면 Redis로 넘기며,
+        그것도 불가능하면 직접 저장함 (배압).
+        """
+        self.enqueued += 1
+        if self.running and not self._closing:
+            try:
+                self._queue.put_nowait(turn)
+                return
+            except asyncio.QueueFull:
+                if await self._spill([turn]):
+                    return
+                logger.warning("채팅 저장 큐가 가득 차 직접 저장함")
+        self.direct_writes += 1
+        await self._flush([turn])
+
+    async def dead_letter_depth(self) -> Optional[int]:
+        """Redis dead-letter 리스트에 보관된 턴 수 (조회할 수 없으면 None)"""
+        if not self._redis_available():
+            return None
+        try:
+            return await get_shared_redis().llen(settings.CHAT_PERSIST_DEAD_LETTER_KEY)
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+            return None
+
+    async def requeue_dead_letters(self, limit: int) -> int:
+        """
+        dead-letter 리스트의 턴을 최대 limit개 spill 리스트로 옮겨 writer가 다시 저장하게 함.
+        turn_id로 중복 저장이 방지되므로 이미 저장된 턴이 섞여 있어도 안전함.
+        """
+        if limit <= 0 or not self._redis_available():
+            return 0
+        try:
+            # 항목별 LMOVE로 옮기므로 중간에 실패해도 턴이 유실되지 않음
+            async with get_shared_redis().pipeline(transaction=False) as pipe:
+                for _ in range(limit):
+                    pipe.lmove(
+                        settings.CHAT_PERSIST_DEAD_LETTER_KEY,
+                        settings.CHAT_PERSIST_SPILL_KEY,
+                        "LEFT",
+                        "RIGHT",
+                    )
+                moved = await pipe.execute()
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+            return 0
+        requeued = sum(1 for raw in moved if raw is not None)
+        if requeued:
+            self.requeued += requeued
+            self._spill_pending = True
+            logger.info(f"dead-letter 채팅 턴 {requeued}개를 저장 대기열로 재투입")
+        return requeued
+
+    async def aclose(self) -> None:
+        """종료 시 남은 턴을 제한 시간 안에 저장하고, 남은 턴은 Redis로 넘김"""
+        self._closing = True
+        if self._writer is not None:
+            # wait_for가 취소와 동시에 완료된 get()의 취소를 삼킬 수 있으므로 종료될 때까지 반복
+            while not self._writer.done():
+                self._writer.cancel()
+                await asyncio.wait({self._writer}, timeout=0.1)
+            self._writer = None
+
+        pending: List[ChatTurn] = self._collecting
+        self._collecting = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+
+        async def drain() -> None:
+            if self._inflight is not None:
+                await asyncio.gather(self._inflight, return_exceptions=True)
+            while pending:
+                batch = pending[: settings.CHAT_PERSIST_BATCH_SIZE]
+                await self._flush(batch)
+                del pending[: len(batch)]
+
+        try:
+            await asyncio.wait_for(
+                drain(), timeout=settings.CHAT_PERSIST_DRAIN_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            if not await self._spill(pending):
+                logger.error(f"종료 시 저장하지 못한 채팅 턴 {len(pending)}개 폐기")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.CHAT_PERSIST_WRITE_BEHIND_ENABLED,
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": settings.CHAT_PERSIST_QUEUE_MAX,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "avg_batch_size": (
+                round(self.written / self.batches, 2) if self.batches else 0.0
+            ),
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+            "retries": self.retries,
+            "failed": self.failed,
+            "spilled": self.spilled,
+            "unspilled": self.unspilled,
+            "requeued": self.requeued,
+            "direct_writes": self.direct_writes,
+            "redis_errors": self.redis_errors,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+chat_persistence_queue = ChatPersistenceQueue()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.command == "requeue":
+        # 실행 중인 서버의 writer가 spill 리스트를 주기적으로 확인하여 저장함
+        requeued = await chat_persistence_queue.requeue_dead_letters(args.limit)
+        print(f"{requeued:,}건 재투입")
+    depth = await chat_persistence_queue.dead_letter_depth()
+    print(f"dead-letter 잔여: {'확인 불가' if depth is None else f'{depth:,}건'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="채팅 지연 저장 dead-letter 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("depth", help="dead-letter 리스트에 남은 턴 수 출력")
+    requeue = subparsers.add_parser(
+        "requeue", help="dead-letter 턴을 저장 대기열(Redis spill)로 재투입"
+    )
+    requeue.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,16 +10,16 @@ from typing import (
     List,
     Union,
     Optional,
+    Set,
     Tuple,
 )
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from langchain_core.output_parsers import StrOutputParser
-from fastapi import BackgroundTasks, Request
+from fastapi import BackgroundTasks
 from fastapi.responses import JSONResponse
 from langchain_core.documents import Document
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import (
     HumanMessage,
     AIMessage,
@@ -29,8 +29,6 @@ from langchain_core.messages import (
 )
 from langchain_core.runnables import Runnable
 
-from pydantic import SecretStr
-
 # anthropic 에러 처리를 위한 import 추가
 import anthropic
 import httpx
@@ -42,35 +40,63 @@ from app.models.chat_models import (
     CargoTrackingResponse,
     CargoTrackingError,
 )
-from app.services.chat_history_service import PostgresChatMessageHistory
+from app.services.chat_history_service import (
+    HistoryWindow,
+    PostgresChatMessageHistory,
+    aload_history_window,
+    schedule_history_summary,
+)
 from app.services.langchain_service import LLMService
 from app.services.cargo_tracking_service import CargoTrackingService
 from app.services.hscode_classification_service import HSCodeClassificationService
 from app.services.intent_classification_service import (
+    IntentClassificationResult,
     IntentClassificationService,
     IntentType,
 )
 from app.services.enhanced_detail_generator import EnhancedDetailGenerator
 from app.core.config import settings
 from app.services.parallel_task_manager import ParallelTaskManager
+from app.services.llm_registry import (
+    llm_registry,
+    HAIKU_EXTRACTOR_SPEC,
+    HAIKU_TITLE_SPEC,
+    HSCODE_WEB_SEARCH_TOOL,
+    NEWS_WEB_SEARCH_TOOL,
+    SONNET_HSCODE_SPEC,
+    SONNET_THINKING_SPEC,
+)
 from app.services.sse_event_generator import SSEEventGenerator
+from app.utils.disconnect_watcher import (
+    CancellationScope,
+    cancellation_savings,
+    estimate_tokens,
+)
+from app.utils.speculative_stage import SpeculativeStage
+from app.services.session_metadata_cache import session_metadata_cache
+from app.services.chat_persistence_queue import ChatTurn, chat_persistence_queue
+from app.models.schemas import ChatSessionMetadata
+from app.services.semantic_answer_cache import (
+    CACHEABLE_INTENTS,
+    AnswerCacheLookup,
+    semantic_answer_cache,
+)
 from app.models import db_models
+from app.vector_stores.hscode_retriever import get_hscode_retriever
 from langchain_core.messages import AIMessageChunk
 
 logger = logging.getLogger(__name__)
 
+# 웹 검색 도구 사용을 나타내는 응답 콘텐츠 블록 타입
+_WEB_SEARCH_BLOCK_TYPES = ("server_tool_use", "web_search_tool_result")
+
+# 실행 중인 세션 제목 생성 작업 (GC로 사라지지 않도록 참조 유지)
+_title_tasks: Set[asyncio.Task] = set()
+
 
 async def generate_session_title(user_message: str, ai_response: str) -> str:
     try:
-        title_llm = ChatAnthropic(
-            model_name="claude-3-5-haiku-20241022",
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=0.3,
-            max_tokens_to_sample=100,
-            timeout=120.0,  # 더 긴 timeout 설정
-            streaming=True,
-            stop=None,
-        )
+        title_llm = llm_registry.get_chat_model(HAIKU_TITLE_SPEC)
         prompt = f"""다음 대화를 기반으로 짧고 명확한 세션 제목을 생성해주세요.
 
 사용자 질문: {user_message}
@@ -124,6 +150,7 @@ async def update_session_title(
             if session:
                 setattr(session, "session_title", title)
                 await db.commit()
+                session_metadata_cache.invalidate(session.user_id, session_uuid_str)
                 logger.info(
                     f"세션(UUID: {session_uuid_str}) 제목 업데이트 완료: '{title}'"
                 )
@@ -134,6 +161,23 @@ async def update_session_title(
             await db.rollback()
 
 
+def schedule_session_title_update(
+    session_uuid_str: str,
+    user_message: str,
+    ai_response: str,
+) -> None:
+    """
+    세션 제목 생성을 별도 작업으로 실행.
+    응답 생성(producer)은 HTTP 응답보다 오래 실행될 수 있어 BackgroundTasks에 추가하면
+    응답 후 실행 시점이 이미 지나 실행되지 않으므로 직접 작업을 만듦.
+    """
+    task = asyncio.create_task(
+        update_session_title(session_uuid_str, user_message, ai_response)
+    )
+    _title_tasks.add(task)
+    task.add_done_callback(_title_tasks.discard)
+
+
 async def _extract_hscode_from_message(
     message: str,
 ) -> tuple[Optional[str], Optional[str]]:
@@ -142,14 +186,7 @@ async def _extract_hscode_from_message(
     메인 LLM 호출 전에 실행하여 HSCode를 확정함.
     """
     try:
-        extractor_llm = ChatAnthropic(
-            model_name="claude-3-5-haiku-20241022",
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=0.0,
-            max_tokens_to_sample=200,
-            timeout=120.0,  # 더 긴 timeout 설정
-            stop=None,
-        )
+        extractor_llm = llm_registry.get_chat_model(HAIKU_EXTRACTOR_SPEC)
         prompt = f"""사용자의 다음 메시지에서 HSCode와 가장 핵심적인 품목명을 추출해주세요.
 - HSCode는 숫자와 점(.)으로 구성됩니다 (예: 8471.30.0000).
 - 품목명은 제품을 가장 잘 나타내는 간단한 명사입니다.
@@ -181,6 +218,18 @@ async def _extract_hscode_from_message(
         return None, None
 
 
+async def _retrieve_hscode_candidates(message: str) -> List[Document]:
+    """
+    HSCode 검색(하이브리드 또는 벡터)으로 전문가 프롬프트에 넣을 참고 후보 조회.
+    검색은 비동기 전용 retriever로 수행하며, 실패하면 후보 없이 진행함.
+    """
+    try:
+        return await get_hscode_retriever().ainvoke(message)
+    except Exception as e:
+        logger.warning(f"HSCode 후보 검색 실패, 검색 결과 없이 진행: {e}")
+        return []
+
+
 class ChatService:
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
@@ -202,14 +251,54 @@ class ChatService:
                     if isinstance(item, dict):
                         self._convert_datetime_to_string(item)
 
-    async def check_unified_intent(
+    def start_preprocessing(
+        self, chat_request: ChatRequest, db: AsyncSession
+    ) -> SpeculativeStage:
+        """
+        경로 확정 전 전처리 작업을 동시에 시작.
+
+        의도 분류와 함께 HSCode 추출(투기적), 세션 검증, 대화 기록 조회를 시작하고
+        반환된 단계를 stream_chat_response에 넘기면 경로에 필요 없는 작업은 취소됨.
+        """
+        stage = SpeculativeStage()
+        stage.start("intent", self.classify_request_intent(chat_request))
+        if settings.CHAT_SPECULATIVE_HSCODE_EXTRACTION:
+            stage.start(
+                "hscode_extraction", _extract_hscode_from_message(chat_request.message)
+            )
+        if chat_request.user_id:
+            stage.start(
+                "session_validation",
+                session_metadata_cache.get(
+                    db=db,
+                    user_id=chat_request.user_id,
+                    session_uuid_str=chat_request.session_uuid,
+                ),
+            )
+            stage.start("history", aload_history_window(chat_request.session_uuid))
+        return stage
+
+    async def classify_request_intent(
         self, chat_request: ChatRequest
+    ) -> IntentClassificationResult:
+        """
+        요청 단위 의도 분류.
+        요청당 한 번만 호출하고, 결과를 check_unified_intent와
+        stream_chat_response에 그대로 전달하여 분류 LLM 호출을 1회로 제한함.
+        """
+        return await self.intent_classification_service.classify_intent(
+            chat_request.message
+        )
+
+    async def check_unified_intent(
+        self,
+        chat_request: ChatRequest,
+        intent_result: Optional[IntentClassificationResult] = None,
     ) -> Union[Dict[str, Any], None]:
         start_time = time.time()
         try:
-            intent_result = await self.intent_classification_service.classify_intent(
-                chat_request.message
-            )
+            if intent_result is None:
+                intent_result = await self.classify_request_intent(chat_request)
             intent_type = intent_result.intent_type
             confidence = intent_result.confidence_score
             logger.info(
@@ -261,56 +350,34 @@ class ChatService:
             logger.error(f"통합 의도 분류 처리 중 오류: {intent_error}", exc_info=True)
             return None
 
-    async def _get_session_info(
-        self, db: AsyncSession, user_id: int, session_uuid_str: str
-    ) -> Tuple[
-        PostgresChatMessageHistory,
-        db_models.ChatSession,
-        str,
-        List[BaseMessage],
-        bool,
-    ]:
-        from sqlalchemy.orm import selectinload
-        from sqlalchemy import select
-
-        session_obj = await crud.chat.get_session_by_uuid(
-            db=db, user_id=user_id, session_uuid_str=session_uuid_str
-        )
-
-        # 세션에 메시지가 없는 경우, 즉 첫 대화인 경우 '새 세션'으로 간주하여 제목 생성
-        is_new_session = not session_obj.messages
-
-        history = PostgresChatMessageHistory(
-            db=db, user_id=user_id, session=session_obj
-        )
-        current_session_uuid = str(session_obj.session_uuid)
-        previous_messages = await history.aget_messages()
-
-        return (
-            history,
-            session_obj,
-            current_session_uuid,
-            previous_messages,
-            is_new_session,
-        )
-
     async def stream_chat_response(
         self,
         chat_request: ChatRequest,
         db: AsyncSession,
         background_tasks: BackgroundTasks,
-        request: Optional[Request] = None,
+        intent_result: IntentClassificationResult,
+        preprocessing: SpeculativeStage,
+        disconnect_watcher: Optional[CancellationScope] = None,
     ) -> AsyncGenerator[str, None]:
+        """
+        채팅 응답 SSE 스트림 생성.
+        preprocessing은 start_preprocessing으로 시작한 전처리 단계이며, intent_result는
+        그 단계의 의도 분류 결과임 (분류 LLM 재호출 없음).
+        """
         user_id = chat_request.user_id
         session_uuid_str = chat_request.session_uuid
         message_id = f"chatcompl_{uuid.uuid4().hex[:24]}"
         parent_uuid = str(uuid.uuid4())
         message_uuid = str(uuid.uuid4())
+        turn_started_at = datetime.now(timezone.utc).isoformat()
         content_index = 0
         final_response_text = ""
         is_new_session = False
         previous_messages: List[BaseMessage] = []
-        disconnect_monitor: Optional[asyncio.Task] = None
+        history_window: Optional[HistoryWindow] = None
+        output_tokens = 0
+        used_web_search = False
+        answer_cache_lookup: Optional[AnswerCacheLookup] = None
 
         # --- 단계별 상태 메시지 정의 ---
         steps = [
@@ -319,11 +386,35 @@ class ChatService:
             "AI 생각 및 정보 검색",
             "AI 답변 생성",
         ]
-        is_hscode_intent = (
-            await self.intent_classification_service.classify_intent(
-                chat_request.message
+        is_hscode_intent = intent_result.intent_type == IntentType.HSCODE_CLASSIFICATION
+        # 전처리 단계: 의도 분류와 동시에 시작한 작업 중 경로에 필요 없는 것은 취소하고,
+        # 경로가 정해져야 시작할 수 있는 작업(HSCode 후보 검색, 답변 캐시)을 추가로 시작
+        stage = preprocessing
+        if disconnect_watcher:
+            stage.bind(disconnect_watcher.register)
+        if is_hscode_intent:
+            if not stage.has("hscode_extraction"):
+                stage.start(
+                    "hscode_extraction",
+                    _extract_hscode_from_message(chat_request.message),
+                )
+            if settings.HSCODE_CHAT_RETRIEVAL_ENABLED:
+                stage.start(
+                    "hscode_retrieval", _retrieve_hscode_candidates(chat_request.message)
+                )
+        else:
+            stage.cancel("hscode_extraction")
+        if (
+            settings.SEMANTIC_CACHE_ENABLED
+            and intent_result.intent_type in CACHEABLE_INTENTS
+        ):
+            # 일반 무역 질문 답변 캐시 조회 (질문 임베딩 + pgvector 검색)
+            stage.start(
+                "answer_cache",
+                semantic_answer_cache.lookup(
+                    chat_request.message, route=intent_result.intent_type.value
+                ),
             )
-        ).intent_type == IntentType.HSCODE_CLASSIFICATION
 
         if is_hscode_intent:
             steps.insert(2, "상세 정보 준비")
@@ -340,23 +431,7 @@ class ChatService:
             )
             await asyncio.sleep(0.1)
 
-        async def check_client_disconnection():
-            """클라이언트 연결 상태를 주기적으로 확인"""
-            if request:
-                try:
-                    while True:
-                        if await request.is_disconnected():
-                            logger.info("클라이언트 연결 해제 감지됨")
-                            break
-                        await asyncio.sleep(1)  # 1초마다 확인
-                except asyncio.CancelledError:
-                    logger.info("클라이언트 연결 모니터링이 취소되었습니다")
-
         try:
-            # 클라이언트 연결 상태 모니터링 백그라운드 작업 시작
-            if request:
-                disconnect_monitor = asyncio.create_task(check_client_disconnection())
-
             # 1. 사용자 요청 분석 및 LLM 모델 선택
             async for event in send_status(steps[0]):
                 yield event
@@ -366,127 +441,75 @@ class ChatService:
                 yield self.sse_generator.generate_processing_status_event(
                     "HSCode 상세 정보 준비 시작", 2, total_steps, is_sub_step=True
                 )
-                extracted_hscode, extracted_product_name = (
-                    await _extract_hscode_from_message(chat_request.message)
+                extracted_hscode, extracted_product_name = await stage.get(
+                    "hscode_extraction"
                 )
-                # HSCode 분석용 하드코딩된 ChatAnthropic 모델
-                chat_model = ChatAnthropic(
-                    model_name="claude-sonnet-4-20250514",
-                    api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-                    temperature=1.0,
-                    max_tokens_to_sample=12_000,
-                    timeout=900.0,
-                    max_retries=5,
-                    stop=None,
-                    streaming=True,
-                    default_headers={
-                        "anthropic-beta": "extended-cache-ttl-2025-04-11",
-                    },
-                    thinking={
-                        "type": "enabled",
-                        "budget_tokens": 2000,
-                    },
-                ).bind_tools(
-                    [
-                        {
-                            "type": "web_search_20250305",
-                            "name": "web_search",
-                            "cache_control": {"type": "ephemeral"},
-                            "max_uses": 3,
-                            "allowed_domains": [
-                                # 국제기구 공식 사이트 (최고 신뢰도)
-                                "www.wcotradetools.org",
-                                "www.wcoomd.org",
-                                "hstracker.wto.org",
-                                # 미국 정부 공식 사이트
-                                "www.trade.gov",
-                                "www.census.gov",
-                                "hts.usitc.gov",
-                                "rulings.cbp.gov",
-                                # EU 및 영국 공식 사이트
-                                "ec.europa.eu",
-                                "www.gov.uk",
-                                "www.revenue.ie",
-                                "www.anpost.com",
-                                "www.kvk.nl",
-                                # 아시아태평양 정부 공식 사이트
-                                "unipass.customs.go.kr",
-                                "www.customs.go.jp",
-                                "www.post.japanpost.jp",
-                                "www.customs.gov.sg",
-                                "www.abs.gov.au",
-                                "www.abf.gov.au",
-                                "ised-isde.canada.ca",
-                                "www.canadapost-postescanada.ca",
-                                "ezhs.customs.gov.my",
-                                # 신뢰할 수 있는 상용 도구
-                                "www.avalara.com",
-                                "zonos.com",
-                                "www.customsinfo.com",
-                                "www.tariffnumber.com",
-                                "www.dhl.com",
-                                "www.fedex.com",
-                            ],
-                        }
-                    ]
+                hscode_candidates: List[Document] = (
+                    await stage.get("hscode_retrieval")
+                    if stage.has("hscode_retrieval")
+                    else []
+                )
+                # HSCode 분석용 모델 (레지스트리에서 공유 인스턴스 사용)
+                model_name = SONNET_HSCODE_SPEC.model
+                chat_model = llm_registry.get_model_with_tools(
+                    SONNET_HSCODE_SPEC, [HSCODE_WEB_SEARCH_TOOL]
                 )
             else:
-                logger.info("일반 뉴스/채팅용  하드코딩된 ChatAnthropic 모델")
-
-                # 일반 뉴스/채팅용 하드코딩된 ChatAnthropic 모델
-                chat_model = ChatAnthropic(
-                    model_name=settings.ANTHROPIC_MODEL,
-                    api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-                    temperature=1,
-                    max_tokens_to_sample=15_000,
-                    timeout=1200.0,
-                    max_retries=5,
-                    streaming=True,
-                    stop=None,
-                    default_headers={
-                        "anthropic-beta": "extended-cache-ttl-2025-04-11",
-                        "anthropic-version": "2023-06-01",
-                    },
-                    thinking={"type": "enabled", "budget_tokens": 6_000},
-                ).bind_tools(
-                    [
-                        {
-                            "type": "web_search_20250305",
-                            "name": "web_search",
-                            "cache_control": {"type": "ephemeral"},
-                            "max_uses": 5,
-                            "allowed_domains": [
-                                "finance.yahoo.com/news/",
-                            ],
-                        }
-                    ]
+                # 일반 뉴스/채팅용 모델 (레지스트리에서 공유 인스턴스 사용)
+                model_name = SONNET_THINKING_SPEC.model
+                chat_model = llm_registry.get_model_with_tools(
+                    SONNET_THINKING_SPEC, [NEWS_WEB_SEARCH_TOOL]
                 )
 
             # 2. 대화 맥락 파악 (DB 처리)
             async for event in send_status(steps[1]):
                 yield event
             history: Optional[PostgresChatMessageHistory] = None
-            session_obj: Optional[db_models.ChatSession] = None
+            session_obj: Optional[ChatSessionMetadata] = None
             current_session_uuid: Optional[str] = None
             web_search_urls: List[str] = []
 
             if user_id:
                 try:
-                    (
-                        history,
-                        session_obj,
-                        current_session_uuid,
-                        previous_messages,
-                        is_new_session,
-                    ) = await self._get_session_info(db, user_id, session_uuid_str)
-
-                    if history:
-                        human_message = HumanMessage(content=chat_request.message)
-                        await history.aadd_message(human_message)
+                    session_obj = await stage.get("session_validation")
+                    # 최근 N개 메시지 + 누적 요약 (토큰 예산 내로 제한됨)
+                    history_window = await stage.get("history")
+                    previous_messages = history_window.messages
+                    # 이전 대화가 없는 경우, 즉 첫 대화인 경우 '새 세션'으로 간주하여 제목 생성
+                    is_new_session = not history_window.has_history
+                    history = PostgresChatMessageHistory(
+                        db=db, user_id=user_id, session=session_obj
+                    )
+                    current_session_uuid = str(session_obj.session_uuid)
                 except Exception as db_error:
                     logger.error(f"DB 처리 중 오류: {db_error}", exc_info=True)
+                    stage.cancel("history")
                     await db.rollback()
+                    history = None
+                    previous_messages = []
+                    history_window = None
                     user_id = None
+            if settings.CHAT_PERSIST_WRITE_BEHIND_ENABLED:
+                # 대화 저장은 write-behind 큐가 별도 연결로 수행하므로
+                # LLM 스트리밍 동안 연결을 점유하지 않도록 조회 트랜잭션만 종료하여 풀에 반환.
+                # 세션 자체는 호출한 쪽(엔드포인트)이 스트림 종료 시 닫음.
+                # expire_on_commit=False이므로 조회한 세션 객체는 계속 사용 가능
+                await db.commit()
+
+            # 이전 대화가 없는 일반 질문만 캐시 답변을 사용 (대화 맥락에 따라 답변이 달라짐)
+            if stage.has("answer_cache"):
+                if previous_messages or (history_window and history_window.summary):
+                    stage.cancel("answer_cache")
+                else:
+                    answer_cache_lookup = await stage.get("answer_cache")
+            cached_answer = answer_cache_lookup.hit if answer_cache_lookup else None
+            start_metadata: Dict[str, Any] = {"preprocessing": stage.report()}
+            if answer_cache_lookup is not None:
+                start_metadata["answer_cache"] = {
+                    "hit": cached_answer is not None,
+                    "similarity": cached_answer.similarity if cached_answer else None,
+                    "lookup_ms": round(answer_cache_lookup.latency_ms, 1),
+                }
 
             # 3. 초기 SSE 이벤트 전송
             yield self.sse_generator._format_event(
@@ -503,6 +526,7 @@ class ChatService:
                         "content": [],
                         "stop_reason": None,
                         "stop_sequence": None,
+                        "metadata": start_metadata,
                     },
                 },
             )
@@ -562,6 +586,12 @@ class ChatService:
     - 특정 업체나 서비스를 추천하지 마십시오.
     - 정치적, 종교적으로 민감한 주제에 대해 언급하지 마십시오.
     - 오직 무역 관련 정보에만 집중하십시오.
+    """
+            if history_window and history_window.summary:
+                # 윈도우 밖 이전 대화는 누적 요약으로 전달 (시스템 메시지는 하나만 허용됨)
+                system_prompt += f"""
+    [6. 이전 대화 요약]
+    {history_window.summary}
     """
             messages: List[BaseMessage] = [SystemMessage(content=system_prompt)]
             messages.extend(previous_messages)
@@ -574,17 +604,13 @@ class ChatService:
             hscode_classification_result = None
 
             if is_hscode_intent:
-                # HSCode 기본 정보 추출
-                extracted_hscode, extracted_product_name = (
-                    await _extract_hscode_from_message(chat_request.message)
-                )
-
-                # HSCode 전용 프롬프트 적용
+                # HSCode 전용 프롬프트 적용 (전처리 단계에서 추출한 코드/품목명 재사용)
                 current_user_message.content = (
                     self.hscode_classification_service.create_expert_prompt(
                         user_message=chat_request.message,
                         hscode=extracted_hscode,
                         product_name=extracted_product_name,
+                        reference_documents=hscode_candidates,
                     )
                 )
             messages.append(current_user_message)
@@ -592,15 +618,19 @@ class ChatService:
             # 6. LLM 직접 스트리밍 처리 (cancellation 문제 해결)
             logger.info("🚀 LLM 스트리밍 시작 (안정화된 버전)...")
 
-            try:
-                # 직접 astream 사용하여 스트리밍 (cancellation 내성)
+            async def llm_text_chunks() -> AsyncGenerator[str, None]:
+                """LLM 스트림에서 텍스트만 추출하여 순서대로 반환"""
+                nonlocal final_response_text, output_tokens, used_web_search
+                if cached_answer is not None:
+                    # 캐시 적중: LLM 호출 없이 저장된 답변을 그대로 전송
+                    final_response_text = cached_answer.answer
+                    yield cached_answer.answer
+                    return
+                # 연결 해제 시 감시기가 이 스트림을 읽는 pump 작업을 즉시 취소함
                 async for chunk in chat_model.astream(messages):
-                    # 클라이언트 연결 해제 확인 (선택적 중단)
-                    if request and await request.is_disconnected():
-                        logger.info(
-                            "클라이언트 연결이 해제되어 LLM 스트리밍을 중단합니다."
-                        )
-                        break
+                    usage = getattr(chunk, "usage_metadata", None)
+                    if usage:
+                        output_tokens += usage.get("output_tokens", 0)
 
                     if hasattr(chunk, "content") and chunk.content:
                         content_text = ""
@@ -616,21 +646,46 @@ class ChatService:
                                     and content_block.get("type") == "text"
                                 ):
                                     content_text += content_block.get("text", "")
+                                elif (
+                                    isinstance(content_block, dict)
+                                    and content_block.get("type")
+                                    in _WEB_SEARCH_BLOCK_TYPES
+                                ):
+                                    used_web_search = True
                                 elif isinstance(content_block, str):
                                     content_text += content_block
 
                         if content_text:
                             final_response_text += content_text
-                            logger.info(f"✅ 텍스트 스트림: '{content_text[:50]}...'")
+                            yield content_text
 
-                            delta_event = {
-                                "type": "content_block_delta",
-                                "index": content_index,
-                                "delta": {"type": "text_delta", "text": content_text},
-                            }
-                            yield self.sse_generator._format_event(
-                                "chat_content_delta", delta_event
-                            )
+            try:
+                # 텍스트 청크는 시간/크기 기준으로 병합하여 전송 (첫 토큰은 즉시)
+                async for delta_event in self.sse_generator.coalesce_text_deltas(
+                    llm_text_chunks(),
+                    content_index,
+                    register_task=(
+                        disconnect_watcher.register if disconnect_watcher else None
+                    ),
+                ):
+                    yield delta_event
+                if cached_answer is None:
+                    cancellation_savings.record_completed(
+                        model_name, output_tokens or estimate_tokens(final_response_text)
+                    )
+                    # 웹 검색 결과에 기반한 답변은 시점에 따라 달라지므로 저장하지 않음
+                    if (
+                        answer_cache_lookup
+                        and answer_cache_lookup.embedding
+                        and not used_web_search
+                    ):
+                        semantic_answer_cache.store_in_background(
+                            question=chat_request.message,
+                            answer=final_response_text,
+                            embedding=answer_cache_lookup.embedding,
+                            model_name=model_name,
+                            route=intent_result.intent_type.value,
+                        )
 
             except anthropic.APIConnectionError as e:
                 logger.error(f"Anthropic API 연결 오류: {e}")
@@ -659,9 +714,17 @@ class ChatService:
                     },
                 )
             except asyncio.CancelledError:
+                if disconnect_watcher and disconnect_watcher.disconnected:
+                    # 클라이언트가 떠나 감시기가 LLM 생성을 중단시킨 경우
+                    cancellation_savings.record_cancelled(
+                        model_name,
+                        output_tokens or estimate_tokens(final_response_text),
+                    )
                 # CancelledError를 잡아서 무시하고 부분 응답이라도 완료 처리
                 logger.warning("LLM 스트리밍이 취소되었지만 부분 응답을 유지합니다.")
-                if final_response_text:
+                if final_response_text and not (
+                    disconnect_watcher and disconnect_watcher.disconnected
+                ):
                     completion_text = "\n\n[네트워크 이슈로 응답이 중단되었지만 가능한 정보를 제공했습니다]"
                     yield self.sse_generator._format_event(
                         "chat_content_delta",
@@ -704,7 +767,10 @@ class ChatService:
                             chunk_size = 50
                             for i in range(0, len(response_text), chunk_size):
                                 # 클라이언트 연결 해제 확인
-                                if request and await request.is_disconnected():
+                                if (
+                                    disconnect_watcher
+                                    and disconnect_watcher.disconnected
+                                ):
                                     logger.info(
                                         "클라이언트 연결이 해제되어 폴백 스트리밍을 중단합니다."
                                     )
@@ -753,21 +819,41 @@ class ChatService:
             async for event in send_status(steps[-1]):
                 yield event
 
-            if user_id and history and final_response_text:
+            if user_id and history:
+                # 응답 생성에 실패해 AI 메시지가 없어도 사용자 메시지는 저장
                 try:
-                    ai_message = AIMessage(content=final_response_text)
-                    await history.aadd_message(ai_message)
-
-                    if is_new_session and session_obj:
-                        background_tasks.add_task(
-                            update_session_title,
+                    if settings.CHAT_PERSIST_WRITE_BEHIND_ENABLED:
+                        # 저장 대기열에 넣고 즉시 반환 (writer가 배치로 저장)
+                        await chat_persistence_queue.enqueue(
+                            ChatTurn(
+                                session_uuid=current_session_uuid,
+                                user_message=chat_request.message,
+                                ai_message=final_response_text or None,
+                                ai_model=model_name,
+                                user_at=turn_started_at,
+                            )
+                        )
+                    else:
+                        # 사용자/AI 메시지 한 턴을 한 번의 왕복으로 저장
+                        turn_messages: List[BaseMessage] = [
+                            HumanMessage(content=chat_request.message)
+                        ]
+                        if final_response_text:
+                            turn_messages.append(AIMessage(content=final_response_text))
+                        await history.aadd_messages(turn_messages)
+                        await db.commit()
+
+                    if not final_response_text:
+                        logger.warning("AI 응답이 없어 사용자 메시지만 저장했습니다.")
+                    elif is_new_session and session_obj:
+                        schedule_session_title_update(
                             str(session_obj.session_uuid),
                             chat_request.message,
                             final_response_text,
                         )
-
-                    await db.commit()
                     logger.info("대화 내용이 성공적으로 저장되었습니다.")
+                    if history_window and current_session_uuid:
+                        schedule_history_summary(history_window, current_session_uuid)
                 except Exception as db_error:
                     logger.error(f"대화 내용 저장 실패: {db_error}", exc_info=True)
                     await db.rollback()
@@ -820,13 +906,8 @@ class ChatService:
             )
             yield self.sse_generator._format_event("stream_end", {"type": "error"})
         finally:
-            # 클라이언트 연결 모니터링 작업 정리
-            if disconnect_monitor and not disconnect_monitor.done():
-                disconnect_monitor.cancel()
-                try:
-                    await disconnect_monitor
-                except asyncio.CancelledError:
-                    pass
+            # 스트림이 중단된 경우 남아 있는 전처리 작업 정리
+            stage.cancel_all()
 
     async def _stream_llm_with_heartbeat(
         self,
@@ -2,15 +2,19 @@ import logging
 import json
 import re
 import asyncio
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Sequence, Union
 from datetime import datetime
 from enum import Enum
 
-from langchain_anthropic import ChatAnthropic
+from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import BaseModel, Field
 
-from app.core.config import settings
+from app.services.llm_registry import (
+    llm_registry,
+    HSCODE_WEB_SEARCH_TOOL,
+    SONNET_HSCODE_CLASSIFICATION_SPEC,
+)
 from app.utils.llm_response_parser import extract_text_from_anthropic_response
 
 # ChatRequest import 복원 (runtime에서 실제 사용되므로 필요)
@@ -275,84 +279,138 @@ class HSCodeClassificationResult(BaseModel):
     risk_assessment: str = Field(..., description="위험 평가")
 
 
+# --- 정보 충분성 분석용 키워드 표 ---
+
+# 제품 카테고리 키워드 (정의 순서가 우선순위): (카테고리, 키워드 목록)
+_PRODUCT_CATEGORY_KEYWORDS: List[tuple] = [
+    (
+        "electronics",
+        ["스마트폰", "smartphone", "핸드폰", "휴대폰", "갤럭시", "iphone", "아이폰"],
+    ),
+    (
+        "electronics",
+        ["노트북", "laptop", "컴퓨터", "computer", "태블릿", "tablet"],
+    ),
+    (
+        "machinery",
+        ["기계", "machine", "장비", "equipment", "모터", "motor"],
+    ),
+    (
+        "chemical",
+        ["화학", "chemical", "약품", "물질", "substance"],
+    ),
+]
+
+# 명시적인 HSCode 분류 요청 키워드 (필수)
+_EXPLICIT_REQUEST_KEYWORDS = [
+    "hscode",
+    "hs code",
+    "관세율표",
+    "품목분류",
+    "세번",
+    "분류해줘",
+    "분류해주세요",
+    "분류 요청",
+    "분류 부탁",
+    "tariff",
+    "classification",
+    "customs",
+    "통관코드",
+    "수출입코드",
+    "관세코드",
+    "품목번호",
+    "상품분류",
+    "무역분류",
+    "분류해",
+    "분류를",
+    "코드 알려",
+    "코드를 알려",
+    "어떤 코드",
+]
+
+# 질문 형태 패턴
+_QUESTION_PATTERNS = [
+    "?",
+    "？",
+    "뭐야",
+    "무엇",
+    "what",
+    "알려줘",
+    "알려주세요",
+    "어떻게",
+    "how",
+]
+
+# 상세 정보 키워드
+_DETAILED_KEYWORDS = [
+    "모델",
+    "model",
+    "제조사",
+    "manufacturer",
+    "기능",
+    "function",
+    "사양",
+    "specification",
+    "재료",
+    "material",
+    "용도",
+    "purpose",
+    "크기",
+    "size",
+    "무게",
+    "weight",
+]
+
+
 class HSCodeClassificationService:
     """HSCode 분류 전문 서비스"""
 
     def __init__(self):
 
-        self.hscode_web_search_tool = {
-            "type": "web_search_20250305",
-            "name": "web_search",
-            "cache_control": {"type": "ephemeral"},
-            "max_uses": 3,
-            "allowed_domains": [
-                # 국제기구 공식 사이트 (최고 신뢰도)
-                "www.wcotradetools.org",
-                "www.wcoomd.org",
-                "hstracker.wto.org",
-                # 미국 정부 공식 사이트
-                "www.trade.gov",
-                "www.census.gov",
-                "hts.usitc.gov",
-                "rulings.cbp.gov",
-                # EU 및 영국 공식 사이트
-                "ec.europa.eu",
-                "www.gov.uk",
-                "www.revenue.ie",
-                "www.anpost.com",
-                "www.kvk.nl",
-                # 아시아태평양 정부 공식 사이트
-                "unipass.customs.go.kr",
-                "www.customs.go.jp",
-                "www.post.japanpost.jp",
-                "www.customs.gov.sg",
-                "www.abs.gov.au",
-                "www.abf.gov.au",
-                "ised-isde.canada.ca",
-                "www.canadapost-postescanada.ca",
-                "ezhs.customs.gov.my",
-                # 신뢰할 수 있는 상용 도구
-                "www.avalara.com",
-                "zonos.com",
-                "www.customsinfo.com",
-                "www.tariffnumber.com",
-                "www.dhl.com",
-                "www.fedex.com",
-            ],
-        }
+        self.hscode_web_search_tool = HSCODE_WEB_SEARCH_TOOL
 
-        self.hscode_llm = ChatAnthropic(
-            model_name="claude-sonnet-4-20250514",
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=1.0,  # thinking 모드 활성화 시 1.0으로 설정 필요
-            max_tokens_to_sample=12_000,  # thinking budget_tokens보다 충분히 크게 설정
-            timeout=None,
-            max_retries=5,  # 재시도 횟수를 5회로 증가
-            stop=None,
-            streaming=True,
-            default_headers={
-                "anthropic-beta": "extended-cache-ttl-2025-04-11",
-            },
-            thinking={
-                "type": "enabled",
-                "budget_tokens": 6000,
-            },  # max_tokens보다 작게 설정
+        self.hscode_llm = llm_registry.get_chat_model(
+            SONNET_HSCODE_CLASSIFICATION_SPEC
         )
-        self.hscode_llm_with_search = self.hscode_llm.bind_tools(
-            [self.hscode_web_search_tool]
+        self.hscode_llm_with_search = llm_registry.get_model_with_tools(
+            SONNET_HSCODE_CLASSIFICATION_SPEC, [self.hscode_web_search_tool]
         )
 
         self.info_template = HSCodeRequiredInfoTemplate()
 
+    @staticmethod
+    def _format_reference_candidates(
+        documents: Optional[Sequence[Document]],
+    ) -> str:
+        """HSCode 검색 결과를 프롬프트용 참고 후보 섹션으로 변환 (없으면 빈 문자열)"""
+        if not documents:
+            return ""
+        lines = []
+        for rank, doc in enumerate(documents, start=1):
+            hscode = doc.metadata.get("hscode") or "-"
+            product_name = doc.metadata.get("product_name") or "-"
+            description = " ".join(doc.page_content.split())[:300]
+            lines.append(f"        {rank}. {hscode} | {product_name} | {description}")
+        candidates = "\n".join(lines)
+        return f"""
+    <reference_candidates>
+        Internal HS code database search results for the user query (rank | HS code | product | description).
+        Treat them as leads to verify, not as the answer.
+{candidates}
+    </reference_candidates>"""
+
     def create_expert_prompt(
         self,
         user_message: str,
         hscode: Optional[str],
         product_name: Optional[str],
+        reference_documents: Optional[Sequence[Document]] = None,
     ) -> str:
         """
         사용자가 제공한 새로운 프롬프트 템플릿을 사용하여 HSCode 전문가용 프롬프트를 생성.
+        reference_documents가 있으면 HSCode 검색 결과를 참고 후보로 포함함.
         """
+        reference_section = self._format_reference_candidates(reference_documents)
         # hscode 및 product_name 매개변수는 이전 로직과의 호환성을 위해 유지되지만,
         # 새로운 프롬프트에서는 직접 사용되지 않습니다.
         prompt = f"""
@@ -380,6 +438,7 @@ class HSCodeClassificationService:
     <user_query>
         {{user_message}}
     </user_query>
+{reference_section}
 
     <output_format>
         You MUST provide your response exclusively in ONE of the following Markdown formats, based on your assessment of the user's query.
@@ -469,73 +528,16 @@ class HSCodeClassificationService:
         """
         message_lower = user_message.lower()
 
-        # 제품 카테고리 추출
+        # 제품 카테고리 추출 (표 순서대로 우선순위 적용)
         product_category = "general"
-        if any(
-            keyword in message_lower
-            for keyword in [
-                "스마트폰",
-                "smartphone",
-                "핸드폰",
-                "휴대폰",
-                "갤럭시",
-                "iphone",
-                "아이폰",
-            ]
-        ):
-            product_category = "electronics"
-        elif any(
-            keyword in message_lower
-            for keyword in [
-                "노트북",
-                "laptop",
-                "컴퓨터",
-                "computer",
-                "태블릿",
-                "tablet",
-            ]
-        ):
-            product_category = "electronics"
-        elif any(
-            keyword in message_lower
-            for keyword in ["기계", "machine", "장비", "equipment", "모터", "motor"]
-        ):
-            product_category = "machinery"
-        elif any(
-            keyword in message_lower
-            for keyword in ["화학", "chemical", "약품", "물질", "substance"]
-        ):
-            product_category = "chemical"
-
-        # 명시적인 HSCode 분류 요청 키워드 확인 (필수)
-        explicit_request_keywords = [
-            "hscode",
-            "hs code",
-            "관세율표",
-            "품목분류",
-            "세번",
-            "분류해줘",
-            "분류해주세요",
-            "분류 요청",
-            "분류 부탁",
-            "tariff",
-            "classification",
-            "customs",
-            "통관코드",
-            "수출입코드",
-            "관세코드",
-            "품목번호",
-            "상품분류",
-            "무역분류",
-            "분류해",
-            "분류를",
-            "코드 알려",
-            "코드를 알려",
-            "어떤 코드",
-        ]
+        for category, keywords in _PRODUCT_CATEGORY_KEYWORDS:
+            if any(keyword in message_lower for keyword in keywords):
+                product_category = category
+                break
 
+        # 명시적인 분류 요청 키워드 확인 (필수)
         has_explicit_request = any(
-            keyword in message_lower for keyword in explicit_request_keywords
+            keyword in message_lower for keyword in _EXPLICIT_REQUEST_KEYWORDS
         )
 
         # 명시적인 분류 요청이 없으면 무조건 불충분으로 판단
@@ -545,23 +547,10 @@ class HSCodeClassificationService:
             )
             return False, product_category, requirements
 
-        # 질문 형태 확인
-        question_patterns = [
-            "?",
-            "？",
-            "뭐야",
-            "무엇",
-            "what",
-            "알려줘",
-            "알려주세요",
-            "어떻게",
-            "how",
-        ]
+        # 명시적 요청이 있어도 질문 형태가 없으면 불충분으로 판단
         has_question_form = any(
-            pattern in message_lower for pattern in question_patterns
+            pattern in message_lower for pattern in _QUESTION_PATTERNS
         )
-
-        # 명시적 요청이 있어도 질문 형태가 없으면 불충분으로 판단
         if not has_question_form:
             requirements = self.info_template.get_requirements_by_category(
                 product_category
@@ -569,26 +558,8 @@ class HSCodeClassificationService:
             return False, product_category, requirements
 
         # 상세 정보 키워드 체크
-        detailed_keywords = [
-            "모델",
-            "model",
-            "제조사",
-            "manufacturer",
-            "기능",
-            "function",
-            "사양",
-            "specification",
-            "재료",
-            "material",
-            "용도",
-            "purpose",
-            "크기",
-            "size",
-            "무게",
-            "weight",
-        ]
         has_detailed_info = any(
-            keyword in message_lower for keyword in detailed_keywords
+            keyword in message_lower for keyword in _DETAILED_KEYWORDS
         )
 
         # 메시지 길이가 너무 짧은 경우 (50자 이하로 기준 상향)
@@ -4,10 +4,8 @@ from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_voyageai import VoyageAIEmbeddings
 from langchain_community.tools.tavily_search import TavilySearchResults
 from fastapi import BackgroundTasks
-from pydantic import SecretStr
 
 from app.models.hscode_models import (
     QueryType,
@@ -19,7 +17,8 @@ from app.models.hscode_models import (
     CountryCode,
 )
 from app.models.db_models import HscodeVector
-from app.core.config import settings
+from app.services.llm_registry import llm_registry, SONNET_THINKING_SPEC
+from app.vector_stores.embeddings import get_embeddings
 
 logger = logging.getLogger(__name__)
 
@@ -48,29 +47,7 @@ class HSCodeService:
     }
 
     def __init__(self):
-        # 하드코딩된 ChatAnthropic 모델
-        from langchain_anthropic import ChatAnthropic
-
-        self.llm = ChatAnthropic(
-            model_name=settings.ANTHROPIC_MODEL,
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=1,
-            max_tokens_to_sample=15_000,
-            timeout=1200.0,
-            max_retries=5,
-            streaming=True,
-            stop=None,
-            default_headers={
-                "anthropic-beta": "extended-cache-ttl-2025-04-11",
-                "anthropic-version": "2023-06-01",
-            },
-            thinking={"type": "enabled", "budget_tokens": 6_000},
-        )
-        self.embeddings = VoyageAIEmbeddings(
-            api_key=SecretStr(settings.VOYAGE_API_KEY),
-            model="voyage-multilingual-2",
-            batch_size=32,
-        )
+        self.llm = llm_registry.get_chat_model(SONNET_THINKING_SPEC)
         self.web_search_tool = TavilySearchResults(max_results=5)
 
     async def search_hscode(
@@ -433,8 +410,9 @@ class HSCodeService:
             사용자 질문: {user_query}
             """.strip()
 
-            # 벡터 임베딩 생성
-            embedding_vector = await self.embeddings.aembed_query(text_to_embed)
+            # 벡터 임베딩 생성 (hscode_vectors 검색과 같은 공유 voyage-3-large 클라이언트)
+            embeddings = await get_embeddings()
+            embedding_vector = await embeddings.aembed_query(text_to_embed)
 
             # 데이터베이스에 저장
             hscode_vector = HscodeVector(
@@ -0,0 +1,167 @@
+"""
+의도 분류 결과 2단계 캐시
+
+1단계: 프로세스 내부 TTL LRU 캐시 (O(1) 조회/축출)
+2단계: Redis (모든 uvicorn 워커가 공유, TTL 적용)
+
+키는 정규화된 메시지의 해시이므로 공백/대소문자 차이만 있는
+FAQ성 질문은 같은 항목을 공유함.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_shared_redis
+from app.utils.ttl_lru_cache import TTLLRUCache
+
+if TYPE_CHECKING:
+    from app.services.intent_classification_service import (
+        IntentClassificationResult,
+    )
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Redis 장애 시 재시도까지 대기하는 시간 (초)
+_REDIS_RETRY_AFTER_SECONDS = 30.0
+
+
+def normalize_message(message: str) -> str:
+    """캐시 키 생성을 위한 메시지 정규화 (NFKC, 소문자, 공백 축약)"""
+    normalized = unicodedata.normalize("NFKC", message).casefold()
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def make_cache_key(message: str) -> str:
+    """정규화된 메시지의 SHA-256 해시"""
+    return hashlib.sha256(normalize_message(message).encode("utf-8")).hexdigest()
+
+
+def _serialize(result: "IntentClassificationResult") -> str:
+    return json.dumps(
+        {
+            "intent_type": result.intent_type.value,
+            "confidence_score": result.confidence_score,
+            "reasoning_steps": result.reasoning_steps,
+            "extracted_entities": result.extracted_entities,
+            "alternative_intents": [
+                [intent.value, score] for intent, score in result.alternative_intents
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _deserialize(raw: str) -> "IntentClassificationResult":
+    from app.services.intent_classification_service import (
+        IntentClassificationResult,
+        IntentType,
+    )
+
+    data = json.loads(raw)
+    return IntentClassificationResult(
+        intent_type=IntentType(data["intent_type"]),
+        confidence_score=float(data["confidence_score"]),
+        reasoning_steps=list(data.get("reasoning_steps", [])),
+        extracted_entities=dict(data.get("extracted_entities", {})),
+        alternative_intents=[
+            (IntentType(intent), float(score))
+            for intent, score in data.get("alternative_intents", [])
+        ],
+    )
+
+
+class IntentCache:
+    """
+    의도 분류 결과를 프로세스 내부 LRU와 Redis에 저장하는 2단계 캐시.
+
+    Redis 오류는 로컬 캐시만으로 동작하도록 흡수하며, 일정 시간 동안
+    Redis 조회를 건너뛰어 장애가 요청 지연으로 이어지지 않도록 함.
+    """
+
+    def __init__(self) -> None:
+        self.ttl_seconds = settings.INTENT_CACHE_TTL_SECONDS
+        self.local: TTLLRUCache[str, "IntentClassificationResult"] = TTLLRUCache(
+            max_entries=settings.INTENT_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.ttl_seconds,
+        )
+        self.redis_enabled = settings.INTENT_CACHE_REDIS_ENABLED
+        self._redis_disabled_until = 0.0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+
+    def _redis_key(self, cache_key: str) -> str:
+        return f"{settings.INTENT_CACHE_KEY_PREFIX}{cache_key}"
+
+    def _redis_available(self) -> bool:
+        return self.redis_enabled and time.monotonic() >= self._redis_disabled_until
+
+    def _mark_redis_failure(self, error: Exception) -> None:
+        self.redis_errors += 1
+        self._redis_disabled_until = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+        logger.warning(
+            f"의도 분류 Redis 캐시 사용 불가, {_REDIS_RETRY_AFTER_SECONDS:.0f}초 동안 로컬 캐시만 사용: {error}"
+        )
+
+    async def get(self, cache_key: str) -> Optional["IntentClassificationResult"]:
+        """로컬 캐시 → Redis 순으로 조회. Redis 히트는 로컬 캐시에 다시 적재"""
+        result = self.local.get(cache_key)
+        if result is not None:
+            return result
+        if not self._redis_available():
+            return None
+        try:
+            raw = await get_shared_redis().get(self._redis_key(cache_key))
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+            return None
+        if raw is None:
+            self.redis_misses += 1
+            return None
+        try:
+            result = _deserialize(raw)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"의도 분류 캐시 항목 역직렬화 실패: {e}")
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        self.local.set(cache_key, result)
+        return result
+
+    async def set(self, cache_key: str, result: "IntentClassificationResult") -> None:
+        """로컬 캐시와 Redis에 TTL과 함께 저장"""
+        self.local.set(cache_key, result)
+        if not self._redis_available():
+            return
+        try:
+            await get_shared_redis().set(
+                self._redis_key(cache_key), _serialize(result), ex=self.ttl_seconds
+            )
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """로컬/Redis 계층별 히트/미스 카운터 반환"""
+        return {
+            "local": self.local.stats(),
+            "redis": {
+                "enabled": self.redis_enabled,
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+            },
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+intent_cache = IntentCache()
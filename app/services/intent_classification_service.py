@@ -13,13 +13,15 @@ from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
-from pydantic import SecretStr
 import anthropic
 
 from app.core.config import settings
+from app.services.intent_cache import intent_cache, make_cache_key
+from app.services.llm_registry import llm_registry, SONNET_INTENT_SPEC
+from app.services.local_intent_classifier import local_intent_classifier
 from app.utils.llm_response_parser import extract_text_from_anthropic_response
+from app.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -45,23 +47,26 @@ class IntentClassificationResult:
     alternative_intents: List[Tuple[IntentType, float]]
 
 
+# 프로세스 전역 single-flight: 동시에 들어온 동일 메시지 분류를 하나로 합침
+_classification_flight: SingleFlight[IntentClassificationResult] = SingleFlight(
+    "intent_classification"
+)
+
+
+def intent_classification_stats() -> Dict[str, Any]:
+    """의도 분류 single-flight 통계 조회"""
+    return {
+        "single_flight": _classification_flight.stats(),
+        "cache": intent_cache.stats(),
+        "local_classifier": local_intent_classifier.stats(),
+    }
+
+
 class IntentClassificationService:
     """고급 프롬프트 엔지니어링 기법을 사용한 의도 분류 서비스"""
 
     def __init__(self):
-        self.llm = ChatAnthropic(
-            model_name="claude-sonnet-4-20250514",
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=0.1,  # 더 일관성 있는 결과를 위해 낮춤
-            max_tokens_to_sample=1500,  # 토큰 수 조정
-            streaming=True,
-            timeout=300.0,  # 타임아웃 설정
-            max_retries=2,  # LangChain 레벨에서도 재시도 설정
-            stop=None,
-        )
-        # 중복 호출 방지를 위한 간단한 캐시 (메모리 기반, TTL: 60초)
-        self._cache = {}
-        self._cache_ttl = 60
+        self.llm = llm_registry.get_chat_model(SONNET_INTENT_SPEC)
 
     def _get_step_back_prompt(self) -> str:
         """Step-Back 프롬프팅: 일반적인 의도 분류 원칙 정의"""
@@ -245,26 +250,39 @@ Return only JSON:
 """
 
     def _get_cache_key(self, message: str) -> str:
-        """캐시 키 생성 (메시지의 해시)"""
-        import hashlib
-
-        return hashlib.md5(message.encode("utf-8")).hexdigest()
-
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """캐시 유효성 확인"""
-        import time
-
-        return time.time() - cache_entry.get("timestamp", 0) < self._cache_ttl
+        """캐시 키 생성 (정규화된 메시지의 해시)"""
+        return make_cache_key(message)
 
     async def classify_intent(self, message: str) -> IntentClassificationResult:
-        """고급 프롬프트 엔지니어링 기법을 사용한 의도 분류 (캐싱 적용)"""
-        # 캐시 확인
+        """고급 프롬프트 엔지니어링 기법을 사용한 의도 분류 (캐싱 및 single-flight 적용)"""
+        # 의도가 명확한 메시지는 로컬 규칙으로 즉시 분류 (LLM 호출 생략)
+        if settings.INTENT_LOCAL_CLASSIFIER_ENABLED:
+            decision = local_intent_classifier.classify(message)
+            if decision is not None:
+                return IntentClassificationResult(
+                    intent_type=IntentType(decision.intent),
+                    confidence_score=decision.confidence,
+                    reasoning_steps=[f"Local rule: {r}" for r in decision.reasons],
+                    extracted_entities={**decision.entities, "local_rule": True},
+                    alternative_intents=[],
+                )
+
+        # 캐시 확인 (프로세스 내부 LRU → Redis)
         cache_key = self._get_cache_key(message)
-        if cache_key in self._cache and self._is_cache_valid(self._cache[cache_key]):
+        cached_result = await intent_cache.get(cache_key)
+        if cached_result is not None:
             logger.info(f"의도 분류 캐시 히트: {cache_key[:8]}...")
-            cached_result = self._cache[cache_key]["result"]
             return cached_result
 
+        # 동일 메시지에 대한 동시 분류 요청은 하나의 LLM 호출로 합침
+        return await _classification_flight.do(
+            cache_key, lambda: self._classify_uncached(message, cache_key)
+        )
+
+    async def _classify_uncached(
+        self, message: str, cache_key: str
+    ) -> IntentClassificationResult:
+        """캐시 미스 시 재시도 정책에 따라 실제 LLM 분류를 수행하고 결과를 캐싱"""
         max_retries = 3
         base_delay = 1.0
 
@@ -273,18 +291,7 @@ Return only JSON:
                 result = await self._classify_intent_with_retry(message)
 
                 # 결과를 캐시에 저장
-                import time
-
-                self._cache[cache_key] = {"result": result, "timestamp": time.time()}
-
-                # 캐시 크기 제한 (최대 100개 항목)
-                if len(self._cache) > 100:
-                    # 가장 오래된 항목들 제거
-                    sorted_cache = sorted(
-                        self._cache.items(), key=lambda x: x[1]["timestamp"]
-                    )
-                    # 상위 50개만 유지
-                    self._cache = dict(sorted_cache[-50:])
+                await intent_cache.set(cache_key, result)
 
                 return result
 
@@ -15,12 +15,16 @@ from langchain_core.output_parsers.openai_tools import PydanticToolsParser
 from langchain_core.messages import AIMessage
 from pydantic import BaseModel, Field
 from langchain_core.documents import Document
-from langchain_anthropic import ChatAnthropic
-from pydantic import SecretStr
 
 from app.models.monitoring_models import MonitoringUpdate, SearchResult
 from app.vector_stores.hscode_retriever import get_hscode_retriever
-from app.core.config import settings
+from app.services.llm_registry import (
+    llm_registry,
+    HAIKU_QUESTION_CLASSIFIER_SPEC,
+    HSCODE_WEB_SEARCH_TOOL,
+    SONNET_HSCODE_SPEC,
+    SONNET_THINKING_SPEC,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -73,22 +77,8 @@ class LLMService:
         }
 
         # 하드코딩된 LLM 모델들과 도구들
-        # 1. 기본 ChatAnthropic 모델 초기화
-        self.base_llm = ChatAnthropic(
-            model_name=settings.ANTHROPIC_MODEL,
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=1,
-            max_tokens_to_sample=15_000,
-            timeout=1200.0,  # 20분으로 설정
-            max_retries=5,
-            streaming=True,
-            stop=None,
-            default_headers={
-                "anthropic-beta": "extended-cache-ttl-2025-04-11",
-                "anthropic-version": "2023-06-01",
-            },
-            thinking={"type": "enabled", "budget_tokens": 6_000},
-        )
+        # 1. 기본 ChatAnthropic 모델 (레지스트리 공유 인스턴스)
+        self.base_llm = llm_registry.get_chat_model(SONNET_THINKING_SPEC)
 
         # 2. 모니터링용 웹 검색 도구 정의
         self.monitoring_web_search_tool = {
@@ -102,15 +92,9 @@ class LLMService:
         self.monitoring_chain = self._create_monitoring_chain()
         self.chat_chain = self._create_chat_chain()
 
-        # Claude 3.5 Haiku 모델 초기화
-        self.question_classifier = ChatAnthropic(
-            model_name="claude-3-5-haiku-latest",
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=0.1,
-            streaming=True,
-            max_tokens_to_sample=300,
-            timeout=300.0,
-            stop=None,
+        # Claude 3.5 Haiku 모델 (레지스트리 공유 인스턴스)
+        self.question_classifier = llm_registry.get_chat_model(
+            HAIKU_QUESTION_CLASSIFIER_SPEC
         )
 
     async def _classify_question_with_llm(
@@ -284,67 +268,9 @@ class LLMService:
         # 1. 체인 구성 요소들
         retriever = get_hscode_retriever()
         output_parser = StrOutputParser()
-        llm = ChatAnthropic(
-            model_name="claude-sonnet-4-20250514",
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=1.0,  # thinking 모드 활성화 시 1.0으로 설정 필요
-            max_tokens_to_sample=12_000,  # thinking budget_tokens보다 충분히 크게 설정
-            timeout=900.0,  # 15분으로 설정 (30초 제한 해결)
-            max_retries=5,  # 재시도 횟수를 5회로 증가
-            stop=None,
-            streaming=True,
-            default_headers={
-                "anthropic-beta": "extended-cache-ttl-2025-04-11",
-            },
-            thinking={
-                "type": "enabled",
-                "budget_tokens": 2000,
-            },  # max_tokens보다 작게 설정
-        )
-
-        llm_with_web_search = llm.bind_tools(
-            [
-                {
-                    "type": "web_search_20250305",
-                    "name": "web_search",
-                    "cache_control": {"type": "ephemeral"},
-                    "max_uses": 3,
-                    "allowed_domains": [
-                        # 국제기구 공식 사이트 (최고 신뢰도)
-                        "www.wcotradetools.org",
-                        "www.wcoomd.org",
-                        "hstracker.wto.org",
-                        # 미국 정부 공식 사이트
-                        "www.trade.gov",
-                        "www.census.gov",
-                        "hts.usitc.gov",
-                        "rulings.cbp.gov",
-                        # EU 및 영국 공식 사이트
-                        "ec.europa.eu",
-                        "www.gov.uk",
-                        "www.revenue.ie",
-                        "www.anpost.com",
-                        "www.kvk.nl",
-                        # 아시아태평양 정부 공식 사이트
-                        "unipass.customs.go.kr",
-                        "www.customs.go.jp",
-                        "www.post.japanpost.jp",
-                        "www.customs.gov.sg",
-                        "www.abs.gov.au",
-                        "www.abf.gov.au",
-                        "ised-isde.canada.ca",
-                        "www.canadapost-postescanada.ca",
-                        "ezhs.customs.gov.my",
-                        # 신뢰할 수 있는 상용 도구
-                        "www.avalara.com",
-                        "zonos.com",
-                        "www.customsinfo.com",
-                        "www.tariffnumber.com",
-                        "www.dhl.com",
-                        "www.fedex.com",
-                    ],
-                }
-            ]
+        llm = llm_registry.get_chat_model(SONNET_HSCODE_SPEC)
+        llm_with_web_search = llm_registry.get_model_with_tools(
+            SONNET_HSCODE_SPEC, [HSCODE_WEB_SEARCH_TOOL]
         )
 
         # 2. 프롬프트 템플릿들
@@ -448,19 +374,20 @@ class LLMService:
         )
 
         # 4d. HSCode 질문 처리 체인 (RAG + 웹 검색 폴백)
+        # 벡터 검색과 LLM 호출 모두 비동기로 실행하여 이벤트 루프를 막지 않음
         @as_runnable
-        def hscode_chain(input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        async def hscode_chain(input_dict: Dict[str, Any]) -> Dict[str, Any]:
             """HSCode 질문 처리"""
-            # 문서 검색
-            docs = retriever.invoke(input_dict["question"])
+            # 문서 검색 (타임아웃/오류 시 빈 결과 → 웹 검색 폴백)
+            docs = await retriever.ainvoke(input_dict["question"])
             input_with_docs = {**input_dict, "docs": docs}
 
             # 문서가 있으면 RAG 체인, 없으면 웹 검색 체인
             if docs:
-                result = rag_chain_success.invoke(input_with_docs)
+                result = await rag_chain_success.ainvoke(input_with_docs)
                 return {"answer": result, "source": "rag", "docs": docs}
             else:
-                result = rag_chain_fallback_web_search.invoke(input_with_docs)
+                result = await rag_chain_fallback_web_search.ainvoke(input_with_docs)
                 web_docs = []
                 if (
                     isinstance(result, AIMessage)
@@ -479,14 +406,14 @@ class LLMService:
 
         # 5. 최종 라우팅 체인
         @as_runnable
-        def final_routing(input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        async def final_routing(input_dict: Dict[str, Any]) -> Dict[str, Any]:
             """최종 라우팅 및 응답 생성"""
             route = input_dict.get("route", "non_trade")
 
             if route == "hscode":
-                return hscode_chain.invoke(input_dict)
+                return await hscode_chain.ainvoke(input_dict)
             elif route == "trade_general":
-                return general_chain.invoke(input_dict)
+                return await general_chain.ainvoke(input_dict)
             elif route == "cargo_tracking":
                 # 화물통관 조회는 특별한 표시를 남김 (상위 레이어에서 처리)
                 return {
@@ -0,0 +1,367 @@
+"""
+프로세스 전역 LLM 클라이언트 레지스트리
+
+서비스마다 ChatAnthropic 인스턴스를 새로 만들면 요청마다 HTTP 클라이언트와
+TLS 핸드셰이크가 반복됨. 이 모듈은 (모델, thinking 예산, 도구 구성) 단위로
+워밍된 ChatAnthropic 인스턴스를 캐싱하고, 모든 인스턴스가 하나의 keep-alive
+HTTP 연결 풀을 공유하도록 관리함.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import anthropic
+import httpx
+from langchain_anthropic import ChatAnthropic
+from langchain_core.runnables import Runnable
+from pydantic import SecretStr
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LLMSpec:
+    """레지스트리 캐시 키로 사용되는 ChatAnthropic 구성"""
+
+    model: str
+    temperature: float
+    max_tokens: int
+    timeout: Optional[float]
+    max_retries: int = 2
+    streaming: bool = True
+    thinking_budget: Optional[int] = None
+    default_headers: Tuple[Tuple[str, str], ...] = ()
+
+
+_EXTENDED_CACHE_HEADERS: Tuple[Tuple[str, str], ...] = (
+    ("anthropic-beta", "extended-cache-ttl-2025-04-11"),
+)
+_EXTENDED_CACHE_VERSIONED_HEADERS: Tuple[Tuple[str, str], ...] = (
+    ("anthropic-beta", "extended-cache-ttl-2025-04-11"),
+    ("anthropic-version", "2023-06-01"),
+)
+
+# --- 서비스 공용 모델 구성 ---
+
+# 일반 채팅, 뉴스, 상세페이지 생성에 사용하는 Sonnet (thinking 6000)
+SONNET_THINKING_SPEC = LLMSpec(
+    model=settings.ANTHROPIC_MODEL,
+    temperature=1.0,
+    max_tokens=15_000,
+    timeout=1200.0,
+    max_retries=5,
+    thinking_budget=6_000,
+    default_headers=_EXTENDED_CACHE_VERSIONED_HEADERS,
+)
+
+# HSCode 채팅 응답 및 RAG 체인용 Sonnet (thinking 2000)
+SONNET_HSCODE_SPEC = LLMSpec(
+    model="claude-sonnet-4-20250514",
+    temperature=1.0,
+    max_tokens=12_000,
+    timeout=900.0,
+    max_retries=5,
+    thinking_budget=2_000,
+    default_headers=_EXTENDED_CACHE_HEADERS,
+)
+
+# HSCode 분류 전문 서비스용 Sonnet (thinking 6000, 타임아웃 없음)
+SONNET_HSCODE_CLASSIFICATION_SPEC = LLMSpec(
+    model="claude-sonnet-4-20250514",
+    temperature=1.0,
+    max_tokens=12_000,
+    timeout=None,
+    max_retries=5,
+    thinking_budget=6_000,
+    default_headers=_EXTENDED_CACHE_HEADERS,
+)
+
+# 의도 분류용 Sonnet (낮은 temperature)
+SONNET_INTENT_SPEC = LLMSpec(
+    model="claude-sonnet-4-20250514",
+    temperature=0.1,
+    max_tokens=1500,
+    timeout=300.0,
+    max_retries=2,
+)
+
+# 세션 제목 생성용 Haiku
+HAIKU_TITLE_SPEC = LLMSpec(
+    model="claude-3-5-haiku-20241022",
+    temperature=0.3,
+    max_tokens=100,
+    timeout=120.0,
+)
+
+# 이전 대화 누적 요약용 Haiku
+HAIKU_SUMMARY_SPEC = LLMSpec(
+    model="claude-3-5-haiku-20241022",
+    temperature=0.0,
+    max_tokens=800,
+    timeout=120.0,
+    streaming=False,
+)
+
+# HSCode/품목명 예비 추출용 Haiku
+HAIKU_EXTRACTOR_SPEC = LLMSpec(
+    model="claude-3-5-haiku-20241022",
+    temperature=0.0,
+    max_tokens=200,
+    timeout=120.0,
+    streaming=False,
+)
+
+# 무역 관련 질문 분류용 Haiku
+HAIKU_QUESTION_CLASSIFIER_SPEC = LLMSpec(
+    model="claude-3-5-haiku-latest",
+    temperature=0.1,
+    max_tokens=300,
+    timeout=300.0,
+)
+
+# --- 서비스 공용 도구 정의 ---
+
+HSCODE_WEB_SEARCH_TOOL: Dict[str, Any] = {
+    "type": "web_search_20250305",
+    "name": "web_search",
+    "cache_control": {"type": "ephemeral"},
+    "max_uses": 3,
+    "allowed_domains": [
+        # 국제기구 공식 사이트 (최고 신뢰도)
+        "www.wcotradetools.org",
+        "www.wcoomd.org",
+        "hstracker.wto.org",
+        # 미국 정부 공식 사이트
+        "www.trade.gov",
+        "www.census.gov",
+        "hts.usitc.gov",
+        "rulings.cbp.gov",
+        # EU 및 영국 공식 사이트
+        "ec.europa.eu",
+        "www.gov.uk",
+        "www.revenue.ie",
+        "www.anpost.com",
+        "www.kvk.nl",
+        # 아시아태평양 정부 공식 사이트
+        "unipass.customs.go.kr",
+        "www.customs.go.jp",
+        "www.post.japanpost.jp",
+        "www.customs.gov.sg",
+        "www.abs.gov.au",
+        "www.abf.gov.au",
+        "ised-isde.canada.ca",
+        "www.canadapost-postescanada.ca",
+        "ezhs.customs.gov.my",
+        # 신뢰할 수 있는 상용 도구
+        "www.avalara.com",
+        "zonos.com",
+        "www.customsinfo.com",
+        "www.tariffnumber.com",
+        "www.dhl.com",
+        "www.fedex.com",
+    ],
+}
+
+NEWS_WEB_SEARCH_TOOL: Dict[str, Any] = {
+    "type": "web_search_20250305",
+    "name": "web_search",
+    "cache_control": {"type": "ephemeral"},
+    "max_uses": 5,
+    "allowed_domains": [
+        "finance.yahoo.com/news/",
+    ],
+}
+
+
+class _PooledChatAnthropic(ChatAnthropic):
+    """
+    레지스트리의 공유 HTTP 연결 풀을 사용하는 ChatAnthropic.
+
+    Anthropic 클라이언트를 접근할 때마다 레지스트리의 현재 연결 풀을 확인하므로,
+    `llm_registry.aclose()`로 풀이 닫힌 뒤(lifespan 재시작, 테스트 등)에도
+    모듈 수준 서비스가 들고 있는 인스턴스가 새 풀로 다시 연결됨.
+    """
+
+    @property
+    def _client(self) -> anthropic.Client:
+        http_client = llm_registry.http_client
+        client = self.__dict__.get("_pooled_client")
+        if client is None or client._client is not http_client:
+            client = anthropic.Client(**self._client_params, http_client=http_client)
+            self.__dict__["_pooled_client"] = client
+        return client
+
+    @property
+    def _async_client(self) -> anthropic.AsyncClient:
+        http_client = llm_registry.async_http_client
+        client = self.__dict__.get("_pooled_async_client")
+        if client is None or client._client is not http_client:
+            client = anthropic.AsyncClient(
+                **self._client_params, http_client=http_client
+            )
+            self.__dict__["_pooled_async_client"] = client
+        return client
+
+
+def _tools_key(tools: Sequence[Dict[str, Any]]) -> str:
+    """도구 정의 목록을 해시 가능한 캐시 키로 변환"""
+    return json.dumps(list(tools), sort_keys=True, ensure_ascii=False)
+
+
+def _pool_occupancy(client: Any) -> Dict[str, int]:
+    """httpx 클라이언트 내부 연결 풀의 점유 현황 조회"""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", None) or [])
+    idle = 0
+    for connection in connections:
+        try:
+            if connection.is_idle():
+                idle += 1
+        except Exception:
+            continue
+    return {
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "queued_requests": len(getattr(pool, "_requests", None) or []),
+    }
+
+
+class LLMClientRegistry:
+    """
+    ChatAnthropic 인스턴스와 HTTP 연결 풀을 프로세스 단위로 공유하는 레지스트리.
+
+    - 동일한 LLMSpec에 대해서는 항상 같은 ChatAnthropic 인스턴스를 반환
+    - bind_tools 결과도 (LLMSpec, 도구 구성) 단위로 캐싱
+    - 모든 인스턴스는 하나의 keep-alive httpx 연결 풀을 공유
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: Dict[LLMSpec, ChatAnthropic] = {}
+        self._tool_bound: Dict[Tuple[LLMSpec, str], Runnable] = {}
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._http_client: Optional[httpx.Client] = None
+        self._hits = 0
+        self._misses = 0
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """모든 비동기 Anthropic 클라이언트가 공유하는 httpx 연결 풀"""
+        with self._lock:
+            if self._async_http_client is None or self._async_http_client.is_closed:
+                self._async_http_client = anthropic.DefaultAsyncHttpxClient(
+                    limits=self._limits()
+                )
+                logger.info("LLM 공유 비동기 HTTP 연결 풀 생성")
+            return self._async_http_client
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """모든 동기 Anthropic 클라이언트가 공유하는 httpx 연결 풀"""
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                self._http_client = anthropic.DefaultHttpxClient(limits=self._limits())
+                logger.info("LLM 공유 동기 HTTP 연결 풀 생성")
+            return self._http_client
+
+    def _build_model(self, spec: LLMSpec) -> ChatAnthropic:
+        kwargs: Dict[str, Any] = {
+            "model_name": spec.model,
+            "api_key": SecretStr(settings.ANTHROPIC_API_KEY),
+            "temperature": spec.temperature,
+            "max_tokens_to_sample": spec.max_tokens,
+            "timeout": spec.timeout,
+            "max_retries": spec.max_retries,
+            "streaming": spec.streaming,
+            "stop": None,
+        }
+        if spec.default_headers:
+            kwargs["default_headers"] = dict(spec.default_headers)
+        if spec.thinking_budget:
+            kwargs["thinking"] = {
+                "type": "enabled",
+                "budget_tokens": spec.thinking_budget,
+            }
+        return _PooledChatAnthropic(**kwargs)
+
+    def get_chat_model(self, spec: LLMSpec) -> ChatAnthropic:
+        """LLMSpec에 해당하는 공유 ChatAnthropic 인스턴스 반환"""
+        with self._lock:
+            model = self._models.get(spec)
+            if model is not None:
+                self._hits += 1
+                return model
+            self._misses += 1
+            model = self._build_model(spec)
+            self._models[spec] = model
+        logger.info(
+            f"LLM 클라이언트 등록: model={spec.model}, thinking={spec.thinking_budget}"
+        )
+        return model
+
+    def get_model_with_tools(
+        self, spec: LLMSpec, tools: Sequence[Dict[str, Any]]
+    ) -> Runnable:
+        """도구가 바인딩된 공유 Runnable 반환"""
+        key = (spec, _tools_key(tools))
+        with self._lock:
+            bound = self._tool_bound.get(key)
+            if bound is not None:
+                self._hits += 1
+                return bound
+        bound = self.get_chat_model(spec).bind_tools(list(tools))
+        with self._lock:
+            return self._tool_bound.setdefault(key, bound)
+
+    def stats(self) -> Dict[str, Any]:
+        """등록된 클라이언트 수와 연결 풀 점유 현황 반환"""
+        with self._lock:
+            models: List[Dict[str, Any]] = [
+                {"model": spec.model, "thinking_budget": spec.thinking_budget}
+                for spec in self._models
+            ]
+            return {
+                "registered_models": len(self._models),
+                "registered_tool_bindings": len(self._tool_bound),
+                "hits": self._hits,
+                "misses": self._misses,
+                "models": models,
+                "async_pool": _pool_occupancy(self._async_http_client),
+                "sync_pool": _pool_occupancy(self._http_client),
+                "limits": {
+                    "max_connections": settings.LLM_HTTP_MAX_CONNECTIONS,
+                    "max_keepalive_connections": settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    "keepalive_expiry": settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+                },
+            }
+
+    async def aclose(self) -> None:
+        """
+        공유 HTTP 연결 풀 종료 (애플리케이션 종료 시 호출).
+        등록된 모델은 유지되며, 다음 호출 시 새 연결 풀을 만들어 사용함.
+        """
+        with self._lock:
+            async_client, self._async_http_client = self._async_http_client, None
+            sync_client, self._http_client = self._http_client, None
+        if async_client is not None:
+            await async_client.aclose()
+        if sync_client is not None:
+            sync_client.close()
+        logger.info("LLM 공유 HTTP 연결 풀 종료")
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+llm_registry = LLMClientRegistry()
@@ -0,0 +1,214 @@
+"""
+로컬 규칙 기반 의도 사전 분류기
+
+화물번호 조회나 명시적인 "HS code 분류해줘" 요청처럼 의도가 분명한 메시지는
+LLM 호출 없이 컴파일된 규칙/점수로 즉시 분류하고,
+애매한 메시지만 LLM 분류로 넘김(escalation).
+
+화물번호 패턴과 화물 조회 키워드는 `app.models.chat_models`의 표를,
+HSCode 요청 키워드는 정보 충분성 분석 표를 그대로 사용함.
+뉴스나 시점 표현이 들어간 메시지는 분류 요청처럼 보여도 항상 LLM에 위임함.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.models.chat_models import CARGO_NUMBER_PATTERNS, CARGO_TRACKING_KEYWORDS
+from app.services.hscode_classification_service import (
+    _EXPLICIT_REQUEST_KEYWORDS,
+    _PRODUCT_CATEGORY_KEYWORDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LocalIntentDecision:
+    """로컬 분류 결과 (intent는 IntentType 값 문자열)"""
+
+    intent: str
+    confidence: float
+    reasons: List[str]
+    entities: Dict[str, Any] = field(default_factory=dict)
+
+
+def _compile_keywords(keywords: Iterable[str]) -> re.Pattern:
+    """키워드 목록을 하나의 대소문자 무시 정규식으로 컴파일 (긴 키워드 우선)"""
+    ordered = sorted({k.lower() for k in keywords}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+# 화물번호 패턴 (CARGO_NUMBER_PATTERNS 재사용, 앞뒤 영숫자와 붙은 경우 제외).
+# 숫자로만 된 번호(일반 추적번호, 하이픈 없는 AWB)는 HSCode 10자리나 전화번호와
+# 구분되지 않으므로 약한 근거로만 사용함
+_CARGO_NUMBER_RES = {
+    name: re.compile(rf"(?<![A-Za-z0-9])(?:{pattern})(?![0-9])")
+    for name, pattern in CARGO_NUMBER_PATTERNS.items()
+}
+_CARGO_KEYWORD_RE = _compile_keywords(CARGO_TRACKING_KEYWORDS)
+
+# HSCode 분류 요청 키워드 (정보 충분성 분석 표 재사용).
+# "세번"은 "세 번(3회)"과 구분되지 않아 코드 번호와 붙어 있을 때만 인정하고,
+# customs/tariff는 통관 절차·관세 뉴스 등 분류 요청이 아닌 질문에도 흔히 쓰여 제외
+_AMBIGUOUS_HSCODE_KEYWORDS = {"세번", "customs", "tariff"}
+_HSCODE_KEYWORD_RE = _compile_keywords(
+    k for k in _EXPLICIT_REQUEST_KEYWORDS if k not in _AMBIGUOUS_HSCODE_KEYWORDS
+)
+# 표에 없는 표기 변형 (hs코드, hs 코드, 에이치에스 코드)과 번호가 붙은 "세번"
+_HSCODE_TERM_RE = re.compile(
+    r"(?<![a-z])hs\s*(?:code|코드)|에이치에스\s*코드"
+    r"|세번\s*[:：]?\s*[0-9]{4}|[0-9]{4}[0-9.\-]*\s*세번",
+    re.IGNORECASE,
+)
+# 분류 요청 동사 ("?", "알려", "어떻게" 같은 일반 질문 표현은 인정하지 않음)
+_CLASSIFY_REQUEST_RE = re.compile(
+    r"분류"
+    r"|코드\s*(?:를|가|는|좀)?\s*(?:좀\s*)?(?:찾|알려|뭐|무엇|확인)"
+    r"|어떤\s*코드"
+    r"|classif"
+    r"|(?:which|what)\s+(?:is\s+the\s+)?(?:hs\s*)?code",
+    re.IGNORECASE,
+)
+_HSCODE_NUMBER_RE = re.compile(r"(?<![0-9])[0-9]{4}\.[0-9]{2}(?:\.[0-9]{2,6})?(?![0-9])")
+
+# 뉴스/시점 표현: 최신 정보나 변화에 대한 질문은 분류 요청과 형태가 비슷해도 LLM에 위임
+_NEWS_OR_TIME_RE = re.compile(
+    r"뉴스|소식|기사|동향|최근|최신|요즘|개정|개편|변경|전망|영향|발표"
+    r"|올해|작년|내년|어제|오늘|내일|이번\s*(?:주|달|해)|지난|[0-9]{2,4}\s*년|[0-9]{1,2}\s*월"
+    r"|news|latest|recent|update|trend|today|yesterday|this\s+(?:week|month|year)",
+    re.IGNORECASE,
+)
+
+
+class LocalIntentClassifier:
+    """
+    컴파일된 규칙과 점수로 의도를 판정하는 사전 분류기.
+
+    confidence가 임계값 이상인 경우에만 결과를 반환하며,
+    그 외에는 None을 반환하여 LLM 분류로 넘김.
+    """
+
+    def __init__(self, confidence_threshold: Optional[float] = None) -> None:
+        self.confidence_threshold = (
+            confidence_threshold
+            if confidence_threshold is not None
+            else settings.INTENT_LOCAL_CONFIDENCE_THRESHOLD
+        )
+        self.total = 0
+        self.escalated = 0
+        self.short_circuited: Dict[str, int] = {}
+
+    def _score_cargo(self, message: str) -> Optional[LocalIntentDecision]:
+        reasons: List[str] = []
+        strong: List[str] = []
+        weak: List[str] = []
+        for name, pattern in _CARGO_NUMBER_RES.items():
+            for number in pattern.findall(message):
+                if number in strong or number in weak:
+                    continue
+                if number.isdigit():
+                    weak.append(number)
+                else:
+                    strong.append(number)
+                    reasons.append(f"화물번호 패턴 일치: {name}")
+        if not strong and not weak:
+            return None
+
+        keywords = {k.lower() for k in _CARGO_KEYWORD_RE.findall(message)}
+        score = 0.0
+        if strong:
+            score += 0.6
+            if keywords:
+                score += 0.3
+                reasons.append("화물 조회 키워드 포함")
+            # 메시지 대부분이 번호 자체인 경우 (예: "MSCU1234567")
+            remainder = message
+            for number in strong:
+                remainder = remainder.replace(number, "")
+            if len(remainder.strip()) <= 15:
+                score += 0.3
+                reasons.append("메시지가 화물번호 위주로 구성됨")
+        elif keywords:
+            # 숫자만 있는 번호는 조회 키워드가 둘 이상일 때만 확신 (예: "화물 조회 1234567890")
+            score += 0.5 + min(0.4, 0.2 * len(keywords))
+            reasons.append(f"숫자형 추적번호와 화물 조회 키워드 {len(keywords)}개 포함")
+        else:
+            return None
+
+        return LocalIntentDecision(
+            intent="cargo_tracking",
+            confidence=min(score, 0.99),
+            reasons=reasons,
+            entities={"cargo_numbers": strong + weak},
+        )
+
+    def _score_hscode(self, message: str) -> Optional[LocalIntentDecision]:
+        if not (_HSCODE_KEYWORD_RE.search(message) or _HSCODE_TERM_RE.search(message)):
+            return None
+        reasons = ["HSCode 명시 키워드 포함"]
+        score = 0.6
+        if _CLASSIFY_REQUEST_RE.search(message):
+            score += 0.3
+            reasons.append("분류 요청 표현 포함")
+        entities: Dict[str, Any] = {}
+        hscodes = _HSCODE_NUMBER_RE.findall(message)
+        if hscodes:
+            entities["hscodes"] = hscodes
+        message_lower = message.lower()
+        for category, keywords in _PRODUCT_CATEGORY_KEYWORDS:
+            if any(keyword in message_lower for keyword in keywords):
+                entities["product_category"] = category
+                break
+        return LocalIntentDecision(
+            intent="hscode_classification",
+            confidence=min(score, 0.99),
+            reasons=reasons,
+            entities=entities,
+        )
+
+    def classify(self, message: str) -> Optional[LocalIntentDecision]:
+        """확신할 수 있는 경우 로컬 분류 결과를, 그렇지 않으면 None을 반환"""
+        self.total += 1
+        decision: Optional[LocalIntentDecision] = None
+        # 뉴스/시점 표현이 있으면 분류 요청처럼 보여도 LLM에 위임
+        if not _NEWS_OR_TIME_RE.search(message):
+            cargo = self._score_cargo(message)
+            hscode = self._score_hscode(message)
+            # 두 의도의 근거가 동시에 있으면 애매한 메시지로 보고 LLM에 위임
+            if not (cargo and hscode):
+                candidate = cargo or hscode
+                if candidate and candidate.confidence >= self.confidence_threshold:
+                    decision = candidate
+
+        if decision is None:
+            self.escalated += 1
+        else:
+            self.short_circuited[decision.intent] = (
+                self.short_circuited.get(decision.intent, 0) + 1
+            )
+        logger.info(
+            f"로컬 사전 분류: {decision.intent if decision else 'LLM 위임'} "
+            f"(누적 escalation 비율 {self.escalation_rate:.1%}, {self.escalated}/{self.total})"
+        )
+        return decision
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.total if self.total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """처리 건수, LLM 위임 비율, 의도별 단축 처리 건수 반환"""
+        return {
+            "total": self.total,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalation_rate, 4),
+            "short_circuited": dict(self.short_circuited),
+            "llm_calls_saved": self.total - self.escalated,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+local_intent_classifier = LocalIntentClassifier()
@@ -7,7 +7,6 @@ from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import httpx
 from bs4 import BeautifulSoup
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
@@ -16,8 +15,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from rapidfuzz import fuzz, process, utils
 
 from app.chains.prompt_chains import create_trade_news_prompt
-from app.core.config import settings
 from app.db import crud
+from app.services.llm_registry import (
+    llm_registry,
+    NEWS_WEB_SEARCH_TOOL,
+    SONNET_THINKING_SPEC,
+)
 from app.models.schemas import TradeNewsCreate
 from app.utils.llm_response_parser import (
     extract_citation_urls_from_ai_message,
@@ -195,38 +198,11 @@ class NewsService:
     """
 
     def __init__(self):
-        # 하드코딩된 웹 검색 기능이 바인딩된 모델
-        from pydantic import SecretStr
-
-        base_llm = ChatAnthropic(
-            model_name=settings.ANTHROPIC_MODEL,
-            api_key=SecretStr(settings.ANTHROPIC_API_KEY),
-            temperature=1,
-            max_tokens_to_sample=15_000,
-            timeout=1200.0,
-            max_retries=5,
-            streaming=True,
-            stop=None,
-            default_headers={
-                "anthropic-beta": "extended-cache-ttl-2025-04-11",
-                "anthropic-version": "2023-06-01",
-            },
-            thinking={"type": "enabled", "budget_tokens": 6_000},
+        # 레지스트리에서 공유 ChatAnthropic 인스턴스와 뉴스 검색 도구 바인딩 사용
+        self.llm_with_native_search = llm_registry.get_model_with_tools(
+            SONNET_THINKING_SPEC, [NEWS_WEB_SEARCH_TOOL]
         )
-
-        # 뉴스용 웹 검색 도구
-        news_web_search_tool = {
-            "type": "web_search_20250305",
-            "name": "web_search",
-            "cache_control": {"type": "ephemeral"},
-            "max_uses": 5,
-            "allowed_domains": [
-                "finance.yahoo.com/news/",
-            ],
-        }
-
-        self.llm_with_native_search = base_llm.bind_tools([news_web_search_tool])
-        self.anthropic_chat_model = base_llm
+        self.anthropic_chat_model = llm_registry.get_chat_model(SONNET_THINKING_SPEC)
 
     def _create_news_dtos_from_response(
         self, news_items_from_llm: List[Dict[str, Any]], citation_urls: List[str]
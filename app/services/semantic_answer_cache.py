@@ -0,0 +1,198 @@
+"""
+일반 무역 질문 시맨틱 답변 캐시 (pgvector)
+
+이전 대화가 없는 일반 무역 질문을 임베딩하여 `semantic_answer_cache` 테이블에서
+코사인 유사도가 임계값 이상이고 만료되지 않은 답변을 찾으면 LLM 호출 없이 재사용함.
+
+- 캐시 대상은 CACHEABLE_INTENTS로 분류된 질문뿐이며, 캐시 항목은 분류된 의도별로
+  구분됨 (route 컬럼 = 의도 값). 뉴스/규제 문의처럼 시점에 따라 답이 바뀌는 의도는 제외
+- 웹 검색 결과를 사용한 답변은 저장하지 않음 (호출 측에서 판단)
+
+- 적중/미스 횟수와 조회 지연 시간을 기록함
+- 새 무역 뉴스가 적재되면 뉴스와 유사한 캐시 항목을 즉시 만료시킴
+- 캐시 오류는 로깅만 하고 일반 LLM 경로로 진행함
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from app.core.config import settings
+from app.db import crud
+from app.db.session import SessionLocal
+from app.services.intent_cache import make_cache_key
+from app.services.intent_classification_service import IntentType
+from app.vector_stores.embeddings import get_embeddings
+
+logger = logging.getLogger(__name__)
+
+# 답변을 캐시하는 의도 (일반 무역 질문)
+CACHEABLE_INTENTS = frozenset({IntentType.GENERAL_CHAT})
+
+
+@dataclass
+class CachedAnswer:
+    """캐시 적중 항목"""
+
+    entry_id: int
+    question: str
+    answer: str
+    similarity: float
+
+
+@dataclass
+class AnswerCacheLookup:
+    """캐시 조회 결과. 미스인 경우에도 저장 시 재사용할 질문 임베딩을 포함함"""
+
+    hit: Optional[CachedAnswer]
+    embedding: Optional[List[float]]
+    latency_ms: float
+
+
+class SemanticAnswerCache:
+    """pgvector 기반 일반 무역 질문 답변 캐시"""
+
+    def __init__(self) -> None:
+        self._pending: Set[asyncio.Task] = set()
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidated = 0
+        self.errors = 0
+        self._lookup_ms_total = 0.0
+
+    async def lookup(self, question: str, route: str) -> AnswerCacheLookup:
+        """같은 의도(route)의 캐시 항목 중 질문과 가장 유사한 유효 항목 조회"""
+        started = time.perf_counter()
+        embedding: Optional[List[float]] = None
+        hit: Optional[CachedAnswer] = None
+        try:
+            # hscode_vectors와 같은 1024차원 공유 임베딩 클라이언트 사용
+            embeddings = await get_embeddings()
+            embedding = await embeddings.aembed_query(question)
+            async with SessionLocal() as db:
+                found = await crud.semantic_answer_cache.find_nearest(
+                    db, route=route, embedding=embedding
+                )
+                if found is not None:
+                    entry, distance = found
+                    similarity = 1.0 - distance
+                    if similarity >= settings.SEMANTIC_CACHE_SIMILARITY_THRESHOLD:
+                        await crud.semantic_answer_cache.record_hit(db, entry.id)
+                        await db.commit()
+                        hit = CachedAnswer(
+                            entry_id=entry.id,
+                            question=entry.question,
+                            answer=entry.answer,
+                            similarity=round(similarity, 4),
+                        )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"시맨틱 답변 캐시 조회 실패, LLM 경로로 진행: {e}")
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.lookups += 1
+        self._lookup_ms_total += latency_ms
+        if hit is not None:
+            self.hits += 1
+            logger.info(
+                f"시맨틱 답변 캐시 적중: similarity={hit.similarity}, "
+                f"{latency_ms:.1f}ms"
+            )
+        else:
+            self.misses += 1
+        return AnswerCacheLookup(hit=hit, embedding=embedding, latency_ms=latency_ms)
+
+    async def store(
+        self,
+        question: str,
+        answer: str,
+        embedding: Sequence[float],
+        model_name: str,
+        route: str,
+    ) -> None:
+        """완료된 답변을 캐시에 저장 (같은 질문이 있으면 갱신)"""
+        if not answer.strip():
+            return
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.SEMANTIC_CACHE_TTL_SECONDS
+        )
+        try:
+            async with SessionLocal() as db:
+                await crud.semantic_answer_cache.upsert(
+                    db,
+                    route=route,
+                    question=question,
+                    question_hash=make_cache_key(question),
+                    answer=answer,
+                    embedding=embedding,
+                    model_name=model_name,
+                    expires_at=expires_at,
+                )
+                await db.commit()
+            self.stores += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"시맨틱 답변 캐시 저장 실패: {e}")
+
+    def store_in_background(self, *args: Any, **kwargs: Any) -> None:
+        """응답 스트림을 지연시키지 않도록 저장을 백그라운드 작업으로 실행"""
+        task = asyncio.create_task(self.store(*args, **kwargs))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def invalidate_for_news(self, news_items: Sequence[Any]) -> int:
+        """
+        새로 적재된 뉴스와 유사한 캐시 항목을 만료시킴.
+
+        뉴스 제목+요약 임베딩과 코사인 유사도가
+        SEMANTIC_CACHE_INVALIDATION_THRESHOLD 이상인 항목이 대상임.
+        """
+        if not settings.SEMANTIC_CACHE_ENABLED or not news_items:
+            return 0
+        texts = [
+            f"{item.title}\n{item.summary or ''}".strip() for item in news_items
+        ]
+        max_distance = 1.0 - settings.SEMANTIC_CACHE_INVALIDATION_THRESHOLD
+        expired = 0
+        try:
+            embeddings = await get_embeddings()
+            vectors = await embeddings.aembed_documents(texts)
+            async with SessionLocal() as db:
+                for vector in vectors:
+                    expired += await crud.semantic_answer_cache.expire_similar(
+                        db, embedding=vector, max_distance=max_distance
+                    )
+                await db.commit()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"뉴스 적재에 따른 시맨틱 답변 캐시 무효화 실패: {e}")
+            return 0
+        self.invalidated += expired
+        logger.info(f"뉴스 {len(texts)}건 적재로 시맨틱 답변 캐시 {expired}건 만료")
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.SEMANTIC_CACHE_ENABLED,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "avg_lookup_ms": (
+                round(self._lookup_ms_total / self.lookups, 1) if self.lookups else 0.0
+            ),
+            "stores": self.stores,
+            "invalidated": self.invalidated,
+            "errors": self.errors,
+            "similarity_threshold": settings.SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+            "ttl_seconds": settings.SEMANTIC_CACHE_TTL_SECONDS,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+semantic_answer_cache = SemanticAnswerCache()
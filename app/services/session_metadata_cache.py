@@ -0,0 +1,63 @@
+"""
+채팅 세션 메타데이터 캐시
+
+매 요청마다 수행하던 세션 존재/소유 확인 쿼리를 (user_id, session_uuid) 키의
+짧은 TTL 캐시로 대체함. 세션은 Spring Boot가 생성/삭제하므로 TTL을 짧게 유지하고,
+존재하지 않는 세션(ValueError)은 캐시하지 않음.
+"""
+
+import logging
+from typing import Any, Dict, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import crud
+from app.models import schemas
+from app.utils.ttl_lru_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class SessionMetadataCache:
+    """(user_id, session_uuid) → 세션 메타데이터 TTL 캐시"""
+
+    def __init__(self) -> None:
+        self.local: TTLLRUCache[Tuple[int, str], schemas.ChatSessionMetadata] = (
+            TTLLRUCache(
+                max_entries=settings.CHAT_SESSION_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.CHAT_SESSION_CACHE_TTL_SECONDS,
+            )
+        )
+
+    @staticmethod
+    def _key(user_id: int, session_uuid_str: str) -> Tuple[int, str]:
+        return user_id, session_uuid_str.strip().lower()
+
+    async def get(
+        self, db: AsyncSession, user_id: int, session_uuid_str: str
+    ) -> schemas.ChatSessionMetadata:
+        """캐시된 메타데이터를 반환하고, 없으면 메시지 없이 세션만 조회하여 캐시"""
+        key = self._key(user_id, session_uuid_str or "")
+        cached = self.local.get(key)
+        if cached is not None:
+            return cached
+        metadata = await crud.chat.get_session_by_uuid(
+            db=db, user_id=user_id, session_uuid_str=session_uuid_str
+        )
+        self.local.set(key, metadata)
+        return metadata
+
+    def invalidate(self, user_id: int, session_uuid_str: str) -> None:
+        """세션 정보가 바뀐 경우 (예: 제목 갱신) 캐시 항목 제거"""
+        self.local.pop(self._key(user_id, session_uuid_str))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": settings.CHAT_SESSION_CACHE_TTL_SECONDS,
+            **self.local.stats(),
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+session_metadata_cache = SessionMetadataCache()
@@ -1,11 +1,52 @@
 import json
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, AsyncGenerator, Optional, List
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
 import uuid
 
+from app.core.config import settings
 from app.models.schemas import DetailPageInfo, DetailButton
 
+# 텍스트 델타 병합 누적 카운터 (프로세스 전체)
+_coalesce_counters: Dict[str, int] = {
+    "streams": 0,
+    "chunks_in": 0,
+    "frames_out": 0,
+    "timer_flushes": 0,
+    "size_flushes": 0,
+}
+
+
+def sse_coalescing_stats() -> Dict[str, Any]:
+    """입력 청크 수 대비 실제 전송된 SSE 프레임 수 반환"""
+    chunks_in = _coalesce_counters["chunks_in"]
+    frames_out = _coalesce_counters["frames_out"]
+    return {
+        **_coalesce_counters,
+        "frames_saved": chunks_in - frames_out,
+        "chunks_per_frame": round(chunks_in / frames_out, 2) if frames_out else 0.0,
+        "interval_ms": settings.SSE_COALESCE_INTERVAL_MS,
+        "max_bytes": settings.SSE_COALESCE_MAX_BYTES,
+    }
+
+
+class _PumpFailure:
+    """업스트림 텍스트 스트림에서 발생한 예외를 소비자 쪽으로 전달하기 위한 래퍼"""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_PUMP_DONE = object()
+
 
 class SSEEventGenerator:
     """SSE 이벤트 생성기"""
@@ -18,6 +59,121 @@ class SSEEventGenerator:
         """SSE 이벤트 문자열을 포맷팅함"""
         return f"event: {event_name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
+    def generate_text_delta_event(self, index: int, text: str) -> str:
+        """텍스트 델타(chat_content_delta) 이벤트 생성"""
+        return self._format_event(
+            "chat_content_delta",
+            {
+                "type": "content_block_delta",
+                "index": index,
+                "delta": {"type": "text_delta", "text": text},
+            },
+        )
+
+    async def coalesce_text_deltas(
+        self,
+        texts: AsyncIterator[str],
+        index: int,
+        interval_ms: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        register_task: Optional[Callable[[asyncio.Task], Any]] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        LLM 텍스트 청크를 시간/크기 기준으로 묶어 chat_content_delta 이벤트로 변환.
+
+        - 첫 청크는 TTFT 유지를 위해 즉시 전송
+        - 이후 청크는 interval_ms가 지나거나 max_bytes를 넘으면 하나의 프레임으로 전송
+        - 업스트림은 별도 pump 작업이 큐로 읽어 오므로, 새 청크가 없어도 타이머 만료 시 전송됨
+        - 업스트림 예외는 남은 버퍼를 전송한 뒤 그대로 다시 발생시킴
+        - register_task로 pump 작업을 넘겨 연결 해제 시 업스트림을 바로 취소할 수 있음
+        """
+        interval = (
+            settings.SSE_COALESCE_INTERVAL_MS if interval_ms is None else interval_ms
+        ) / 1000
+        limit = settings.SSE_COALESCE_MAX_BYTES if max_bytes is None else max_bytes
+        counters = _coalesce_counters
+        counters["streams"] += 1
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump() -> None:
+            try:
+                async for text in texts:
+                    queue.put_nowait(text)
+            except asyncio.CancelledError as e:
+                queue.put_nowait(_PumpFailure(e))
+                raise
+            except Exception as e:
+                queue.put_nowait(_PumpFailure(e))
+            else:
+                queue.put_nowait(_PUMP_DONE)
+
+        loop = asyncio.get_running_loop()
+        pump_task = asyncio.create_task(pump())
+        if register_task is not None:
+            register_task(pump_task)
+        buffer: List[str] = []
+        buffered_bytes = 0
+        deadline = 0.0
+        first_sent = False
+
+        def flush() -> str:
+            nonlocal buffered_bytes
+            text = "".join(buffer)
+            buffer.clear()
+            buffered_bytes = 0
+            counters["frames_out"] += 1
+            return self.generate_text_delta_event(index, text)
+
+        try:
+            while True:
+                if not queue.empty():
+                    item = queue.get_nowait()
+                elif buffer:
+                    try:
+                        item = await asyncio.wait_for(
+                            queue.get(), max(0.0, deadline - loop.time())
+                        )
+                    except asyncio.TimeoutError:
+                        counters["timer_flushes"] += 1
+                        yield flush()
+                        continue
+                else:
+                    item = await queue.get()
+
+                if item is _PUMP_DONE:
+                    break
+                if isinstance(item, _PumpFailure):
+                    if buffer:
+                        yield flush()
+                    raise item.error
+
+                counters["chunks_in"] += 1
+                # 첫 청크이거나 병합이 비활성화된 경우(interval <= 0) 바로 전송
+                if not first_sent or interval <= 0:
+                    first_sent = True
+                    counters["frames_out"] += 1
+                    yield self.generate_text_delta_event(index, item)
+                    continue
+
+                if not buffer:
+                    deadline = loop.time() + interval
+                buffer.append(item)
+                buffered_bytes += len(item.encode("utf-8"))
+                if buffered_bytes >= limit:
+                    counters["size_flushes"] += 1
+                    yield flush()
+                elif loop.time() >= deadline:
+                    counters["timer_flushes"] += 1
+                    yield flush()
+
+            if buffer:
+                yield flush()
+        finally:
+            if not pump_task.done():
+                pump_task.cancel()
+            await asyncio.gather(pump_task, return_exceptions=True)
+
     def generate_hscode_classification_event(
         self,
         hscode: Optional[str] = None,
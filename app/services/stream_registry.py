@@ -0,0 +1,404 @@
+"""
+재개 가능한 SSE 스트림 레지스트리
+
+채팅 응답 생성(producer)을 클라이언트 연결과 분리하여 백그라운드 작업으로 실행하고,
+생성된 모든 SSE 프레임에 `{stream_id}:{seq}` 형식의 단조 증가 id를 붙여
+스트림별 링 버퍼에 보관함.
+
+- 클라이언트가 끊겼다가 `Last-Event-ID`로 재연결하면 진행 중인 생성에 다시 붙거나
+  완료된 응답을 버퍼에서 재전송함 (새 LLM 호출 없음)
+- 구독자가 모두 사라진 뒤 유예 시간(grace) 안에 재연결이 없으면 생성을 취소함.
+  유예 시간 동안은 아무도 받지 않는 토큰도 계속 생성되므로(재연결 시 새 LLM 호출을
+  피하는 대신 치르는 비용), 유예 시간이 0이거나 재개 기능이 꺼져 있으면 마지막 구독자가
+  끊기는 즉시 취소함
+- 완료된 스트림은 TTL 동안 보관 후 제거함
+
+- flight_key를 지정한 스트림은 진행 중인 동안 같은 키의 요청이 새 생성 없이
+  구독자로 합류함 (동일 질문 동시 요청 single-flight)
+
+- 재개는 스트림을 만든 요청과 user_id, session_uuid가 같을 때만 허용함
+  (single-flight 합류자는 자신의 session_uuid로 재개 가능)
+
+버퍼는 프로세스 내부에 있으므로 재연결 요청은 같은 워커로 라우팅되어야 함.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from app.core.config import settings
+from app.utils.disconnect_watcher import CancellationScope
+
+logger = logging.getLogger(__name__)
+
+
+def format_event_id(stream_id: str, seq: int) -> str:
+    return f"{stream_id}:{seq}"
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """`{stream_id}:{seq}` 형식의 Last-Event-ID 파싱. 형식이 다르면 None"""
+    if not value:
+        return None
+    stream_id, sep, seq = value.strip().rpartition(":")
+    if not sep or not stream_id:
+        return None
+    try:
+        return stream_id, int(seq)
+    except ValueError:
+        return None
+
+
+def message_digest(message: str) -> str:
+    """재개 요청이 원래 요청과 같은 메시지인지 비교하기 위한 해시 (원문 그대로)"""
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+class StreamState:
+    """
+    스트림 하나의 프레임 링 버퍼와 구독자 상태.
+
+    producer는 publish()로 프레임을 추가하고, 구독자는 subscribe()로
+    지정한 seq 이후의 프레임을 순서대로 받음.
+    """
+
+    def __init__(
+        self,
+        stream_id: str,
+        max_frames: int,
+        grace_seconds: float,
+        flight_key: Optional[str] = None,
+        user_id: Optional[int] = None,
+        session_uuid: Optional[str] = None,
+        message: str = "",
+    ) -> None:
+        self.stream_id = stream_id
+        self.flight_key = flight_key
+        # 재개 권한 확인용: 스트림을 만든 사용자와 구독 중인 세션
+        self.user_id = user_id
+        self.session_uuids: Set[str] = {session_uuid} if session_uuid else set()
+        self.message_digest = message_digest(message)
+        self.frames: Deque[Tuple[int, str]] = deque(maxlen=max_frames)
+        self.next_seq = 0
+        self.done = False
+        self.abandoned = False
+        self.subscribers = 0
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.grace_seconds = grace_seconds
+        # 구독자가 모두 사라진 채 유예 시간이 지나면 트리거되는 producer 취소 범위
+        self.scope = CancellationScope(label=f"stream={stream_id}")
+        self.producer: Optional[asyncio.Task] = None
+        self._waiter = asyncio.Event()
+        self._grace_handle: Optional[asyncio.TimerHandle] = None
+
+    def allows(
+        self,
+        user_id: Optional[int],
+        session_uuid: Optional[str],
+        message: Optional[str] = None,
+    ) -> bool:
+        """
+        같은 사용자·세션의 재개 요청인지 확인.
+        message를 주면 원래 요청과 메시지까지 같아야 함 (POST 재전송 판별용)
+        """
+        if user_id != self.user_id or session_uuid not in self.session_uuids:
+            return False
+        return message is None or message_digest(message) == self.message_digest
+
+    def wake(self) -> None:
+        """대기 중인 구독자를 깨움 (새 프레임, 완료, 구독자 연결 해제 시)"""
+        waiter, self._waiter = self._waiter, asyncio.Event()
+        waiter.set()
+
+    def publish(self, frame: str) -> int:
+        """프레임에 id를 붙여 버퍼에 추가하고 seq 반환"""
+        seq = self.next_seq
+        self.next_seq += 1
+        self.frames.append(
+            (seq, f"id: {format_event_id(self.stream_id, seq)}\n{frame}")
+        )
+        self.wake()
+        return seq
+
+    def finish(self) -> None:
+        self.done = True
+        self.finished_at = time.monotonic()
+        if self._grace_handle is not None:
+            self._grace_handle.cancel()
+            self._grace_handle = None
+        self.wake()
+
+    def _attach(self) -> None:
+        self.subscribers += 1
+        if self._grace_handle is not None:
+            self._grace_handle.cancel()
+            self._grace_handle = None
+
+    def _detach(self) -> None:
+        self.subscribers -= 1
+        if self.subscribers == 0 and not self.done:
+            if self.grace_seconds <= 0:
+                # 재연결을 기다리지 않음: 업스트림 작업을 즉시 취소
+                self._abandon()
+                return
+            self._grace_handle = asyncio.get_running_loop().call_later(
+                self.grace_seconds, self._abandon
+            )
+
+    def _abandon(self) -> None:
+        self._grace_handle = None
+        if self.subscribers == 0 and not self.done:
+            self.abandoned = True
+            self.scope.trigger("재연결 유예 시간 초과로 응답 생성 중단")
+
+    async def subscribe(
+        self, after_seq: int = -1, until: Optional[CancellationScope] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        after_seq 이후의 프레임을 버퍼에서 재전송하고, 진행 중이면 새 프레임을 계속 전달.
+
+        until이 트리거되면 (예: 이 구독자의 클라이언트 연결 해제) 즉시 종료함.
+        """
+        self._attach()
+        try:
+            while True:
+                if until is not None and until.disconnected:
+                    return
+                waiter = self._waiter
+                if self.frames:
+                    first_seq = self.frames[0][0]
+                    if after_seq + 1 < first_seq:
+                        stream_registry.gaps += 1
+                        logger.warning(
+                            f"재전송 버퍼 범위 초과 (stream={self.stream_id}): "
+                            f"seq {after_seq + 1}~{first_seq - 1} 누락"
+                        )
+                        after_seq = first_seq - 1
+                    start = after_seq + 1 - first_seq
+                    batch = list(islice(self.frames, start, None))
+                    for seq, frame in batch:
+                        yield frame
+                        after_seq = seq
+                    if batch:
+                        continue
+                if self.done:
+                    return
+                await waiter.wait()
+        finally:
+            self._detach()
+
+
+class StreamRegistry:
+    """stream_id → StreamState 매핑과 producer 작업 관리"""
+
+    def __init__(self) -> None:
+        self._streams: "OrderedDict[str, StreamState]" = OrderedDict()
+        # single-flight 키 → 진행 중인 stream_id
+        self._flights: Dict[str, str] = {}
+        self.created = 0
+        self.flight_joins = 0
+        self.resumed = 0
+        self.resume_rejected = 0
+        self.abandoned = 0
+        self.gaps = 0
+
+    def _purge(self) -> None:
+        """TTL이 지난 완료 스트림과 최대 개수를 넘는 오래된 완료 스트림 제거"""
+        now = time.monotonic()
+        ttl = settings.CHAT_RESUME_TTL_SECONDS
+        for stream_id, state in list(self._streams.items()):
+            if state.done and state.finished_at and now - state.finished_at > ttl:
+                del self._streams[stream_id]
+        overflow = len(self._streams) - settings.CHAT_RESUME_MAX_STREAMS
+        for stream_id, state in list(self._streams.items()):
+            if overflow <= 0:
+                break
+            if state.done:
+                del self._streams[stream_id]
+                overflow -= 1
+
+    def create(
+        self,
+        user_id: Optional[int],
+        session_uuid: str,
+        message: str,
+        flight_key: Optional[str] = None,
+    ) -> StreamState:
+        """
+        새 스트림 생성. 요청자의 user_id, session_uuid, 메시지를 재개 권한 확인용으로 보관함.
+        flight_key를 주면 완료 전까지 같은 키의 요청이 합류할 수 있음
+        """
+        self._purge()
+        stream_id = uuid.uuid4().hex
+        state = StreamState(
+            stream_id,
+            flight_key=flight_key,
+            user_id=user_id,
+            session_uuid=session_uuid,
+            message=message,
+            max_frames=settings.CHAT_RESUME_BUFFER_FRAMES,
+            # 재개 기능이 꺼져 있으면 구독자가 끊기는 즉시 생성을 중단
+            grace_seconds=self.grace_seconds,
+        )
+        self._streams[stream_id] = state
+        if flight_key is not None:
+            self._flights[flight_key] = stream_id
+        self.created += 1
+        return state
+
+    def join(
+        self, flight_key: str, user_id: Optional[int], session_uuid: str
+    ) -> Optional[StreamState]:
+        """
+        같은 flight_key로 진행 중인 스트림이 있으면 반환 (새 생성 없이 구독).
+        합류한 요청의 세션도 이 스트림을 재개할 수 있도록 등록함
+        """
+        stream_id = self._flights.get(flight_key)
+        state = self._streams.get(stream_id) if stream_id else None
+        if (
+            state is None
+            or state.done
+            or state.abandoned
+            or user_id != state.user_id
+        ):
+            return None
+        state.session_uuids.add(session_uuid)
+        self.flight_joins += 1
+        logger.info(
+            f"동일 질문 진행 중 스트림에 합류: stream={stream_id} (single-flight)"
+        )
+        return state
+
+    def get(
+        self, stream_id: str, user_id: Optional[int], session_uuid: Optional[str]
+    ) -> Optional[StreamState]:
+        """같은 사용자·세션이 만든(또는 합류한) 스트림만 반환"""
+        state = self._streams.get(stream_id)
+        if state is None:
+            return None
+        if not state.allows(user_id, session_uuid):
+            self._reject(stream_id)
+            return None
+        return state
+
+    def _reject(self, stream_id: str) -> None:
+        self.resume_rejected += 1
+        logger.warning(
+            f"SSE 스트림 재개 거부: stream={stream_id} (요청자의 사용자/세션 또는 메시지 불일치)"
+        )
+
+    @property
+    def grace_seconds(self) -> float:
+        """구독자가 모두 끊긴 뒤 생성을 유지하는 시간 (재개 기능이 꺼져 있으면 0 = 즉시 취소)"""
+        if not settings.CHAT_RESUME_ENABLED:
+            return 0.0
+        return max(0.0, settings.CHAT_RESUME_GRACE_SECONDS)
+
+    def start(self, state: StreamState, frames: AsyncIterator[str]) -> asyncio.Task:
+        """클라이언트 연결과 무관하게 frames를 끝까지 소비하여 버퍼에 게시하는 producer 시작"""
+
+        async def produce() -> None:
+            try:
+                async for frame in frames:
+                    state.publish(frame)
+            except asyncio.CancelledError:
+                logger.info(f"스트림 producer 취소됨 (stream={state.stream_id})")
+            except Exception as e:
+                logger.error(
+                    f"스트림 producer 오류 (stream={state.stream_id}): {e}",
+                    exc_info=True,
+                )
+            finally:
+                if state.abandoned:
+                    self.abandoned += 1
+                if (
+                    state.flight_key is not None
+                    and self._flights.get(state.flight_key) == state.stream_id
+                ):
+                    del self._flights[state.flight_key]
+                state.finish()
+
+        state.producer = asyncio.create_task(produce())
+        return state.producer
+
+    def resume(
+        self,
+        last_event_id: Optional[str],
+        user_id: Optional[int],
+        session_uuid: Optional[str],
+        message: Optional[str] = None,
+    ) -> Optional[Tuple[StreamState, int]]:
+        """
+        Last-Event-ID에 해당하는 스트림과 재개 시작 seq 반환.
+        스트림이 없거나 사용자·세션(message를 주면 메시지까지)이 원래 요청과 다르면 None
+        """
+        if not settings.CHAT_RESUME_ENABLED:
+            return None
+        parsed = parse_last_event_id(last_event_id)
+        if parsed is None:
+            return None
+        stream_id, seq = parsed
+        state = self._streams.get(stream_id)
+        if state is None:
+            return None
+        if not state.allows(user_id, session_uuid, message):
+            self._reject(stream_id)
+            return None
+        self.resumed += 1
+        logger.info(
+            f"SSE 스트림 재개: stream={stream_id}, seq {seq} 이후부터 "
+            f"({'완료된 응답 재전송' if state.done else '진행 중인 생성에 연결'})"
+        )
+        return state, seq
+
+    def stats(self) -> Dict[str, Any]:
+        active = sum(1 for state in self._streams.values() if not state.done)
+        return {
+            "streams": len(self._streams),
+            "active": active,
+            "created": self.created,
+            "resumed": self.resumed,
+            "resume_rejected": self.resume_rejected,
+            "single_flight": {
+                "enabled": settings.CHAT_SINGLE_FLIGHT_ENABLED,
+                "inflight": len(self._flights),
+                "joins": self.flight_joins,
+            },
+            "abandoned": self.abandoned,
+            "gaps": self.gaps,
+            "buffer_frames": settings.CHAT_RESUME_BUFFER_FRAMES,
+            "grace_seconds": self.grace_seconds,
+        }
+
+    async def aclose(self) -> None:
+        """종료 시 진행 중인 producer 취소"""
+        producers = [
+            state.producer
+            for state in self._streams.values()
+            if state.producer and not state.producer.done()
+        ]
+        for task in producers:
+            task.cancel()
+        if producers:
+            await asyncio.gather(*producers, return_exceptions=True)
+        self._streams.clear()
+        self._flights.clear()
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+stream_registry = StreamRegistry()
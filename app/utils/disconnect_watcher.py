@@ -0,0 +1,200 @@
+"""
+이벤트 기반 클라이언트 연결 해제 감지
+
+스트림마다 ASGI receive 채널을 한 번만 대기하는 감시 작업을 두고,
+`http.disconnect` 메시지를 받는 즉시 등록된 업스트림 작업(LLM 스트림 pump,
+상세페이지 준비 작업 등)을 취소함. 주기적인 `request.is_disconnected()`
+폴링을 대체함.
+
+조기 취소로 생성되지 않은 출력 토큰 수와 비용을 추정하여 누적함.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from starlette.types import Receive
+
+logger = logging.getLogger(__name__)
+
+# 모델별 출력 토큰 단가 (USD / 1M tokens)
+_OUTPUT_PRICE_PER_MTOK: Dict[str, float] = {
+    "claude-sonnet-4-20250514": 15.0,
+    "claude-3-5-haiku-20241022": 4.0,
+    "claude-3-5-haiku-latest": 4.0,
+}
+_DEFAULT_OUTPUT_PRICE_PER_MTOK = 15.0
+# 사용량 정보가 없을 때 문자 수로 토큰 수를 추정하는 비율
+_CHARS_PER_TOKEN = 2.5
+# 모델별 기대 출력 토큰 수 지수이동평균 계수
+_EMA_ALPHA = 0.2
+# 완료된 응답이 아직 없을 때 사용할 기대 출력 토큰 수
+_DEFAULT_EXPECTED_OUTPUT_TOKENS = 1500
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트 길이로 출력 토큰 수 추정"""
+    return int(len(text) / _CHARS_PER_TOKEN)
+
+
+class CancellationSavings:
+    """
+    조기 취소로 절약된 출력 토큰과 비용 추정기.
+
+    완료된 응답의 출력 토큰 수로 모델별 기대 출력 토큰 수(EMA)를 갱신하고,
+    취소된 스트림은 (기대 출력 토큰 - 이미 생성된 토큰)을 절약분으로 계산함.
+    """
+
+    def __init__(self) -> None:
+        self.expected_output_tokens: Dict[str, float] = {}
+        self.completed = 0
+        self.cancelled = 0
+        self.tokens_saved = 0
+        self.dollars_saved = 0.0
+
+    def record_completed(self, model: str, output_tokens: int) -> None:
+        self.completed += 1
+        previous = self.expected_output_tokens.get(model)
+        if previous is None:
+            self.expected_output_tokens[model] = float(output_tokens)
+        else:
+            self.expected_output_tokens[model] = (
+                previous + (output_tokens - previous) * _EMA_ALPHA
+            )
+
+    def record_cancelled(self, model: str, streamed_tokens: int) -> int:
+        """취소된 스트림의 절약 토큰 수를 누적하고 반환"""
+        self.cancelled += 1
+        expected = self.expected_output_tokens.get(
+            model, _DEFAULT_EXPECTED_OUTPUT_TOKENS
+        )
+        saved = max(0, int(expected) - streamed_tokens)
+        price = _OUTPUT_PRICE_PER_MTOK.get(model, _DEFAULT_OUTPUT_PRICE_PER_MTOK)
+        self.tokens_saved += saved
+        self.dollars_saved += saved * price / 1_000_000
+        logger.info(
+            f"연결 해제로 LLM 생성 조기 취소: model={model}, "
+            f"생성됨 {streamed_tokens} tokens, 절약 추정 {saved} tokens"
+        )
+        return saved
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "completed_streams": self.completed,
+            "cancelled_streams": self.cancelled,
+            "tokens_saved": self.tokens_saved,
+            "dollars_saved": round(self.dollars_saved, 4),
+            "expected_output_tokens": {
+                model: round(tokens) for model, tokens in self.expected_output_tokens.items()
+            },
+        }
+
+
+class CancellationScope:
+    """
+    소비자가 사라졌을 때 함께 취소할 작업 묶음.
+
+    register()로 등록한 작업과 add_callback()으로 등록한 콜백은
+    trigger() 호출 시 한 번에 취소/실행됨. 이미 트리거된 뒤 등록된 작업은 즉시 취소됨.
+    """
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+        self._event = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+        self._callbacks: List[Callable[[], Any]] = []
+
+    @property
+    def disconnected(self) -> bool:
+        """소비자(클라이언트)가 사라져 등록된 작업이 취소되었는지 여부"""
+        return self._event.is_set()
+
+    def register(self, task: asyncio.Task) -> asyncio.Task:
+        """트리거 시 취소할 작업 등록"""
+        if self.disconnected:
+            task.cancel()
+            return task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def add_callback(self, callback: Callable[[], Any]) -> None:
+        """트리거 시 실행할 콜백 등록"""
+        if self.disconnected:
+            callback()
+            return
+        self._callbacks.append(callback)
+
+    def trigger(self, reason: str = "클라이언트 연결 해제") -> None:
+        if self.disconnected:
+            return
+        self._event.set()
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        for callback in self._callbacks:
+            callback()
+        logger.info(
+            f"{reason}{f' ({self.label})' if self.label else ''}: "
+            f"진행 중인 작업 {len(pending)}개 취소"
+        )
+
+    async def wait(self) -> None:
+        await self._event.wait()
+
+
+class DisconnectWatcher(CancellationScope):
+    """
+    스트림 하나에 대한 연결 해제 감시기.
+
+    start()로 ASGI receive 대기 작업을 시작하고, `http.disconnect` 수신 시
+    trigger()로 등록된 작업을 즉시 취소함. stop()은 스트림 종료 시 반드시 호출해야 함.
+
+    receive 동시 대기에 대해:
+    - ASGI spec 2.4 미만 서버에서는 Starlette StreamingResponse도 자체
+      listen_for_disconnect 작업으로 같은 receive를 대기하므로 읽는 쪽이 둘이 됨
+    - 요청 본문은 스트림 시작 전에 엔드포인트가 모두 읽으므로, 이후 receive로 올 수 있는
+      메시지는 `http.disconnect`뿐이라 본문 메시지를 가로챌 일은 없음
+    - uvicorn(h11/httptools)은 연결이 끊기면 대기 중인 모든 receive 호출에 `http.disconnect`를
+      반환하므로 두 쪽 모두 해제를 받음
+    - 해제 메시지를 한쪽에만 전달하는 서버라도, Starlette 쪽이 받으면 응답 생성기가 취소되어
+      stop()이 호출되고 구독이 끝나므로 구독이 남지는 않음 (이 경우 감시기 콜백만 생략됨)
+    """
+
+    def __init__(self, receive: Receive, label: str = "") -> None:
+        super().__init__(label)
+        self._receive = receive
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def start(self) -> "DisconnectWatcher":
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+        return self
+
+    async def _watch(self) -> None:
+        try:
+            while True:
+                message = await self._receive()
+                if message.get("type") == "http.disconnect":
+                    break
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            # receive 채널이 더 이상 유효하지 않으면 연결이 끊긴 것으로 간주
+            logger.debug(f"receive 대기 중 오류, 연결 해제로 처리: {e}")
+        self.trigger("클라이언트 연결 해제 감지")
+
+    async def stop(self) -> None:
+        """감시 작업 종료 (등록된 작업은 건드리지 않음)"""
+        if self._watch_task and not self._watch_task.done():
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+        self._callbacks.clear()
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+cancellation_savings = CancellationSavings()
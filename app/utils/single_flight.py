@@ -0,0 +1,55 @@
+"""
+Single-flight 비동기 호출 중복 제거 유틸리티
+
+동일한 키로 동시에 들어온 비동기 호출을 하나의 실제 실행으로 합치고,
+나머지 호출자는 그 결과를 함께 기다리도록 함.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    키 단위 in-flight 작업 공유기.
+
+    - 첫 호출자(leader)만 실제 작업을 실행
+    - 작업이 끝나기 전에 들어온 동일 키 호출은 같은 결과를 공유
+    - 개별 호출자가 취소되어도 공유 작업은 shield로 보호되어 계속 진행
+    """
+
+    def __init__(self, name: str = "single_flight") -> None:
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """키에 대한 작업을 실행하거나, 진행 중인 작업의 결과를 기다림"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.shared += 1
+            logger.info(f"[{self.name}] 진행 중인 동일 작업에 합류: {str(key)[:16]}")
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """실행/공유 횟수와 현재 진행 중인 작업 수 반환"""
+        return {
+            "executions": self.executions,
+            "shared": self.shared,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,122 @@
+"""
+투기적(speculative) 동시 실행 단계
+
+서로 독립적인 전처리 작업들을 동시에 시작해 두고, 실제로 필요한 결과만 기다리며
+필요 없어진 작업은 취소함. 작업별 실행 구간을 기록하여 순차 실행 대비
+절약된 시간을 계산함.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeStage:
+    """
+    이름 붙은 비동기 작업 묶음.
+
+    - start(): 작업을 즉시 백그라운드로 시작
+    - get(): 해당 작업 결과를 기다림 (예외는 그대로 전파)
+    - cancel(): 더 이상 필요 없는 작업 취소
+    - report(): 작업별 소요 시간과 절약 시간 반환
+    """
+
+    def __init__(
+        self, register_task: Optional[Callable[[asyncio.Task], Any]] = None
+    ) -> None:
+        # 시작한 작업을 외부(예: 연결 해제 감시기)에 등록하기 위한 콜백
+        self._register_task = register_task
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # 작업별 (시작, 종료) 시각 (perf_counter 초)
+        self._intervals: Dict[str, Tuple[float, float]] = {}
+        self._cancelled: List[str] = []
+
+    async def _timed(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._intervals[name] = (started, time.perf_counter())
+
+    def start(self, name: str, awaitable: Awaitable[Any]) -> None:
+        """작업을 동시 실행으로 시작"""
+        task = asyncio.create_task(self._timed(name, awaitable))
+        self._tasks[name] = task
+        if self._register_task is not None:
+            self._register_task(task)
+
+    def bind(self, register_task: Callable[[asyncio.Task], Any]) -> None:
+        """
+        등록 콜백을 나중에 지정 (예: 스트림 생성 전에 시작한 작업을 스트림의 취소 범위에 연결).
+        이미 시작되어 아직 끝나지 않은 작업도 함께 등록함.
+        """
+        self._register_task = register_task
+        for task in self._tasks.values():
+            if not task.done():
+                register_task(task)
+
+    def has(self, name: str) -> bool:
+        return name in self._tasks and name not in self._cancelled
+
+    async def get(self, name: str) -> Any:
+        """작업 결과를 기다려 반환"""
+        return await self._tasks[name]
+
+    def cancel(self, name: str) -> None:
+        """필요 없어진 투기적 작업 취소"""
+        task = self._tasks.get(name)
+        if task is None or name in self._cancelled:
+            return
+        if not task.done():
+            task.cancel()
+            logger.info(f"불필요한 투기적 작업 취소: {name}")
+        elif not task.cancelled():
+            # 이미 끝난 작업의 예외는 조회해 두어 미처리 예외 경고를 방지
+            task.exception()
+        self._cancelled.append(name)
+
+    def cancel_all(self) -> None:
+        """아직 끝나지 않은 모든 작업 취소 (스트림 중단 시 정리용)"""
+        for name, task in self._tasks.items():
+            if not task.done():
+                self.cancel(name)
+            elif not task.cancelled():
+                task.exception()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        작업별 소요 시간과 절약 시간 보고.
+
+        취소되지 않고 끝난 작업만 대상으로 함.
+        - 순차 시간 = 작업별 소요 시간의 합
+        - 실행 시간 = 작업 실행 구간의 합집합 길이 (결과를 기다리지 않은 구간, 작업 사이의
+          다른 처리 시간은 포함하지 않음)
+        - 절약 시간 = 순차 시간 - 실행 시간 (작업이 실제로 겹친 시간만큼)
+        """
+        used = sorted(
+            (interval, name)
+            for name, interval in self._intervals.items()
+            if name not in self._cancelled
+        )
+        sequential = sum(end - start for (start, end), _ in used)
+        wall = 0.0
+        covered_until: Optional[float] = None
+        for (start, end), _ in used:
+            if covered_until is None or start > covered_until:
+                wall += end - start
+                covered_until = end
+            elif end > covered_until:
+                wall += end - covered_until
+                covered_until = end
+        return {
+            "wall_time_ms": round(wall * 1000, 1),
+            "sequential_time_ms": round(sequential * 1000, 1),
+            "time_saved_ms": round((sequential - wall) * 1000, 1),
+            "tasks_ms": {
+                name: round((end - start) * 1000, 1) for (start, end), name in used
+            },
+            "cancelled": list(self._cancelled),
+        }
@@ -0,0 +1,91 @@
+"""
+TTL 기반 LRU 캐시
+
+OrderedDict를 이용해 조회/삽입/축출을 모두 O(1)로 처리하는
+프로세스 내부용 경량 캐시. 스레드 안전하지 않으므로 단일 이벤트 루프에서 사용.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLLRUCache(Generic[K, V]):
+    """
+    최대 크기와 항목별 TTL을 갖는 LRU 캐시.
+
+    - 조회 시 만료된 항목은 즉시 제거
+    - 용량 초과 시 가장 오래 사용되지 않은 항목 하나만 축출
+    - ttl_seconds가 None이면 만료 없이 LRU로만 동작
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, count=False) is not None
+
+    def get(self, key: K, count: bool = True) -> Optional[V]:
+        """키에 해당하는 값을 반환하고 최근 사용 항목으로 갱신"""
+        entry = self._data.get(key)
+        if entry is None:
+            if count:
+                self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at and expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            if count:
+                self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """값을 저장하고, 용량 초과 시 가장 오래된 항목을 축출"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (expires_at, value)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """항목을 제거하고 값을 반환"""
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """크기와 히트/미스/축출 카운터 반환"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,227 @@
+"""
+쿼리 임베딩 2단계 캐시
+
+키: (모델명, 입력 유형, 텍스트의 SHA-256)
+- 입력 유형(query/document)에 따라 voyage 임베딩 값이 달라지므로 키에 포함함
+- query: intent_cache와 같은 정규화(NFKC, 소문자, 공백 축약) 후 해시하여 표기만 다른 질문도 적중
+- document: 정규화하면 다르게 임베딩되는 텍스트가 합쳐지므로 원문 그대로 해시
+1단계: 프로세스 내부 TTL LRU 캐시
+2단계: Redis (모든 uvicorn 워커가 공유, TTL 적용)
+
+벡터는 float16 바이트(1024차원 기준 2KB)로 저장함. voyage 임베딩은 정규화된 벡터라
+float16 반올림 오차가 코사인 유사도에 주는 영향은 1e-3 수준임.
+
+`CachedEmbeddings`는 LangChain Embeddings 인터페이스를 그대로 구현하므로
+PGVectorStore, 시맨틱 답변 캐시 등 기존 임베딩 사용처를 감싸기만 하면 됨.
+"""
+
+import hashlib
+import logging
+import struct
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_binary_redis
+from app.services.intent_cache import make_cache_key
+from app.utils.disconnect_watcher import estimate_tokens
+from app.utils.single_flight import SingleFlight
+from app.utils.ttl_lru_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+# Redis 장애 시 재시도까지 대기하는 시간 (초)
+_REDIS_RETRY_AFTER_SECONDS = 30.0
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    """float 벡터를 little-endian float16 바이트로 변환"""
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def unpack_vector(raw: bytes) -> List[float]:
+    return list(struct.unpack(f"<{len(raw) // 2}e", raw))
+
+
+class EmbeddingCache:
+    """임베딩 벡터를 프로세스 내부 LRU와 Redis에 저장하는 2단계 캐시"""
+
+    def __init__(self) -> None:
+        self.ttl_seconds = settings.EMBEDDING_CACHE_TTL_SECONDS
+        self.local: TTLLRUCache[str, bytes] = TTLLRUCache(
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.ttl_seconds,
+        )
+        self.redis_enabled = settings.EMBEDDING_CACHE_REDIS_ENABLED
+        self._redis_disabled_until = 0.0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        self.provider_calls = 0
+        self.provider_texts = 0
+        self.saved_tokens = 0
+
+    @staticmethod
+    def key(model: str, input_type: str, text: str) -> str:
+        if input_type == "query":
+            digest = make_cache_key(text)
+        else:
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{input_type}:{digest}"
+
+    def _redis_key(self, key: str) -> str:
+        return f"{settings.EMBEDDING_CACHE_KEY_PREFIX}{key}"
+
+    def _redis_available(self) -> bool:
+        return self.redis_enabled and time.monotonic() >= self._redis_disabled_until
+
+    def _mark_redis_failure(self, error: Exception) -> None:
+        self.redis_errors += 1
+        self._redis_disabled_until = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+        logger.warning(
+            f"임베딩 Redis 캐시 사용 불가, {_REDIS_RETRY_AFTER_SECONDS:.0f}초 동안 로컬 캐시만 사용: {error}"
+        )
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """로컬 캐시 → Redis(MGET) 순으로 조회. Redis 히트는 로컬 캐시에 다시 적재"""
+        found: Dict[str, List[float]] = {}
+        remote: List[str] = []
+        for key in keys:
+            raw = self.local.get(key)
+            if raw is not None:
+                found[key] = unpack_vector(raw)
+            elif key not in remote:
+                remote.append(key)
+        if not remote or not self._redis_available():
+            return found
+        try:
+            values = await get_binary_redis().mget(
+                [self._redis_key(key) for key in remote]
+            )
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+            return found
+        for key, raw in zip(remote, values):
+            if raw is None:
+                self.redis_misses += 1
+                continue
+            self.redis_hits += 1
+            self.local.set(key, raw)
+            found[key] = unpack_vector(raw)
+        return found
+
+    async def set_many(self, vectors: Dict[str, Sequence[float]]) -> None:
+        """로컬 캐시와 Redis에 TTL과 함께 저장"""
+        packed = {key: pack_vector(vector) for key, vector in vectors.items()}
+        for key, raw in packed.items():
+            self.local.set(key, raw)
+        if not packed or not self._redis_available():
+            return
+        try:
+            async with get_binary_redis().pipeline(transaction=False) as pipe:
+                for key, raw in packed.items():
+                    pipe.set(self._redis_key(key), raw, ex=self.ttl_seconds)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            self._mark_redis_failure(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """계층별 히트/미스와 임베딩 API 호출/절약 추정치 반환"""
+        return {
+            "enabled": settings.EMBEDDING_CACHE_ENABLED,
+            "local": self.local.stats(),
+            "redis": {
+                "enabled": self.redis_enabled,
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+            },
+            "provider_calls": self.provider_calls,
+            "provider_texts": self.provider_texts,
+            "saved_tokens_estimate": self.saved_tokens,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+embedding_cache = EmbeddingCache()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 클라이언트 앞에 EmbeddingCache를 두는 래퍼.
+
+    - 비동기 경로(aembed_query/aembed_documents)만 캐시를 사용함
+    - 캐시에 없는 텍스트만 한 번의 배치 호출로 임베딩하고, 동일 텍스트 동시 미스는
+      single-flight로 한 번만 호출함
+    - 동기 경로는 원래 클라이언트로 그대로 위임
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        cache: Optional[EmbeddingCache] = None,
+    ) -> None:
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = cache or embedding_cache
+        self._single_flight: SingleFlight[List[List[float]]] = SingleFlight(
+            name=f"embedding:{model}"
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def _embed_missing(
+        self, texts: List[str], keys: List[str], as_query: bool
+    ) -> List[List[float]]:
+        self.cache.provider_calls += 1
+        self.cache.provider_texts += len(texts)
+        if as_query:
+            vectors = [await self.embeddings.aembed_query(texts[0])]
+        else:
+            vectors = await self.embeddings.aembed_documents(texts)
+        await self.cache.set_many(dict(zip(keys, vectors)))
+        return vectors
+
+    async def _aembed(self, texts: List[str], as_query: bool) -> List[List[float]]:
+        if not settings.EMBEDDING_CACHE_ENABLED:
+            if as_query:
+                return [await self.embeddings.aembed_query(texts[0])]
+            return await self.embeddings.aembed_documents(texts)
+
+        input_type = "query" if as_query else "document"
+        keys = [EmbeddingCache.key(self.model, input_type, text) for text in texts]
+        found = await self.cache.get_many(keys)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found:
+                self.cache.saved_tokens += estimate_tokens(text)
+            elif key not in missing:
+                missing[key] = text
+        if missing:
+            missing_keys = list(missing)
+            flight_key = (as_query, tuple(missing_keys))
+            vectors = await self._single_flight.do(
+                flight_key,
+                lambda: self._embed_missing(
+                    list(missing.values()), missing_keys, as_query
+                ),
+            )
+            found.update(zip(missing_keys, vectors))
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self._aembed([text], as_query=True))[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return await self._aembed(list(texts), as_query=False)
@@ -0,0 +1,36 @@
+"""
+공유 Voyage AI 임베딩 클라이언트
+
+hscode_vectors, semantic_answer_cache와 같은 1024차원 voyage-3-large 모델을 사용하는
+모든 경로가 하나의 클라이언트를 공유함. 첫 사용 또는 lifespan 워밍업 시 생성됨.
+비동기 임베딩 호출은 EmbeddingCache(로컬 LRU + Redis)를 거치므로 같은 텍스트는
+모델 호출 없이 재사용됨.
+"""
+
+from langchain_voyageai import VoyageAIEmbeddings
+from pydantic import SecretStr
+
+from app.core.config import settings
+from app.core.resources import resources
+from app.vector_stores.embedding_cache import CachedEmbeddings
+
+EMBEDDING_MODEL = "voyage-3-large"
+
+
+def _build_voyage_embeddings() -> CachedEmbeddings:
+    return CachedEmbeddings(
+        VoyageAIEmbeddings(
+            model=EMBEDDING_MODEL,
+            batch_size=32,
+            api_key=SecretStr(settings.VOYAGE_API_KEY),
+        ),
+        model=EMBEDDING_MODEL,
+    )
+
+
+voyage_embeddings = resources.register("voyage_embeddings", _build_voyage_embeddings)
+
+
+async def get_embeddings() -> CachedEmbeddings:
+    """공유 임베딩 클라이언트(캐시 적용) 반환 (없으면 생성)"""
+    return await voyage_embeddings.aget()
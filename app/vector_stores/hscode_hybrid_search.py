@@ -0,0 +1,308 @@
+"""
+HSCode 하이브리드 검색 (어휘 + 벡터, Reciprocal Rank Fusion)
+
+정확한 코드("8471.30")나 드문 품목명이 들어간 질문은 벡터 유사도 검색만으로는 순위가 낮게
+나오는 경우가 많으므로, 어휘 검색과 벡터 검색을 동시에 실행하고 순위를 RRF로 결합함.
+
+- 어휘 검색: 코드 앞자리 일치, search_tsv 전문 검색(접두 일치), keywords 배열 일치,
+  product_name 트라이그램 단어 유사도 (add_hscode_hybrid_search_migration.sql의 인덱스 사용)
+- 벡터 검색: 기존 HSCodeVectorSearch (hscode_vectors.embedding)
+- 결합: score = Σ 1 / (HSCODE_HYBRID_RRF_K + rank). 점수 척도가 다른 두 검색을 정규화 없이 합칠 수 있음
+- 두 검색은 같은 벡터 검색 전용 연결 풀을 사용하며, 한쪽이 실패하거나 타임아웃되면
+  나머지 결과만으로 순위를 만듦
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.vector_stores.hscode_retriever import (
+    HSCODE_METADATA_COLUMNS,
+    collection_name,
+    hscode_vector_search,
+    vector_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+# HS 코드: 구분자가 있는 6~10자리(8471.30, 8471.30-1000, 847130.1000) 또는 구분자 없는 6/8/10자리.
+# 연도·가격과 구분되지 않는 구분자 없는 4자리는 제외하고, 앞뒤로 숫자/소수점/천 단위 쉼표/
+# 통화 기호가 붙었거나 년·원·달러·% 등의 단위가 뒤따르는 숫자는 코드로 보지 않음
+_HSCODE_PATTERN = re.compile(
+    r"(?<![\d.,$₩])"
+    # 원자 그룹: 단위 등으로 거부된 숫자열의 앞부분만 다시 코드로 매칭하지 않도록 함
+    r"(?>\d{4}[.\-]\d{2}(?:[.\-]?\d{2}){0,2}"
+    r"|\d{6}[.\-]\d{2}(?:\d{2})?"
+    r"|\d{6}(?:\d{2}){0,2})"
+    r"(?![\d,]|\.\d)"
+    r"(?!\s?(?:년|원(?!산)|달러|%|퍼센트|만|억))"
+)
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+# 품목명에 붙어 나오는 흔한 조사 (긴 것부터 제거)
+_PARTICLES = (
+    "으로",
+    "에서",
+    "이랑",
+    "은",
+    "는",
+    "이",
+    "가",
+    "을",
+    "를",
+    "의",
+    "에",
+    "로",
+    "와",
+    "과",
+    "도",
+)
+_STOPWORDS = {
+    "hs",
+    "hscode",
+    "코드",
+    "hs코드",
+    "품목분류",
+    "분류",
+    "세번",
+    "알려줘",
+    "알려주세요",
+    "뭐야",
+    "무엇인가요",
+    "어떻게",
+    "관련",
+    "수출",
+    "수입",
+}
+_MAX_TERMS = 8
+
+_METADATA_SELECT = ", ".join(f"v.{column}" for column in HSCODE_METADATA_COLUMNS)
+_HSCODE_DIGITS = "regexp_replace(v.hscode, '[^0-9]', '', 'g')"
+
+_LEXICAL_SQL = text(
+    f"""
+    WITH q AS (
+        SELECT
+            to_tsquery('simple', CAST(:tsquery AS text)) AS tsq,
+            CAST(:terms AS text[]) AS terms,
+            CAST(:phrase AS text) AS phrase,
+            CAST(:codes AS text[]) AS codes,
+            CAST(:code_patterns AS text[]) AS code_patterns
+    )
+    SELECT
+        v.id, v.description, {_METADATA_SELECT},
+        (
+            CASE
+                WHEN {_HSCODE_DIGITS} = ANY(q.codes) THEN 2.0
+                WHEN {_HSCODE_DIGITS} LIKE ANY(q.code_patterns) THEN 1.0
+                ELSE 0.0
+            END
+            + ts_rank_cd(v.search_tsv, q.tsq)
+            + CASE WHEN v.keywords && q.terms THEN 0.5 ELSE 0.0 END
+            + word_similarity(q.phrase, v.product_name)
+        ) AS score
+    FROM {collection_name} v, q
+    WHERE {_HSCODE_DIGITS} LIKE ANY(q.code_patterns)
+        OR v.search_tsv @@ q.tsq
+        OR v.keywords && q.terms
+        OR q.phrase <% v.product_name
+    ORDER BY score DESC, v.hscode
+    LIMIT :k
+    """
+)
+
+
+def extract_hscodes(query: str) -> List[str]:
+    """질문에 포함된 HS 코드를 구분자 없는 숫자열로 추출"""
+    codes: List[str] = []
+    for match in _HSCODE_PATTERN.findall(query):
+        digits = re.sub(r"\D", "", match)
+        if digits not in codes:
+            codes.append(digits)
+    return codes
+
+
+def lexical_terms(query: str) -> List[str]:
+    """어휘 검색어 추출 (조사/불용어 제거, 코드 제외, 최대 _MAX_TERMS개)"""
+    terms: List[str] = []
+    for token in _TOKEN_PATTERN.findall(_HSCODE_PATTERN.sub(" ", query.lower())):
+        for particle in _PARTICLES:
+            if len(token) > len(particle) + 1 and token.endswith(particle):
+                token = token[: -len(particle)]
+                break
+        if len(token) < 2 or token in _STOPWORDS or token in terms:
+            continue
+        terms.append(token)
+    return terms[:_MAX_TERMS]
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, Sequence[Document]], k: int
+) -> List[Tuple[Document, float, Dict[str, int]]]:
+    """
+    검색 방식별 순위 목록을 RRF로 결합.
+    같은 문서는 hscode(없으면 id)로 식별하며, (문서, 점수, {방식: 순위}) 목록을 점수 내림차순으로 반환.
+    """
+    fused: Dict[str, Tuple[Document, float, Dict[str, int]]] = {}
+    for source, documents in rankings.items():
+        for rank, doc in enumerate(documents, start=1):
+            key = str(doc.metadata.get("hscode") or doc.id)
+            first, score, ranks = fused.get(key, (doc, 0.0, {}))
+            ranks.setdefault(source, rank)
+            fused[key] = (first, score + 1.0 / (k + rank), ranks)
+    return sorted(fused.values(), key=lambda item: item[1], reverse=True)
+
+
+class HSCodeHybridSearch:
+    """어휘 검색과 벡터 검색을 동시에 실행하고 RRF로 결합"""
+
+    def __init__(self) -> None:
+        self.searches = 0
+        self.lexical_searches = 0
+        self.lexical_timeouts = 0
+        self.lexical_errors = 0
+        # 최종 결과 중 벡터 검색 후보에는 없고 어휘 검색으로만 찾은 문서 수
+        self.lexical_only_results = 0
+        self._lexical_ms_total = 0.0
+        self._search_ms_total = 0.0
+
+    async def lexical_search(self, query: str, k: int) -> List[Document]:
+        """
+        코드/전문 검색/키워드/트라이그램 점수 순 상위 k개.
+        검색어가 없거나 타임아웃/오류가 나면 빈 목록을 반환함.
+        """
+        codes = extract_hscodes(query)
+        terms = lexical_terms(query)
+        if not codes and not terms:
+            return []
+        params = {
+            "tsquery": " | ".join(f"{term}:*" for term in terms),
+            "terms": terms,
+            "phrase": " ".join(terms),
+            "codes": codes,
+            "code_patterns": [f"{code}%" for code in codes],
+            "k": k,
+        }
+        started = time.perf_counter()
+        self.lexical_searches += 1
+        try:
+            engine = await vector_engine.aget()
+
+            async def run() -> List[Any]:
+                async with engine.connect() as conn:
+                    return (await conn.execute(_LEXICAL_SQL, params)).mappings().all()
+
+            rows = await asyncio.wait_for(
+                run(), timeout=settings.VECTOR_SEARCH_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            self.lexical_timeouts += 1
+            logger.warning("HSCode 어휘 검색 타임아웃, 벡터 검색 결과만 사용")
+            return []
+        except Exception as e:
+            self.lexical_errors += 1
+            logger.error(f"HSCode 어휘 검색 실패, 벡터 검색 결과만 사용: {e}")
+            return []
+        finally:
+            self._lexical_ms_total += (time.perf_counter() - started) * 1000
+
+        return [
+            Document(
+                id=str(row["id"]),
+                page_content=row["description"],
+                metadata={
+                    **{column: row[column] for column in HSCODE_METADATA_COLUMNS},
+                    "lexical_score": float(row["score"]),
+                },
+            )
+            for row in rows
+        ]
+
+    async def search(
+        self, query: str, k: int = 5, candidates: Optional[int] = None
+    ) -> List[Document]:
+        """
+        어휘/벡터 검색을 동시에 실행하여 RRF 상위 k개를 반환.
+        각 문서 metadata에 rrf_score, lexical_rank, vector_rank(없으면 None)를 추가함.
+        """
+        candidates = max(k, candidates or settings.HSCODE_HYBRID_CANDIDATES)
+        started = time.perf_counter()
+        try:
+            lexical, vector = await asyncio.gather(
+                self.lexical_search(query, candidates),
+                hscode_vector_search.search(query, k=candidates),
+            )
+        finally:
+            self.searches += 1
+            self._search_ms_total += (time.perf_counter() - started) * 1000
+
+        fused = reciprocal_rank_fusion(
+            {"lexical": lexical, "vector": vector}, k=settings.HSCODE_HYBRID_RRF_K
+        )
+        results: List[Document] = []
+        for doc, score, ranks in fused[:k]:
+            doc.metadata.update(
+                rrf_score=round(score, 6),
+                lexical_rank=ranks.get("lexical"),
+                vector_rank=ranks.get("vector"),
+            )
+            if "vector" not in ranks:
+                self.lexical_only_results += 1
+            results.append(doc)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "searches": self.searches,
+            "lexical_searches": self.lexical_searches,
+            "lexical_timeouts": self.lexical_timeouts,
+            "lexical_errors": self.lexical_errors,
+            "lexical_only_results": self.lexical_only_results,
+            "avg_lexical_ms": (
+                round(self._lexical_ms_total / self.lexical_searches, 1)
+                if self.lexical_searches
+                else 0.0
+            ),
+            "avg_search_ms": (
+                round(self._search_ms_total / self.searches, 1)
+                if self.searches
+                else 0.0
+            ),
+            "candidates": settings.HSCODE_HYBRID_CANDIDATES,
+            "rrf_k": settings.HSCODE_HYBRID_RRF_K,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+hscode_hybrid_search = HSCodeHybridSearch()
+
+
+class HybridHSCodeRetriever(BaseRetriever):
+    """
+    HSCodeHybridSearch를 사용하는 비동기 전용 Retriever.
+    동기 invoke는 이벤트 루프를 막으므로 지원하지 않음 (ainvoke 사용).
+    """
+
+    k: int = 5
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return await hscode_hybrid_search.search(query, k=self.k)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        raise NotImplementedError(
+            "HybridHSCodeRetriever는 비동기 전용입니다. ainvoke를 사용하세요."
+        )
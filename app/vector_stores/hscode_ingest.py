@@ -0,0 +1,371 @@
+"""
+hscode_vectors 일괄 임베딩 적재
+
+CSV 또는 JSONL 형식의 HS 품목 목록을 스트리밍으로 읽어 batch_size 단위로 임베딩하고,
+hscode 유니크 컬럼 기준 다중 행 upsert(`crud.hscode_vector.upsert_many`)로 저장함.
+HS 품목표 전체를 처음 적재하거나 임베딩 모델 변경 후 다시 임베딩할 때 사용함.
+
+- 동시에 처리하는 배치 수를 세마포어(HSCODE_INGEST_CONCURRENCY)로 제한하므로
+  파일 크기와 관계없이 메모리에는 최대 그만큼의 배치만 올라감
+- 배치별 임베딩 호출과 저장은 각각 지수 백오프로 재시도 (HSCODE_INGEST_MAX_RETRIES)
+- 체크포인트 파일에는 앞에서부터 연속으로 저장이 끝난 레코드 위치만 기록하므로,
+  중단 후 다시 실행하면 그 위치부터 이어서 적재함 (재처리되는 배치는 upsert라 안전함)
+- 진행 상황과 최종 결과에 초당 처리 행 수를 보고함
+
+입력 필드: hscode, product_name(또는 name), description, keywords, classification_basis.
+CSV의 keywords는 `|` 또는 `;`로 구분하며, 나머지 필드는 metadata에 저장됨.
+
+사용법:
+    python -m app.vector_stores.hscode_ingest hs_nomenclature.csv
+    python -m app.vector_stores.hscode_ingest hs_nomenclature.jsonl --batch-size 64 --concurrency 8
+    python -m app.vector_stores.hscode_ingest hs_nomenclature.csv --dry-run
+    python -m app.vector_stores.hscode_ingest hs_nomenclature.csv --restart
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from langchain_core.embeddings import Embeddings
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.db import crud
+from app.models.schemas import HscodeVectorCreate
+from app.vector_stores.embeddings import get_embeddings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_KNOWN_FIELDS = {
+    "hscode",
+    "product_name",
+    "name",
+    "description",
+    "keywords",
+    "classification_basis",
+}
+_KEYWORD_SEPARATOR = re.compile(r"[|;]")
+
+
+def parse_record(record: Dict[str, Any]) -> HscodeVectorCreate:
+    """CSV/JSONL 레코드 하나를 적재 스키마로 변환 (형식 오류 시 ValidationError)"""
+    keywords = record.get("keywords") or []
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in _KEYWORD_SEPARATOR.split(keywords)]
+    metadata = {
+        key: value
+        for key, value in record.items()
+        if key not in _KNOWN_FIELDS and value not in (None, "")
+    }
+    return HscodeVectorCreate(
+        hscode=str(record.get("hscode") or "").strip(),
+        product_name=(record.get("product_name") or record.get("name") or "").strip(),
+        description=(record.get("description") or "").strip(),
+        keywords=[k for k in keywords if k],
+        classification_basis=record.get("classification_basis") or None,
+        metadata=metadata,
+    )
+
+
+def embedding_text(entry: HscodeVectorCreate) -> str:
+    """임베딩할 텍스트 (품목명 + 설명)"""
+    if entry.product_name and entry.product_name not in entry.description:
+        return f"{entry.product_name}\n{entry.description}"
+    return entry.description
+
+
+def read_records(path: Path, fmt: str) -> Iterator[Dict[str, Any]]:
+    """파일을 한 레코드씩 읽음 (빈 줄/깨진 JSON은 빈 dict로 반환해 위치를 유지)"""
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = {}
+            yield record if isinstance(record, dict) else {}
+
+
+@dataclass
+class IngestResult:
+    """일괄 적재 결과"""
+
+    source: str
+    start_record: int
+    next_record: int
+    rows_read: int = 0
+    rows_invalid: int = 0
+    rows_written: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    dry_run: bool = False
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        rows = self.rows_read if self.dry_run else self.rows_written
+        return rows / self.elapsed_seconds
+
+
+class HSCodeIngester:
+    """HS 품목 파일을 배치 단위로 임베딩하여 hscode_vectors에 upsert"""
+
+    def __init__(
+        self,
+        source: Path,
+        fmt: Optional[str] = None,
+        checkpoint_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ) -> None:
+        self.source = Path(source)
+        self.fmt = fmt or ("csv" if self.source.suffix.lower() == ".csv" else "jsonl")
+        if self.fmt not in ("csv", "jsonl"):
+            raise ValueError(f"지원하지 않는 입력 형식: {self.fmt}")
+        self.checkpoint_path = Path(
+            checkpoint_path or f"{self.source}.checkpoint.json"
+        )
+        self.batch_size = batch_size or settings.HSCODE_INGEST_BATCH_SIZE
+        self.concurrency = concurrency or settings.HSCODE_INGEST_CONCURRENCY
+        self.max_retries = max_retries or settings.HSCODE_INGEST_MAX_RETRIES
+
+    # --- 체크포인트 ---
+
+    def load_checkpoint(self) -> int:
+        """이어서 적재할 레코드 위치 반환. 원본 파일이 바뀌었으면 ValueError"""
+        if not self.checkpoint_path.exists():
+            return 0
+        data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        if data.get("source_size") != self.source.stat().st_size:
+            raise ValueError(
+                f"체크포인트 이후 원본 파일이 변경됨: {self.source} "
+                f"(--restart로 처음부터 다시 적재)"
+            )
+        return int(data["next_record"])
+
+    def save_checkpoint(self, next_record: int) -> None:
+        """임시 파일에 쓴 뒤 교체하여 중단 시에도 체크포인트가 깨지지 않게 함"""
+        data = {
+            "source": str(self.source),
+            "source_size": self.source.stat().st_size,
+            "next_record": next_record,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # --- 적재 ---
+
+    def batches(
+        self, start: int, result: IngestResult
+    ) -> Iterator[Tuple[int, int, List[HscodeVectorCreate]]]:
+        """start 위치부터 (시작 위치, 끝 위치, 유효 항목) 배치를 생성"""
+        entries: List[HscodeVectorCreate] = []
+        batch_start = end = start
+        for position, record in enumerate(read_records(self.source, self.fmt)):
+            if position < start:
+                continue
+            end = position + 1
+            result.rows_read += 1
+            try:
+                entries.append(parse_record(record))
+            except ValidationError as e:
+                result.rows_invalid += 1
+                logger.warning(
+                    f"레코드 {position} 건너뜀 (형식 오류): {e.errors()[0]['msg']}"
+                )
+            if end - batch_start >= self.batch_size:
+                yield batch_start, end, entries
+                entries, batch_start = [], end
+        if end > batch_start:
+            yield batch_start, end, entries
+
+    async def _with_retry(self, label: str, fn: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = 2**attempt
+                logger.warning(
+                    f"{label} 실패 ({attempt}/{self.max_retries}), {delay}초 후 재시도: {e}"
+                )
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _write_batch(
+        self, embeddings: Embeddings, entries: List[HscodeVectorCreate], label: str
+    ) -> int:
+        from app.db.session import SessionLocal
+
+        if not entries:
+            return 0
+        texts = [embedding_text(entry) for entry in entries]
+        vectors = await self._with_retry(
+            f"{label} 임베딩", lambda: embeddings.aembed_documents(texts)
+        )
+
+        async def upsert() -> int:
+            async with SessionLocal() as db:
+                written = await crud.hscode_vector.upsert_many(db, entries, vectors)
+                await db.commit()
+                return written
+
+        return await self._with_retry(f"{label} 저장", upsert)
+
+    async def run(self, restart: bool = False, dry_run: bool = False) -> IngestResult:
+        start = 0 if restart else self.load_checkpoint()
+        result = IngestResult(
+            source=str(self.source),
+            start_record=start,
+            next_record=start,
+            dry_run=dry_run,
+        )
+        started = time.perf_counter()
+        if start:
+            logger.info(f"체크포인트에서 이어서 적재: 레코드 {start:,}부터")
+
+        if dry_run:
+            for _, batch_end, _ in self.batches(start, result):
+                result.batches += 1
+                result.next_record = batch_end
+            result.elapsed_seconds = time.perf_counter() - started
+            return result
+
+        # 캐시된 공유 클라이언트 대신 원래 클라이언트를 사용하여
+        # 일회성 품목 텍스트가 쿼리 임베딩 캐시(LRU/Redis)를 밀어내지 않게 함
+        shared = await get_embeddings()
+        embeddings: Embeddings = getattr(shared, "embeddings", shared)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending: set = set()
+        # 완료됐지만 앞 배치가 아직 끝나지 않아 체크포인트에 반영하지 못한 배치
+        finished: Dict[int, int] = {}
+        failures: List[BaseException] = []
+
+        def advance() -> None:
+            moved = False
+            while result.next_record in finished:
+                result.next_record = finished.pop(result.next_record)
+                moved = True
+            if moved:
+                self.save_checkpoint(result.next_record)
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"{result.rows_written:,}행 저장 (레코드 {result.next_record:,}), "
+                    f"{result.rows_written / elapsed:,.1f} rows/s"
+                )
+
+        async def process(
+            batch_start: int, batch_end: int, entries: List[HscodeVectorCreate]
+        ) -> None:
+            try:
+                result.rows_written += await self._write_batch(
+                    embeddings, entries, f"레코드 {batch_start}-{batch_end}"
+                )
+                result.batches += 1
+                finished[batch_start] = batch_end
+                advance()
+            except Exception as e:
+                failures.append(e)
+                logger.error(
+                    f"레코드 {batch_start}-{batch_end} 적재 실패, 새 배치 중단: {e}"
+                )
+            finally:
+                semaphore.release()
+
+        try:
+            for batch_start, batch_end, entries in self.batches(start, result):
+                await semaphore.acquire()
+                if failures:
+                    semaphore.release()
+                    break
+                task = asyncio.create_task(process(batch_start, batch_end, entries))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            result.elapsed_seconds = time.perf_counter() - started
+
+        if failures:
+            result.error = str(failures[0])
+        elif self.checkpoint_path.exists():
+            # 끝까지 적재했으면 다음 실행이 처음부터 시작하도록 체크포인트 삭제
+            self.checkpoint_path.unlink()
+        return result
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from app.db.session import engine
+
+    ingester = HSCodeIngester(
+        source=args.source,
+        fmt=args.format,
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+    try:
+        result = await ingester.run(restart=args.restart, dry_run=args.dry_run)
+    finally:
+        await engine.dispose()
+
+    prefix = "[dry-run] " if result.dry_run else ""
+    print(
+        f"{prefix}레코드 {result.start_record:,} → {result.next_record:,}: "
+        f"읽음 {result.rows_read:,}, 형식 오류 {result.rows_invalid:,}, "
+        f"저장 {result.rows_written:,}, 배치 {result.batches:,}"
+    )
+    print(
+        f"{prefix}{result.elapsed_seconds:,.1f}s, {result.rows_per_second:,.1f} rows/s"
+    )
+    if result.error:
+        print(f"적재 중단 (체크포인트: {ingester.checkpoint_path}): {result.error}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="hscode_vectors 일괄 임베딩 적재")
+    parser.add_argument("source", type=Path, help="CSV 또는 JSONL 파일")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument(
+        "--checkpoint", type=Path, default=None, help="기본값: <source>.checkpoint.json"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="체크포인트를 무시하고 처음부터 적재"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="파일 검증만 하고 임베딩/저장하지 않음"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
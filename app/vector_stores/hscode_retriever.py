@@ -1,59 +1,189 @@
-from langchain_core.vectorstores import VectorStoreRetriever
-from langchain_postgres import PGVectorStore, PGEngine
+"""
+HSCode 벡터 검색 (pgvector, asyncpg)
+
+이벤트 루프를 막지 않도록 asyncpg 엔진 위에서 PGVectorStore를 비동기로 생성하고 조회함.
+
+- 채팅/CRUD용 세션 풀과 분리된 전용 연결 풀 (VECTOR_DB_POOL_SIZE/VECTOR_DB_MAX_OVERFLOW)
+  → 벡터 검색이 몰려도 채팅 저장/조회 연결을 고갈시키지 않음
+- 쿼리별 타임아웃 (VECTOR_SEARCH_TIMEOUT_SECONDS): 임베딩 호출과 DB 검색을 합친 시간 기준이며,
+  서버 측에도 statement_timeout을 걸어 취소된 검색이 DB에 남지 않게 함
+- 타임아웃/오류 시 빈 결과를 반환하여 호출 측이 웹 검색 폴백으로 진행하도록 함
+- 엔진, 임베딩 클라이언트, PGVectorStore는 공유 자원 컨테이너(app.core.resources)에
+  등록되어 첫 검색 또는 lifespan 워밍업 시점에 생성되므로 import 시 비용과 DB 연결이 없음
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_postgres import PGEngine, PGVectorStore
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from app.core.config import settings
+from app.core.resources import resources
+from app.db.telemetry import TimedAsyncAdaptedQueuePool, db_telemetry
+from app.vector_stores.embeddings import get_embeddings
 
-# PGVector 스토어 설정
-# 1. langchain-postgres의 PGVectorStore는 SQLAlchemy의 연결 엔진을 사용
-connection_string = settings.SYNC_DATABASE_URL
-# 2. 연결 문자열로부터 PGEngine 인스턴스 생성
-engine = PGEngine.from_connection_string(url=connection_string)
+logger = logging.getLogger(__name__)
 
 collection_name = "hscode_vectors"  # 실제로는 테이블 이름을 의미
 
-# 하드코딩된 임베딩 모델
-from langchain_voyageai import VoyageAIEmbeddings
-from pydantic import SecretStr
+HSCODE_METADATA_COLUMNS = [
+    "hscode",
+    "product_name",
+    "classification_basis",
+    "similar_hscodes",
+    "keywords",
+    "web_search_context",
+    "hscode_differences",
+    "confidence_score",
+    "verified",
+]
 
-embeddings = VoyageAIEmbeddings(
-    model="voyage-3-large",
-    batch_size=32,
-    api_key=SecretStr(settings.VOYAGE_API_KEY),
-)
+
+def _build_vector_engine() -> AsyncEngine:
+    """벡터 검색 전용 asyncpg 엔진 (세션 풀과 분리)"""
+    engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=settings.VECTOR_DB_POOL_SIZE,
+        max_overflow=settings.VECTOR_DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(
+                    int(settings.VECTOR_SEARCH_TIMEOUT_SECONDS * 1000)
+                ),
+            },
+        },
+    )
+    db_telemetry.instrument(engine, name="vector")
+    return engine
 
 
-# 새로운 PGVectorStore 인스턴스 생성.
-# __init__으로 직접 생성하는 대신 create_sync 팩토리 메서드를 사용.
-store = PGVectorStore.create_sync(
-    engine=engine,
-    embedding_service=embeddings,
-    table_name=collection_name,
-    id_column="id",  # 실제 테이블의 PK 컬럼 이름 명시
-    # content_column, metadata_columns 등을 명시하여 커스텀 테이블에 연결
-    content_column="description",
-    embedding_column="embedding",
-    metadata_columns=[
-        "hscode",
-        "product_name",
-        "classification_basis",
-        "similar_hscodes",
-        "keywords",
-        "web_search_context",
-        "hscode_differences",
-        "confidence_score",
-        "verified",
-    ],
-    # PGVectorStore.create_sync 에는 use_jsonb 인자가 없음.
-    # metadata_json_column을 지정하는 방식으로 대체되거나,
-    # 기본적으로 JSONB를 사용하도록 설계되었을 가능성이 높음. (스키마 확인 완료)
+async def _dispose_vector_engine(engine: AsyncEngine) -> None:
+    await engine.dispose()
+
+
+async def _build_hscode_vector_store() -> PGVectorStore:
+    """PGVectorStore 생성 (테이블 컬럼 검증을 위해 DB 조회가 필요함)"""
+    return await PGVectorStore.create(
+        engine=PGEngine.from_engine(await vector_engine.aget()),
+        embedding_service=await get_embeddings(),
+        table_name=collection_name,
+        id_column="id",  # 실제 테이블의 PK 컬럼 이름 명시
+        # 커스텀 테이블에 연결하기 위해 컬럼을 명시
+        content_column="description",
+        embedding_column="embedding",
+        metadata_columns=HSCODE_METADATA_COLUMNS,
+    )
+
+
+vector_engine = resources.register(
+    "vector_engine", _build_vector_engine, closer=_dispose_vector_engine
 )
+hscode_vector_store = resources.register(
+    "hscode_vector_store", _build_hscode_vector_store
+)
+
+
+class HSCodeVectorSearch:
+    """hscode_vectors 테이블 비동기 유사도 검색"""
 
+    def __init__(self) -> None:
+        self.searches = 0
+        self.timeouts = 0
+        self.errors = 0
+        self._search_ms_total = 0.0
 
-def get_hscode_retriever() -> VectorStoreRetriever:
+    async def search(self, query: str, k: int = 5) -> List[Document]:
+        """
+        질문과 유사한 HSCode 문서 k개를 조회.
+        VECTOR_SEARCH_TIMEOUT_SECONDS를 넘기거나 오류가 나면 빈 목록을 반환함.
+        """
+        started = time.perf_counter()
+        try:
+            store = await hscode_vector_store.aget()
+            return await asyncio.wait_for(
+                store.asimilarity_search(query, k=k),
+                timeout=settings.VECTOR_SEARCH_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                f"HSCode 벡터 검색 타임아웃 "
+                f"({settings.VECTOR_SEARCH_TIMEOUT_SECONDS}s), 빈 결과로 진행"
+            )
+            return []
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"HSCode 벡터 검색 실패, 빈 결과로 진행: {e}")
+            return []
+        finally:
+            self.searches += 1
+            self._search_ms_total += (time.perf_counter() - started) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "searches": self.searches,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_search_ms": (
+                round(self._search_ms_total / self.searches, 1)
+                if self.searches
+                else 0.0
+            ),
+            "timeout_seconds": settings.VECTOR_SEARCH_TIMEOUT_SECONDS,
+        }
+
+
+# 싱글톤처럼 사용하기 위해 인스턴스 생성
+hscode_vector_search = HSCodeVectorSearch()
+
+
+class AsyncHSCodeRetriever(BaseRetriever):
+    """
+    HSCodeVectorSearch를 사용하는 비동기 전용 Retriever.
+    동기 invoke는 이벤트 루프를 막으므로 지원하지 않음 (ainvoke 사용).
+    """
+
+    k: int = 5
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return await hscode_vector_search.search(query, k=self.k)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        raise NotImplementedError(
+            "AsyncHSCodeRetriever는 비동기 전용입니다. ainvoke를 사용하세요."
+        )
+
+
+def get_hscode_retriever() -> BaseRetriever:
     """
     HSCode 벡터 저장소에 대한 LangChain Retriever를 반환.
 
     Returns:
-        VectorStoreRetriever: 설정된 검색 옵션(예: k=5)을 사용하는 retriever.
+        BaseRetriever: HSCODE_HYBRID_SEARCH_ENABLED이면 어휘 + 벡터 검색을 RRF로 결합하는
+        하이브리드 retriever, 아니면 유사도 검색만 하는 retriever (둘 다 k=5, 비동기 전용).
     """
-    return store.as_retriever(search_type="similarity", search_kwargs={"k": 5})
+    if settings.HSCODE_HYBRID_SEARCH_ENABLED:
+        # 하이브리드 검색 모듈이 이 모듈의 엔진/벡터 검색을 사용하므로 지연 import
+        from app.vector_stores.hscode_hybrid_search import HybridHSCodeRetriever
+
+        return HybridHSCodeRetriever(k=5)
+    return AsyncHSCodeRetriever(k=5)
@@ -0,0 +1,17 @@
+-- 채팅 세션 message_count 보정 마이그레이션
+-- 작성일: 2025년 7월 16일
+-- 목적: 메시지 일괄 저장 시 message_count를 함께 증가시키도록 변경됨에 따라 기존 세션의 값을 실제 메시지 수로 보정
+
+BEGIN;
+
+UPDATE public.chat_sessions AS s
+SET message_count = c.cnt
+FROM (
+    SELECT session_uuid, count(*) AS cnt
+    FROM public.chat_messages
+    GROUP BY session_uuid
+) AS c
+WHERE s.session_uuid = c.session_uuid
+  AND s.message_count <> c.cnt;
+
+COMMIT;
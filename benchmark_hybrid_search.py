@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+HSCode 하이브리드 검색 재현율/지연 시간 벤치마크
+
+정답 HS 코드가 표시된 질문 집합으로 세 가지 검색 방식을 비교함.
+- vector: 유사도 검색만 (기존 HSCodeVectorSearch)
+- lexical: 어휘 검색만 (코드/전문 검색/키워드/트라이그램)
+- hybrid: 두 검색을 동시에 실행하고 RRF로 결합
+
+질문 파일(JSONL) 형식: {"query": "...", "relevant": ["0306.17", ...]}
+검색된 코드가 정답 코드로 시작하면(구분자 무시) 적중으로 봄. 예: 정답 0306.17 ← 0306.17-1000
+
+지표: recall@k, hit@k(정답 하나 이상 포함), MRR, 질문당 p50/p95 지연 시간(ms).
+측정 전에 방식별로 한 번씩 실행하므로 질문 임베딩은 임베딩 캐시에서 제공되어 DB 검색 시간만
+측정됨. 임베딩 API 호출까지 포함하려면 --no-embedding-cache를 사용.
+
+hscode_vectors에 데이터가 적재되어 있어야 함 (app.vector_stores.hscode_ingest 참고).
+
+사용법:
+    python benchmark_hybrid_search.py [--queries benchmark_hybrid_search_queries.jsonl]
+        [--k 5] [--runs 3] [--no-embedding-cache]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from app.core.config import settings
+from app.core.resources import resources
+from app.vector_stores.hscode_hybrid_search import hscode_hybrid_search
+from app.vector_stores.hscode_retriever import hscode_vector_search
+
+SearchFn = Callable[[str, int], Awaitable[List[Document]]]
+
+
+def _digits(code: str) -> str:
+    return re.sub(r"\D", "", code)
+
+
+def load_queries(path: str) -> List[Tuple[str, List[str]]]:
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                queries.append((item["query"], [_digits(c) for c in item["relevant"]]))
+    return queries
+
+
+def score(documents: Sequence[Document], relevant: List[str]) -> Tuple[float, float]:
+    """(recall, reciprocal rank) 계산"""
+    found = set()
+    reciprocal_rank = 0.0
+    for rank, doc in enumerate(documents, start=1):
+        code = _digits(str(doc.metadata.get("hscode") or ""))
+        matched = [r for r in relevant if code.startswith(r)]
+        if matched and not reciprocal_rank:
+            reciprocal_rank = 1.0 / rank
+        found.update(matched)
+    return len(found) / len(relevant), reciprocal_rank
+
+
+async def run_mode(
+    search: SearchFn,
+    queries: List[Tuple[str, List[str]]],
+    k: int,
+    runs: int,
+) -> Dict[str, float]:
+    # 워밍업 (연결 풀, 공유 자원, 임베딩 캐시)
+    for query, _ in queries:
+        await search(query, k)
+
+    latencies: List[float] = []
+    recalls: List[float] = []
+    reciprocal_ranks: List[float] = []
+    for _ in range(runs):
+        for query, relevant in queries:
+            started = time.perf_counter()
+            documents = await search(query, k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            recall, reciprocal_rank = score(documents, relevant)
+            recalls.append(recall)
+            reciprocal_ranks.append(reciprocal_rank)
+
+    ordered = sorted(latencies)
+    return {
+        "recall": statistics.mean(recalls),
+        "hit": sum(1 for r in recalls if r > 0) / len(recalls),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "p50": statistics.median(ordered),
+        "p95": ordered[max(0, int(len(ordered) * 0.95) - 1)],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="HSCode 하이브리드 검색 벤치마크")
+    parser.add_argument("--queries", default="benchmark_hybrid_search_queries.jsonl")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="임베딩 캐시를 끄고 매 검색마다 임베딩 API 호출",
+    )
+    args = parser.parse_args()
+    if args.no_embedding_cache:
+        settings.EMBEDDING_CACHE_ENABLED = False
+
+    queries = load_queries(args.queries)
+    modes: Dict[str, SearchFn] = {
+        "vector": lambda q, k: hscode_vector_search.search(q, k=k),
+        "lexical": lambda q, k: hscode_hybrid_search.lexical_search(q, k),
+        "hybrid": lambda q, k: hscode_hybrid_search.search(q, k=k),
+    }
+
+    try:
+        print(f"질문 {len(queries)}개, k={args.k}, 반복 {args.runs}회")
+        print(
+            f"{'방식':<10}{'recall@k':>10}{'hit@k':>8}{'MRR':>8}"
+            f"{'p50':>9}{'p95':>9}  (ms)"
+        )
+        for name, search in modes.items():
+            result = await run_mode(search, queries, args.k, args.runs)
+            print(
+                f"{name:<10}{result['recall']:>10.3f}{result['hit']:>8.3f}"
+                f"{result['mrr']:>8.3f}{result['p50']:>9.2f}{result['p95']:>9.2f}"
+            )
+        stats = hscode_vector_search.stats()
+        if stats["timeouts"] or stats["errors"]:
+            print(f"벡터 검색 타임아웃/오류: {stats['timeouts']}/{stats['errors']}")
+        stats = hscode_hybrid_search.stats()
+        if stats["lexical_timeouts"] or stats["lexical_errors"]:
+            print(
+                f"어휘 검색 타임아웃/오류: "
+                f"{stats['lexical_timeouts']}/{stats['lexical_errors']}"
+            )
+    finally:
+        await resources.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
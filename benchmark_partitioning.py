@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+채팅 메시지 파티셔닝 벤치마크
+
+같은 합성 데이터(기본 5천만 행)를 일반 테이블(before)과 월 단위 RANGE 파티션
+테이블(after)에 적재한 뒤 대화 기록 조회 지연 시간을 비교함.
+파티션은 `app.db.partition_manager.PartitionManager`로 생성함.
+
+조회 유형:
+- history: 세션의 최근 메시지 N개 (CRUDChat.get_recent_messages와 같은 형태)
+- history_pruned: 같은 조회에 세션 생성 시각 하한을 추가 (파티션 프루닝 가능)
+- month_scan: 최근 한 달 메시지 수 집계
+
+별도 스키마(bench_unpartitioned, bench_partitioned)에 테이블을 만들며,
+--keep을 주지 않으면 종료 시 스키마를 삭제함. 운영 DB에서 실행하지 말 것.
+
+사용법:
+    python benchmark_partitioning.py [--rows 50000000] [--sessions 500000]
+        [--months 24] [--queries 500] [--limit 21] [--keep]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+from app.db.partition_manager import PartitionManager, add_months, month_start
+
+PLAIN_SCHEMA = "bench_unpartitioned"
+PARTITIONED_SCHEMA = "bench_partitioned"
+INSERT_CHUNK_ROWS = 1_000_000
+
+
+def session_uuid(number: int) -> uuid.UUID:
+    # SQL 쪽 md5(number::text)::uuid 와 같은 값
+    return uuid.UUID(hashlib.md5(str(number).encode()).hexdigest())
+
+
+def session_created_at(
+    number: int, sessions: int, start: datetime, span: timedelta
+) -> datetime:
+    return start + span * (number / sessions)
+
+
+async def create_tables(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        for schema in (PLAIN_SCHEMA, PARTITIONED_SCHEMA):
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        columns = """
+            message_id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            created_at TIMESTAMPTZ NOT NULL,
+            session_uuid UUID NOT NULL,
+            session_created_at TIMESTAMPTZ,
+            message_type VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL
+        """
+        await conn.execute(
+            text(
+                f"CREATE TABLE {PLAIN_SCHEMA}.chat_messages ({columns}, "
+                "PRIMARY KEY (message_id))"
+            )
+        )
+        await conn.execute(
+            text(
+                f"CREATE TABLE {PARTITIONED_SCHEMA}.chat_messages ({columns}, "
+                "PRIMARY KEY (message_id, created_at)) PARTITION BY RANGE (created_at)"
+            )
+        )
+
+
+async def create_partitions(engine: AsyncEngine, start: datetime, months: int) -> None:
+    # 시작 월을 기준 월로 두고 months개월을 미리 생성, 분리는 하지 않음
+    manager = PartitionManager(
+        engine=engine,
+        schema=PARTITIONED_SCHEMA,
+        tables=("chat_messages",),
+        months_ahead=months,
+        retention_months=months * 10,
+        mode="detach",
+    )
+    actions = await manager.run(now=start)
+    failed = [a for a in actions if a.error]
+    if failed:
+        raise RuntimeError(f"파티션 생성 실패: {failed[0].error}")
+    created = sum(1 for a in actions if a.executed)
+    print(f"  파티션 {created}개 생성")
+
+
+async def load_rows(
+    engine: AsyncEngine,
+    schema: str,
+    rows: int,
+    sessions: int,
+    start: datetime,
+    span: timedelta,
+) -> float:
+    """세션별로 메시지가 30초 간격으로 이어지는 합성 데이터 적재"""
+    started = time.perf_counter()
+    for chunk_start in range(0, rows, INSERT_CHUNK_ROWS):
+        chunk_end = min(rows, chunk_start + INSERT_CHUNK_ROWS)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    f"""
+                    INSERT INTO {schema}.chat_messages
+                        (created_at, session_uuid, session_created_at, message_type, content)
+                    SELECT
+                        base + ((g / n) * interval '30 seconds'),
+                        md5((g % n)::text)::uuid,
+                        base,
+                        CASE WHEN (g / n) % 2 = 0 THEN 'USER' ELSE 'AI' END,
+                        repeat('무역 상담 메시지 ', 8)
+                    FROM (
+                        SELECT g, n, CAST(:start AS timestamptz)
+                            + (g % n)::float8 / n * CAST(:span AS interval) AS base
+                        FROM generate_series(CAST(:lo AS bigint), CAST(:hi AS bigint) - 1) AS g,
+                            (SELECT CAST(:sessions AS bigint) AS n) AS c
+                    ) s
+                    """
+                ),
+                {
+                    "sessions": sessions,
+                    "start": start,
+                    "span": span,
+                    "lo": chunk_start,
+                    "hi": chunk_end,
+                },
+            )
+        print(f"  {schema}: {chunk_end:,}/{rows:,}", end="\r")
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                f"CREATE INDEX ON {schema}.chat_messages "
+                "(session_uuid, created_at DESC, message_id DESC)"
+            )
+        )
+        await conn.execute(text(f"CREATE INDEX ON {schema}.chat_messages (created_at)"))
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"VACUUM ANALYZE {schema}.chat_messages"))
+    elapsed = time.perf_counter() - started
+    print(f"  {schema}: {rows:,}행 적재 + 인덱스 {elapsed:,.1f}s")
+    return elapsed
+
+
+async def time_queries(
+    engine: AsyncEngine,
+    schema: str,
+    sql: str,
+    params: List[Dict[str, object]],
+) -> List[float]:
+    statement = text(sql.format(schema=schema))
+    latencies: List[float] = []
+    async with engine.connect() as conn:
+        # 워밍업
+        for p in params[:10]:
+            await conn.execute(statement, p)
+        for p in params:
+            started = time.perf_counter()
+            await conn.execute(statement, p)
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def _summary(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"{statistics.median(ordered):>9.2f}{p95:>9.2f}"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="채팅 메시지 파티셔닝 벤치마크")
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--sessions", type=int, default=500_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=21, help="history 조회 LIMIT")
+    parser.add_argument("--keep", action="store_true", help="종료 후 스키마 유지")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    end = month_start(datetime.now(timezone.utc))
+    start = add_months(end, -args.months)
+    # 마지막 세션의 메시지가 다음 달로 넘어가지 않도록 여유를 둠
+    messages_per_session = -(-args.rows // args.sessions)
+    span = (end - start) - timedelta(seconds=30 * messages_per_session)
+
+    try:
+        print(f"테이블 생성 ({args.months}개월, {args.rows:,}행, 세션 {args.sessions:,}개)")
+        await create_tables(engine)
+        await create_partitions(engine, start, args.months - 1)
+        for schema in (PLAIN_SCHEMA, PARTITIONED_SCHEMA):
+            await load_rows(engine, schema, args.rows, args.sessions, start, span)
+
+        rng = random.Random(42)
+        numbers = [rng.randrange(args.sessions) for _ in range(args.queries)]
+        history_params = [
+            {"session_uuid": session_uuid(n), "limit": args.limit} for n in numbers
+        ]
+        pruned_params = [
+            {
+                "session_uuid": session_uuid(n),
+                # 부동소수점 오차로 첫 메시지가 빠지지 않도록 1초 여유
+                "since": session_created_at(n, args.sessions, start, span)
+                - timedelta(seconds=1),
+                "limit": args.limit,
+            }
+            for n in numbers
+        ]
+        month_params = [{"since": add_months(end, -1)}] * max(10, args.queries // 50)
+
+        queries = {
+            "history": (
+                "SELECT message_id, message_type, content, created_at "
+                "FROM {schema}.chat_messages WHERE session_uuid = :session_uuid "
+                "ORDER BY created_at DESC, message_id DESC LIMIT :limit",
+                history_params,
+            ),
+            "history_pruned": (
+                "SELECT message_id, message_type, content, created_at "
+                "FROM {schema}.chat_messages WHERE session_uuid = :session_uuid "
+                "AND created_at >= :since "
+                "ORDER BY created_at DESC, message_id DESC LIMIT :limit",
+                pruned_params,
+            ),
+            "month_scan": (
+                "SELECT count(*) FROM {schema}.chat_messages WHERE created_at >= :since",
+                month_params,
+            ),
+        }
+
+        print()
+        print(
+            f"{'조회':<16}{'before p50':>11}{'p95':>9}{'after p50':>11}{'p95':>9}  (ms)"
+        )
+        for name, (sql, params) in queries.items():
+            before = await time_queries(engine, PLAIN_SCHEMA, sql, params)
+            after = await time_queries(engine, PARTITIONED_SCHEMA, sql, params)
+            print(f"{name:<16}  {_summary(before)}  {_summary(after)}")
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                for schema in (PLAIN_SCHEMA, PARTITIONED_SCHEMA):
+                    await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
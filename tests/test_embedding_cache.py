@@ -0,0 +1,26 @@
+"""
+임베딩 캐시 벡터 직렬화 단위 테스트
+"""
+
+import pytest
+
+from app.vector_stores.embedding_cache import pack_vector, unpack_vector
+
+
+def test_pack_vector_uses_two_bytes_per_dimension():
+    assert len(pack_vector([0.0] * 1024)) == 2048
+    assert pack_vector([]) == b""
+    assert unpack_vector(b"") == []
+
+
+def test_round_trip_within_float16_precision():
+    vector = [0.5, -0.25, 0.0312, -0.9999, 1e-3]
+    restored = unpack_vector(pack_vector(vector))
+    assert len(restored) == len(vector)
+    for original, value in zip(vector, restored):
+        assert value == pytest.approx(original, abs=1e-3)
+
+
+def test_exactly_representable_values_round_trip():
+    vector = [1.0, -2.0, 0.5, 0.0]
+    assert unpack_vector(pack_vector(vector)) == vector
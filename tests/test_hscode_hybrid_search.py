@@ -0,0 +1,72 @@
+"""
+HSCode 하이브리드 검색 순수 함수 단위 테스트 (DB 불필요)
+"""
+
+import pytest
+from langchain_core.documents import Document
+
+from app.vector_stores.hscode_hybrid_search import (
+    extract_hscodes,
+    lexical_terms,
+    reciprocal_rank_fusion,
+)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("8471.30 관세율", ["847130"]),
+        ("8471.30-1000 세번", ["8471301000"]),
+        ("847130.1000", ["8471301000"]),
+        ("HS 847130 원산지 확인", ["847130"]),
+        ("847130 그리고 8471.30", ["847130"]),
+        # 구분자 없는 4자리, 연도, 가격, 비율은 코드가 아님
+        ("8471", []),
+        ("2024년 수출 실적", []),
+        ("1234.56달러", []),
+        ("8471.30-1000원", []),
+        ("847130원", []),
+        ("$847130", []),
+        ("12.5%", []),
+        ("1,847,130", []),
+    ],
+)
+def test_extract_hscodes(query, expected):
+    assert extract_hscodes(query) == expected
+
+
+def test_lexical_terms_strip_codes_particles_and_stopwords():
+    assert lexical_terms("8471.30 노트북의 HS코드 알려줘") == ["노트북"]
+
+
+def _doc(hscode: str) -> Document:
+    return Document(page_content=hscode, metadata={"hscode": hscode})
+
+
+def test_reciprocal_rank_fusion_combines_rankings():
+    fused = reciprocal_rank_fusion(
+        {
+            "lexical": [_doc("0306.17"), _doc("8471.30")],
+            "vector": [_doc("8471.30"), _doc("0101.21")],
+        },
+        k=60,
+    )
+    codes = [doc.metadata["hscode"] for doc, _, _ in fused]
+    assert codes == ["8471.30", "0306.17", "0101.21"]
+
+    doc, score, ranks = fused[0]
+    assert score == pytest.approx(1 / 62 + 1 / 61)
+    assert ranks == {"lexical": 2, "vector": 1}
+    assert fused[2][2] == {"vector": 2}
+
+
+def test_reciprocal_rank_fusion_falls_back_to_document_id():
+    fused = reciprocal_rank_fusion(
+        {
+            "lexical": [Document(id="1", page_content="a")],
+            "vector": [Document(id="1", page_content="a")],
+        },
+        k=0,
+    )
+    assert len(fused) == 1
+    assert fused[0][1] == pytest.approx(2.0)
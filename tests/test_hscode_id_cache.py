@@ -0,0 +1,44 @@
+"""
+CRUDHscode 커밋 후 캐시 반영 훅 단위 테스트
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.crud import CRUDHscode
+
+
+class _AsyncSessionStub:
+    """_remember가 사용하는 sync_session만 가진 AsyncSession 대역"""
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+
+def test_inserted_ids_are_cached_only_after_that_session_commits():
+    crud_hscode = CRUDHscode()
+    session = Session()
+    db = _AsyncSessionStub(session)
+
+    crud_hscode._remember(db, "0101", 1, inserted=True)
+    crud_hscode._remember(db, "0102", 2, inserted=True)
+    assert crud_hscode.id_cache.get("0101") is None
+    # 훅은 세션당 한 번만, 해당 세션에만 등록됨
+    assert len(session.dispatch.after_commit) == 1
+    assert not event.contains(Session, "after_commit", crud_hscode._publish_pending)
+
+    session.dispatch.after_commit(session)
+    assert crud_hscode.id_cache.get("0101") == 1
+    assert crud_hscode.id_cache.get("0102") == 2
+
+
+def test_rollback_discards_pending_ids():
+    crud_hscode = CRUDHscode()
+    session = Session()
+    db = _AsyncSessionStub(session)
+
+    crud_hscode._remember(db, "0103", 3, inserted=True)
+    session.dispatch.after_rollback(session)
+    session.dispatch.after_commit(session)
+
+    assert crud_hscode.id_cache.get("0103") is None
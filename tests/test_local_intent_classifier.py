@@ -0,0 +1,68 @@
+"""
+로컬 의도 사전 분류기 단위 테스트
+"""
+
+import pytest
+
+from app.services.local_intent_classifier import LocalIntentClassifier
+
+
+@pytest.fixture
+def classifier():
+    return LocalIntentClassifier(confidence_threshold=0.85)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        # 뉴스/시점 질문은 HSCode 단어가 있어도 LLM에 위임
+        "HS code 개정 관련 최근 뉴스 알려줘",
+        "2025년 HS코드 개편이 한국 수출에 미치는 영향은?",
+        # "세번"(세 번)은 HSCode 근거가 아님
+        "세번이나 물어봤는데 미국 관세 뉴스 알려줘",
+        "어제 세번 통화했는데 통관 절차가 어떻게 되나요?",
+        "세번 물어봤는데 통관 절차가 어떻게 되나요?",
+        # 일반 질문 표현만으로는 분류 요청이 아님
+        "HS code가 어떻게 구성되나요?",
+        "customs procedure for laptop?",
+        # 숫자만 있는 번호는 HSCode/전화번호와 구분되지 않음
+        "8471300000 수출 관세율",
+        "01012345678 수출",
+    ],
+)
+def test_ambiguous_messages_escalate_to_llm(classifier, message):
+    assert classifier.classify(message) is None
+
+
+@pytest.mark.parametrize(
+    ("message", "intent"),
+    [
+        ("스마트폰 HS code 분류해줘", "hscode_classification"),
+        ("노트북 hs코드 알려줘", "hscode_classification"),
+        ("What is the HS code for a laptop?", "hscode_classification"),
+        ("세번 8471.30 분류 맞나요", "hscode_classification"),
+        ("MSCU1234567", "cargo_tracking"),
+        ("MSCU1234567 화물 조회 부탁드립니다", "cargo_tracking"),
+        ("화물 조회 1234567890", "cargo_tracking"),
+        ("화물번호 180-12345678", "cargo_tracking"),
+    ],
+)
+def test_clear_messages_short_circuit(classifier, message, intent):
+    decision = classifier.classify(message)
+    assert decision is not None
+    assert decision.intent == intent
+    assert decision.confidence >= 0.85
+
+
+def test_entities_and_stats(classifier):
+    decision = classifier.classify("세번 8471.30 스마트폰 분류해줘")
+    assert decision.entities == {
+        "hscodes": ["8471.30"],
+        "product_category": "electronics",
+    }
+    classifier.classify("HS code 개정 관련 최근 뉴스 알려줘")
+
+    stats = classifier.stats()
+    assert stats["total"] == 2
+    assert stats["escalated"] == 1
+    assert stats["short_circuited"] == {"hscode_classification": 1}
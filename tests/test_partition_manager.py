@@ -0,0 +1,84 @@
+"""
+월 파티션 관리자 계획 단위 테스트 (DB 연결 불필요)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.partition_manager import (
+    PartitionInfo,
+    PartitionManager,
+    add_months,
+    month_start,
+)
+
+UTC = timezone.utc
+
+
+def _month(year: int, month: int) -> datetime:
+    return datetime(year, month, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def manager():
+    # 엔진은 연결하지 않으므로 접속 정보는 사용되지 않음
+    engine = create_async_engine("postgresql+asyncpg://user:pw@localhost/test")
+    return PartitionManager(engine=engine, months_ahead=2, mode="detach")
+
+
+def test_month_start_converts_to_utc():
+    kst = timezone(timedelta(hours=9))
+    assert month_start(datetime(2026, 11, 1, 3, 0, tzinfo=kst)) == _month(2026, 10)
+    assert month_start(datetime(2026, 10, 17, 12, tzinfo=UTC)) == _month(2026, 10)
+
+
+@pytest.mark.parametrize(
+    ("start", "months", "expected"),
+    [
+        (_month(2026, 10), 1, _month(2026, 11)),
+        (_month(2026, 11), 2, _month(2027, 1)),
+        (_month(2026, 12), 1, _month(2027, 1)),
+        (_month(2026, 1), -1, _month(2025, 12)),
+        (_month(2026, 3), -26, _month(2024, 1)),
+        (_month(2026, 1), 0, _month(2026, 1)),
+    ],
+)
+def test_add_months(start, months, expected):
+    assert add_months(start, months) == expected
+
+
+def test_plan_creates_missing_months(manager):
+    now = datetime(2026, 12, 17, tzinfo=UTC)
+    actions = manager.plan_creates("chat_messages", [], now)
+
+    assert [a.kind for a in actions] == ["create"] * 3
+    assert [a.partition for a in actions] == [
+        "chat_messages_p202612",
+        "chat_messages_p202701",
+        "chat_messages_p202702",
+    ]
+    assert all('"public"."chat_messages"' in a.statements[0] for a in actions)
+
+
+def test_plan_creates_skips_existing_and_overlapping(manager):
+    existing = [
+        PartitionInfo(
+            "chat_messages", "chat_messages_p202612", _month(2026, 12), _month(2027, 1)
+        ),
+        # 연 단위로 만든 파티션과 겹치는 월은 생성하지 않고 skip으로 보고
+        PartitionInfo(
+            "chat_messages", "chat_messages_2027", _month(2027, 1), _month(2028, 1)
+        ),
+        PartitionInfo("chat_messages", "chat_messages_default", None, None, True),
+    ]
+    actions = manager.plan_creates(
+        "chat_messages", existing, datetime(2026, 12, 1, tzinfo=UTC)
+    )
+
+    assert [(a.kind, a.partition) for a in actions] == [
+        ("skip", "chat_messages_p202701"),
+        ("skip", "chat_messages_p202702"),
+    ]
+    assert "chat_messages_2027" in actions[0].reason
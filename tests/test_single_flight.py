@@ -0,0 +1,81 @@
+"""
+SingleFlight 단위 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight: SingleFlight[int] = SingleFlight(name="test")
+    calls = 0
+    release = asyncio.Event()
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flight.stats() == {"executions": 1, "shared": 4, "inflight": 1}
+
+    release.set()
+    assert await asyncio.gather(*waiters) == [42] * 5
+    assert calls == 1
+    assert flight.stats()["inflight"] == 0
+
+
+async def test_different_keys_and_later_calls_run_separately():
+    flight: SingleFlight[str] = SingleFlight()
+
+    async def work(value: str) -> str:
+        await asyncio.sleep(0)
+        return value
+
+    assert await asyncio.gather(
+        flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))
+    ) == ["a", "b"]
+    assert await flight.do("a", lambda: work("again")) == "again"
+    assert flight.stats() == {"executions": 3, "shared": 0, "inflight": 0}
+
+
+async def test_exception_is_shared_and_not_cached():
+    flight: SingleFlight[int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def succeed() -> int:
+        return 1
+
+    assert await flight.do("key", succeed) == 1
+
+
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def work() -> int:
+        await release.wait()
+        return 7
+
+    leader = asyncio.create_task(flight.do("key", work))
+    follower = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    release.set()
+    assert await follower == 7
@@ -0,0 +1,57 @@
+"""
+SpeculativeStage 단위 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.speculative_stage import SpeculativeStage
+
+
+async def test_report_counts_only_overlap_of_used_tasks():
+    stage = SpeculativeStage()
+    stage.start("a", asyncio.sleep(0.05, result="a"))
+    stage.start("b", asyncio.sleep(0.05, result="b"))
+    stage.start("unused", asyncio.sleep(1))
+
+    assert await stage.get("a") == "a"
+    assert await stage.get("b") == "b"
+    stage.cancel("unused")
+    # 결과를 받은 뒤의 처리 시간은 실행 시간에 포함되지 않음
+    await asyncio.sleep(0.05)
+
+    report = stage.report()
+    assert set(report["tasks_ms"]) == {"a", "b"}
+    assert report["cancelled"] == ["unused"]
+    assert report["wall_time_ms"] < report["sequential_time_ms"]
+    assert report["time_saved_ms"] == pytest.approx(
+        report["sequential_time_ms"] - report["wall_time_ms"], abs=0.2
+    )
+    assert report["wall_time_ms"] < 90
+
+
+async def test_sequential_tasks_save_nothing():
+    stage = SpeculativeStage()
+    stage.start("a", asyncio.sleep(0.01))
+    await stage.get("a")
+    stage.start("b", asyncio.sleep(0.01))
+    await stage.get("b")
+
+    report = stage.report()
+    assert report["time_saved_ms"] == pytest.approx(0.0, abs=0.2)
+
+
+async def test_bind_registers_pending_tasks_started_earlier():
+    registered = []
+    stage = SpeculativeStage()
+    stage.start("done", asyncio.sleep(0))
+    await stage.get("done")
+    stage.start("pending", asyncio.sleep(1))
+
+    stage.bind(registered.append)
+    stage.start("later", asyncio.sleep(1))
+
+    assert registered == [stage._tasks["pending"], stage._tasks["later"]]
+    await asyncio.sleep(0)
+    stage.cancel_all()
@@ -0,0 +1,74 @@
+"""
+StreamRegistry 유예 시간(grace) 처리 단위 테스트
+"""
+
+import asyncio
+
+from app.core.config import settings
+from app.services.stream_registry import StreamRegistry
+
+
+async def _consume_one(state) -> None:
+    """프레임 하나를 받고 구독 종료 (클라이언트 연결 해제)"""
+    subscription = state.subscribe()
+    await subscription.__anext__()
+    await subscription.aclose()
+
+
+async def _run_producer(registry: StreamRegistry, state) -> asyncio.Task:
+    async def frames():
+        yield "data: first\n\n"
+        await asyncio.sleep(10)
+        yield "data: never\n\n"
+
+    return registry.start(state, frames())
+
+
+async def test_zero_grace_cancels_as_soon_as_last_subscriber_leaves(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_RESUME_GRACE_SECONDS", 0.0)
+    registry = StreamRegistry()
+    state = registry.create(user_id=None, session_uuid="s", message="m")
+    producer = await _run_producer(registry, state)
+    state.scope.register(producer)
+
+    await _consume_one(state)
+
+    assert state.abandoned
+    await asyncio.wait_for(producer, timeout=1)
+    assert state.done
+    assert registry.stats()["abandoned"] == 1
+
+
+async def test_resume_disabled_cancels_immediately(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_RESUME_ENABLED", False)
+    registry = StreamRegistry()
+    assert registry.grace_seconds == 0.0
+    state = registry.create(user_id=None, session_uuid="s", message="m")
+    producer = await _run_producer(registry, state)
+    state.scope.register(producer)
+
+    await _consume_one(state)
+
+    assert state.abandoned
+    await asyncio.wait_for(producer, timeout=1)
+
+
+async def test_grace_keeps_producer_until_reconnect(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_RESUME_GRACE_SECONDS", 0.05)
+    registry = StreamRegistry()
+    state = registry.create(user_id=None, session_uuid="s", message="m")
+    producer = await _run_producer(registry, state)
+    state.scope.register(producer)
+
+    await _consume_one(state)
+    assert not state.abandoned
+
+    # 유예 시간 안에 다시 구독하면 취소되지 않음
+    subscription = state.subscribe(after_seq=0)
+    waiting = asyncio.create_task(subscription.__anext__())
+    await asyncio.sleep(0.1)
+    assert not state.abandoned and not producer.done()
+
+    producer.cancel()
+    await asyncio.gather(producer, waiting, return_exceptions=True)
+    await subscription.aclose()
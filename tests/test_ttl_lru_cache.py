@@ -0,0 +1,74 @@
+"""
+TTLLRUCache 단위 테스트
+"""
+
+import pytest
+
+from app.utils import ttl_lru_cache
+from app.utils.ttl_lru_cache import TTLLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ttl_lru_cache.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def test_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        TTLLRUCache(max_entries=0)
+
+
+def test_evicts_least_recently_used():
+    cache: TTLLRUCache[str, int] = TTLLRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용 항목이 됨
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache: TTLLRUCache[str, int] = TTLLRUCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=60)
+
+    clock.now += 5
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_no_ttl_never_expires(clock):
+    cache: TTLLRUCache[str, int] = TTLLRUCache(max_entries=1)
+    cache.set("a", 1)
+    clock.now += 10**9
+    assert cache.get("a") == 1
+
+
+def test_stats_and_contains_do_not_count_lookups():
+    cache: TTLLRUCache[str, int] = TTLLRUCache(max_entries=4)
+    cache.set("a", 1)
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None